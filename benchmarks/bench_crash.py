@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the crash utility used by the benchmarks.
+
+Behaves like ``crash --no_scroll vmlinux vmcore``: prints a banner, waits
+out a simulated symbol load, then answers commands at a ``crash> `` prompt.
+Tuned through the environment:
+
+    BENCH_CRASH_STARTUP       seconds spent "loading symbols" (default 0)
+    BENCH_CRASH_BANNER_LINES  extra banner lines printed before the prompt (default 0)
+    BENCH_CRASH_LATENCY       seconds each command takes before printing (default 0)
+    BENCH_CRASH_RATE          output rate cap in bytes per second (default 0, unlimited)
+    BENCH_CRASH_LOG_LINES     lines printed by ``log`` (default 2000)
+
+Commands: ``sys``, ``bt``, ``log``, ``output N`` (N bytes of 80 column
+lines), ``echo ...`` (used for output framing), ``!cmd`` (shell escape),
+``set ...`` and ``quit``. Anything else is reported as ``crash: command not found``.
+"""
+
+import os
+import sys
+import time
+
+CHUNK = 64 * 1024
+
+STARTUP = float(os.getenv("BENCH_CRASH_STARTUP", "0"))
+BANNER_LINES = int(os.getenv("BENCH_CRASH_BANNER_LINES", "0"))
+LATENCY = float(os.getenv("BENCH_CRASH_LATENCY", "0"))
+RATE = float(os.getenv("BENCH_CRASH_RATE", "0"))
+LOG_LINES = int(os.getenv("BENCH_CRASH_LOG_LINES", "2000"))
+
+SYS_OUTPUT = (
+    "      KERNEL: {kernel}\n"
+    "    DUMPFILE: {dump}\n"
+    "        CPUS: 8\n"
+    "        DATE: Thu Jan  1 00:00:00 UTC 2026\n"
+    "      UPTIME: 2 days, 03:04:05\n"
+    "LOAD AVERAGE: 0.52, 0.31, 0.20\n"
+    "       TASKS: 412\n"
+    "     RELEASE: 6.1.0-bench\n"
+    "       PANIC: \"Kernel panic - not syncing: sysrq triggered crash\"\n"
+)
+
+BT_OUTPUT = (
+    "PID: 1234     TASK: ffff8881002a8000  CPU: 2    COMMAND: \"bash\"\n"
+    " #0 [ffffc90000a3bd58] machine_kexec at ffffffff8105c9fb\n"
+    " #1 [ffffc90000a3bdb0] __crash_kexec at ffffffff8113d3a2\n"
+    " #2 [ffffc90000a3be70] panic at ffffffff81a0b1e5\n"
+    " #3 [ffffc90000a3bef0] sysrq_handle_crash at ffffffff8159e1a1\n"
+    " #4 [ffffc90000a3bf00] __handle_sysrq at ffffffff8159e6d2\n"
+    " #5 [ffffc90000a3bf30] write_sysrq_trigger at ffffffff8159eb52\n"
+)
+
+
+def emit(text: str):
+    """Write command output, honoring the rate cap."""
+    data = text.encode()
+    out = sys.stdout.buffer
+    if not RATE:
+        out.write(data)
+        out.flush()
+        return
+    started = time.monotonic()
+    for offset in range(0, len(data), CHUNK):
+        out.write(data[offset:offset + CHUNK])
+        out.flush()
+        ahead = (offset + CHUNK) / RATE - (time.monotonic() - started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+
+def output(size: int):
+    """Write ``size`` bytes of numbered 80 column lines."""
+    line = "x" * 68
+    written = 0
+    index = 0
+    chunk = []
+    chunk_bytes = 0
+    while written < size:
+        text = f"{index:10d} {line}\n"[:size - written]
+        chunk.append(text)
+        chunk_bytes += len(text)
+        written += len(text)
+        index += 1
+        if chunk_bytes >= CHUNK:
+            emit("".join(chunk))
+            chunk, chunk_bytes = [], 0
+    if chunk:
+        emit("".join(chunk))
+
+
+def main():
+    kernel = sys.argv[-2] if len(sys.argv) > 2 else "vmlinux"
+    dump = sys.argv[-1] if len(sys.argv) > 1 else "vmcore"
+    print("crash 8.0.4 (bench)")
+    print("")
+    for index in range(BANNER_LINES):
+        print(f"WARNING: banner line {index}")
+    sys.stdout.flush()
+    time.sleep(STARTUP)
+    print("      KERNEL: " + kernel)
+    print("    DUMPFILE: " + dump)
+    print("")
+    while True:
+        sys.stdout.write("crash> ")
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            return
+        words = line.split()
+        if not words:
+            continue
+        verb = words[0]
+        if verb in ("quit", "exit", "q"):
+            return
+        if verb == "echo":
+            emit(line.strip()[len("echo"):].strip() + "\n")
+            continue
+        if verb.startswith("!"):
+            sys.stdout.flush()
+            os.system(line.strip()[1:])
+            continue
+        if LATENCY:
+            time.sleep(LATENCY)
+        if verb == "sys":
+            emit(SYS_OUTPUT.format(kernel=kernel, dump=dump))
+        elif verb == "bt":
+            emit(BT_OUTPUT)
+        elif verb == "log":
+            emit("".join(f"[{index / 1000:12.6f}] bench log line {index}\n" for index in range(LOG_LINES)))
+        elif verb == "output":
+            output(int(words[1]))
+        elif verb == "set":
+            pass
+        else:
+            emit(f"crash: command not found: {verb}\n")
+
+
+if __name__ == "__main__":
+    main()
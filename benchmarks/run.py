@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the crash MCP server hot paths, compared against stored baselines.
+
+Crash sessions run bench_crash.py, a stand-in for the crash utility, and
+dump and kernel trees are generated under a temporary directory, so
+neither crash nor real dumps are needed.
+
+    python benchmarks/run.py                  # run all, compare with baselines.json
+    python benchmarks/run.py --quick          # smaller sizes, for a quick check
+    python benchmarks/run.py scan_dumps       # run selected benchmarks
+    python benchmarks/run.py --save           # store the results as the new baselines
+
+Metrics ending in ``_per_s`` are better when higher, all others when lower.
+A metric worse than its baseline by more than ``--tolerance`` (and by more
+than its noise floor) is reported as a regression and makes the run exit
+with status 1. The default tolerance of 25% leaves room for run-to-run
+noise, about 15% for output throughput on an idle machine; the
+sub-millisecond command rates swing more, so record their baselines from
+a run that is not unusually fast. Baselines are
+only comparable on the machine that recorded them; re-record them with
+``--save`` after moving, with nothing else running.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import psutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from crash_mcp.catalog import FileCatalog
+from crash_mcp.crash_discovery import CrashDumpDiscovery
+from crash_mcp.crash_session import CrashSessionManager
+from crash_mcp.kernel_detection import KernelDetection
+from crash_mcp.kernel_index import KernelIndex
+from crash_mcp.metrics import LatencyHistogram
+from crash_mcp.result_cache import ResultCache
+from crash_mcp.server import MAX_BATCH_COMMANDS
+from synthetic import make_dump_tree, make_kernel_tree
+
+BENCH_CRASH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_crash.py")
+CRASH_BINARY = f"{sys.executable} {BENCH_CRASH}"
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# Benchmark sizes: (full, quick)
+SIZES = {
+    "session_starts": (50, 10),
+    "commands": (2000, 300),
+    "batches": (200, 30),
+    "output_mb": (32, 8),
+    "large_output_mb": (128, 32),
+    "dumps": (5000, 500),
+    "kernels": (500, 100),
+    "sse_clients": (8, 4),
+    "sse_commands": (50, 20),
+}
+
+
+class Bench:
+    """State shared by the benchmarks of one run."""
+
+    def __init__(self, root: Path, quick: bool):
+        self.root = root
+        self.quick = quick
+        self.dump_root = root / "pair" / "dumps"
+        self.kernel_root = root / "pair" / "kernels"
+        self._pair = None
+
+    def size(self, name: str) -> int:
+        """Get a benchmark size for this run."""
+        full, quick = SIZES[name]
+        return quick if self.quick else full
+
+    def pair(self):
+        """Get a (dump, kernel) pair for crash sessions."""
+        if self._pair is None:
+            make_dump_tree(self.dump_root, 1, kernels=1)
+            make_kernel_tree(self.kernel_root, 1, noise_files=0)
+            detection = KernelDetection(str(self.kernel_root), FileCatalog(), KernelIndex())
+            detection.debug_paths = [self.kernel_root]
+            dump = CrashDumpDiscovery(str(self.dump_root), FileCatalog()).get_crash_dump_by_name("vmcore")
+            self._pair = (dump, detection.find_matching_kernel(dump))
+        return self._pair
+
+    def manager(self, **kwargs) -> CrashSessionManager:
+        """Create a session manager running the stand-in crash."""
+        return CrashSessionManager(crash_binary=CRASH_BINARY, **kwargs)
+
+
+def timed(func: Callable, *args):
+    """Run a function and return its wall time in seconds and its result."""
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def best_of(repeats: int, func: Callable, *args) -> float:
+    """Get the shortest wall time in seconds of several runs of a function."""
+    return min(timed(func, *args)[0] for _ in range(repeats))
+
+
+def latency_metrics(histogram: LatencyHistogram, prefix: str = "") -> Dict[str, float]:
+    """Get the p50 and p99 of a histogram in milliseconds."""
+    summary = histogram.to_dict()
+    return {f"{prefix}p50_ms": summary["p50_ms"], f"{prefix}p99_ms": summary["p99_ms"]}
+
+
+def bench_session_start(bench: Bench) -> Dict[str, float]:
+    """Cold start of a crash process: spawn, banner and first prompt."""
+    dump, kernel = bench.pair()
+    manager = bench.manager(max_sessions=1)
+    histogram = LatencyHistogram()
+    try:
+        for _ in range(bench.size("session_starts")):
+            elapsed, started = timed(manager.start_session, dump, kernel, 30, "default", False)
+            if not started:
+                raise RuntimeError("The stand-in crash did not start")
+            histogram.record(elapsed)
+            manager.close_session()
+    finally:
+        manager.close_all_sessions()
+    return latency_metrics(histogram)
+
+
+def bench_command_latency(bench: Bench) -> Dict[str, float]:
+    """Round trip of a small command through the pexpect channel, and from the result cache."""
+    dump, kernel = bench.pair()
+    manager = bench.manager(max_sessions=1, result_cache=ResultCache())
+    commands = bench.size("commands")
+    try:
+        manager.start_session(dump, kernel, 30, spare=False)
+        uncached = LatencyHistogram()
+        started = time.perf_counter()
+        for _ in range(commands):
+            # "output" is not a cacheable verb, so every call reaches crash
+            elapsed, (_, error, return_code) = timed(manager.execute_command, "output 512", 30)
+            if return_code:
+                raise RuntimeError(error)
+            uncached.record(elapsed)
+        throughput = commands / (time.perf_counter() - started)
+
+        cached = LatencyHistogram()
+        manager.execute_command("sys", 30)
+        for _ in range(commands):
+            cached.record(timed(manager.execute_command, "sys", 30)[0])
+    finally:
+        manager.close_all_sessions()
+    return dict(latency_metrics(uncached), commands_per_s=round(throughput, 1),
+                **latency_metrics(cached, "cached_"))
+
+
+def bench_batch_pipelining(bench: Bench) -> Dict[str, float]:
+    """Commands pipelined through crash_batch against the same commands sent one by one."""
+    dump, kernel = bench.pair()
+    manager = bench.manager(max_sessions=1)
+    commands = ["output 512"] * MAX_BATCH_COMMANDS
+    batches = bench.size("batches")
+    try:
+        manager.start_session(dump, kernel, 30, spare=False)
+
+        def sequential():
+            for command in commands:
+                output, error, return_code = manager.run_command(command, 30)
+                output.close()
+                if return_code:
+                    raise RuntimeError(error)
+
+        def batch():
+            for result in manager.run_batch(commands, 30):
+                result.output.close()
+                if result.return_code:
+                    raise RuntimeError(result.error)
+
+        sequential_seconds = sum(timed(sequential)[0] for _ in range(batches))
+        batch_seconds = sum(timed(batch)[0] for _ in range(batches))
+    finally:
+        manager.close_all_sessions()
+    total = batches * len(commands)
+    return {"sequential_commands_per_s": round(total / sequential_seconds, 1),
+            "batch_commands_per_s": round(total / batch_seconds, 1)}
+
+
+def bench_output_throughput(bench: Bench) -> Dict[str, float]:
+    """Streaming of a large command output into a CommandOutput."""
+    dump, kernel = bench.pair()
+    manager = bench.manager(max_sessions=1)
+    size = bench.size("output_mb") * 1024 * 1024
+    try:
+        manager.start_session(dump, kernel, 30, spare=False)
+        best = None
+        for _ in range(3):
+            elapsed, (output, error, return_code) = timed(manager.run_command, f"output {size}", 300)
+            output.close()
+            if return_code:
+                raise RuntimeError(error)
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        manager.close_all_sessions()
+    return {"mb_per_s": round(size / best / (1024 * 1024), 1)}
+
+
+def bench_large_output_memory(bench: Bench) -> Dict[str, float]:
+    """Peak growth of anonymous memory while a very large output is read and paged.
+
+    File-backed pages are left out: a spilled output is memory-mapped, and
+    its pages can be dropped by the kernel at any time.
+    """
+    dump, kernel = bench.pair()
+    manager = bench.manager(max_sessions=1)
+    size = bench.size("large_output_mb") * 1024 * 1024
+    process = psutil.Process()
+    peak = [0]
+    done = threading.Event()
+
+    def anonymous():
+        memory = process.memory_info()
+        return memory.rss - memory.shared
+
+    def sample():
+        while not done.wait(0.01):
+            peak[0] = max(peak[0], anonymous())
+
+    try:
+        manager.start_session(dump, kernel, 30, spare=False)
+        baseline = anonymous()
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        output, error, return_code = manager.run_command(f"output {size}", 600)
+        try:
+            if return_code:
+                raise RuntimeError(error)
+            output.read_page(0, 1024 * 1024)
+            output.tail(100)
+            output.grep("   1000000 ")
+        finally:
+            output.close()
+            done.set()
+            sampler.join()
+    finally:
+        manager.close_all_sessions()
+    return {"anon_growth_mb": round(max(0, peak[0] - baseline) / (1024 * 1024), 2)}
+
+
+def bench_scan_dumps(bench: Bench) -> Dict[str, float]:
+    """find_crash_dumps on a large dump tree, cold and incrementally refreshed."""
+    root = bench.root / "scan" / "dumps"
+    make_dump_tree(root, bench.size("dumps"))
+    discovery = CrashDumpDiscovery(str(root), FileCatalog())
+    dumps = discovery.find_crash_dumps(sys.maxsize)
+
+    def cold_scan():
+        CrashDumpDiscovery(str(root), FileCatalog()).find_crash_dumps(sys.maxsize)
+
+    def read_headers():
+        fresh = CrashDumpDiscovery(str(root), FileCatalog())
+        for dump in dumps:
+            fresh.get_dump_header(dump)
+
+    return {"cold_ms": round(best_of(3, cold_scan) * 1000, 2),
+            "warm_ms": round(best_of(5, discovery.find_crash_dumps, sys.maxsize) * 1000, 2),
+            "headers_ms": round(best_of(3, read_headers) * 1000, 2)}
+
+
+def bench_scan_kernels(bench: Bench) -> Dict[str, float]:
+    """find_kernel_files and kernel matching on a large debug kernel tree."""
+    root = bench.root / "scan" / "kernels"
+    kernels = bench.size("kernels")
+    make_kernel_tree(root, kernels)
+    dump_root = bench.root / "scan" / "match"
+    make_dump_tree(dump_root, 1, kernels=kernels)
+    dump = CrashDumpDiscovery(str(dump_root), FileCatalog()).get_crash_dump_by_name("vmcore")
+
+    def detection():
+        detection = KernelDetection(str(root), FileCatalog(), KernelIndex())
+        detection.debug_paths = [root]
+        return detection
+
+    def cold_scan():
+        # A fresh index parses the build-id of every image
+        detection().find_kernel_files()
+
+    warm = detection()
+    warm.find_kernel_files()
+    if warm.find_matching_kernel(dump) is None:
+        raise RuntimeError("No kernel matched the synthetic dump")
+    return {"cold_ms": round(best_of(3, cold_scan) * 1000, 2),
+            "warm_ms": round(best_of(5, warm.find_kernel_files) * 1000, 2),
+            "match_ms": round(best_of(5, warm.find_matching_kernel, dump) * 1000, 2)}
+
+
+def bench_sse_concurrency(bench: Bench) -> Dict[str, float]:
+    """Concurrent SSE clients, each with its own crash session, running commands."""
+    import uvicorn
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+
+    clients = bench.size("sse_clients")
+    commands = bench.size("sse_commands")
+    bench.pair()
+    os.environ.update({
+        "CRASH_DUMP_PATH": str(bench.dump_root),
+        "KERNEL_PATH": str(bench.kernel_root),
+        "CRASH_BINARY": CRASH_BINARY,
+        "CRASH_MCP_CATALOG": "",
+        "CRASH_WATCH_DUMPS": "false",
+        "CRASH_PREWARM": "false",
+        "CRASH_SPARE_SESSIONS": "0",
+        "CRASH_CACHE_MAX_MB": "0",
+        "MAX_CRASH_SESSIONS": str(clients),
+    })
+    from crash_mcp.server import CrashMCPServer
+    crash_server = CrashMCPServer()
+    crash_server.kernel_detection.debug_paths = [bench.kernel_root]
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    http = uvicorn.Server(uvicorn.Config(crash_server.create_sse_app(), host="127.0.0.1", port=port,
+                                         log_level="warning"))
+    thread = threading.Thread(target=http.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not http.started and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    histogram = LatencyHistogram()
+
+    async def client():
+        async with sse_client(f"http://127.0.0.1:{port}/sse") as streams:
+            async with ClientSession(*streams) as session:
+                await session.initialize()
+                result = await session.call_tool("start_crash_session", {"dump_name": "vmcore", "timeout": 30})
+                if result.content[0].text.startswith("Error"):
+                    raise RuntimeError(result.content[0].text)
+                for _ in range(commands):
+                    started = time.perf_counter()
+                    result = await session.call_tool("crash_command", {"command": "sys"})
+                    histogram.record(time.perf_counter() - started)
+                    if result.content[0].text.startswith("Error"):
+                        raise RuntimeError(result.content[0].text)
+
+    async def run_clients():
+        await asyncio.gather(*(client() for _ in range(clients)))
+
+    try:
+        elapsed, _ = timed(asyncio.run, run_clients())
+    finally:
+        http.should_exit = True
+        thread.join(10)
+        crash_server._shutdown()
+    return dict(latency_metrics(histogram), calls_per_s=round(clients * commands / elapsed, 1),
+                total_seconds=round(elapsed, 3))
+
+
+BENCHMARKS = {
+    "session_start": bench_session_start,
+    "command_latency": bench_command_latency,
+    "batch_pipelining": bench_batch_pipelining,
+    "output_throughput": bench_output_throughput,
+    "large_output_memory": bench_large_output_memory,
+    "scan_dumps": bench_scan_dumps,
+    "scan_kernels": bench_scan_kernels,
+    "sse_concurrency": bench_sse_concurrency,
+}
+
+
+# Absolute changes below these are noise whatever their relative size, by metric suffix
+NOISE_FLOORS = {"_ms": 2.0, "_mb": 4.0}
+
+
+def higher_is_better(metric: str) -> bool:
+    """Check if a larger value of a metric is an improvement."""
+    return metric.endswith("_per_s")
+
+
+def compare(results: dict, baselines: dict, tolerance: float) -> int:
+    """Print the results next to their baselines and count the regressions."""
+    regressions = 0
+    print(f"\n{'benchmark':<22}{'metric':<18}{'baseline':>12}{'result':>12}{'change':>10}")
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            baseline = baselines.get(name, {}).get(metric)
+            if not baseline:
+                print(f"{name:<22}{metric:<18}{'-':>12}{value:>12}")
+                continue
+            change = value / baseline - 1
+            worse = -change if higher_is_better(metric) else change
+            floor = next((floor for suffix, floor in NOISE_FLOORS.items() if metric.endswith(suffix)), 0)
+            flag = ""
+            if worse > tolerance and abs(value - baseline) > floor:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{name:<22}{metric:<18}{baseline:>12}{value:>12}{change:>+10.0%}{flag}")
+    return regressions
+
+
+def load_baselines(path: str, quick: bool) -> dict:
+    """Load the stored baselines of a run size, or nothing if there are none."""
+    try:
+        with open(path) as f:
+            return json.load(f).get("quick" if quick else "full", {}).get("results", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baselines(path: str, quick: bool, results: dict):
+    """Store the results as the baselines of a run size, merged with the existing ones."""
+    try:
+        with open(path) as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        stored = {}
+    entry = stored.setdefault("quick" if quick else "full", {})
+    entry["machine"] = {"python": platform.python_version(), "system": platform.platform(),
+                        "cpus": os.cpu_count()}
+    entry.setdefault("results", {}).update(results)
+    with open(path, "w") as f:
+        json.dump(stored, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the crash MCP server hot paths")
+    parser.add_argument("benchmarks", nargs="*", help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--quick", action="store_true", help="use smaller sizes")
+    parser.add_argument("--baselines", default=BASELINES, help="baseline file")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="relative change reported as a regression (default: 0.25)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.WARNING)
+    root = Path(tempfile.mkdtemp(prefix="crash-mcp-bench-"))
+    results = {}
+    try:
+        bench = Bench(root, args.quick)
+        for name in args.benchmarks or BENCHMARKS:
+            print(f"running {name}...", flush=True)
+            results[name] = BENCHMARKS[name](bench)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    regressions = compare(results, load_baselines(args.baselines, args.quick), args.tolerance)
+    if args.save:
+        save_baselines(args.baselines, args.quick, results)
+        print(f"\nBaselines saved to {args.baselines}")
+        return 0
+    if regressions:
+        print(f"\n{regressions} regression(s) beyond {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
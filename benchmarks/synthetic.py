@@ -0,0 +1,71 @@
+"""
+Generators of synthetic crash dump and debug kernel trees for the benchmarks
+"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tests', 'crash'))
+
+from vmcore_fixtures import make_elf_vmcore, make_vmlinux
+
+# Files kdump writes next to each vmcore
+DUMP_COMPANIONS = ("vmcore-dmesg.txt", "kexec-dmesg.log")
+
+
+def release_name(index: int) -> str:
+    """Get the kernel release of the index-th synthetic kernel."""
+    return f"6.1.{index}-bench.x86_64"
+
+
+def build_id(release: str) -> str:
+    """Get the deterministic build-id of a synthetic kernel."""
+    return hashlib.sha1(release.encode()).hexdigest()
+
+
+def make_dump_tree(root: Path, dumps: int, hosts: int = 20, kernels: int = 10,
+                   noise_files: int = 2) -> List[Path]:
+    """Lay out ``dumps`` vmcores the way kdump does, spread over hosts.
+
+    Each dump lives in ``<host>/<address>-<date>/vmcore`` next to the
+    usual kdump companions and ``noise_files`` unrelated files, and carries
+    a VMCOREINFO note naming one of ``kernels`` releases. Returns the
+    dump paths.
+    """
+    paths = []
+    for index in range(dumps):
+        release = release_name(index % kernels)
+        directory = root / f"host{index % hosts:03d}" / f"10.0.{index // 256 % 256}.{index % 256}-2026-01-01-{index:06d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / "vmcore"
+        make_elf_vmcore(path, release, build_id(release))
+        for name in DUMP_COMPANIONS:
+            (directory / name).write_text(f"[    0.000000] Linux version {release}\n")
+        for noise in range(noise_files):
+            (directory / f"notes{noise}.txt").write_text("triage notes\n")
+        paths.append(path)
+    return paths
+
+
+def make_kernel_tree(root: Path, kernels: int, noise_files: int = 20) -> List[Path]:
+    """Lay out ``kernels`` debug kernels the way /usr/lib/debug/lib/modules does.
+
+    Each ``<release>/vmlinux`` is an ELF image with the build-id the
+    synthetic dumps of that release carry, surrounded by ``noise_files``
+    module debuginfo files. Returns the vmlinux paths.
+    """
+    paths = []
+    for index in range(kernels):
+        release = release_name(index)
+        directory = root / release
+        modules = directory / "kernel" / "drivers"
+        modules.mkdir(parents=True, exist_ok=True)
+        path = directory / "vmlinux"
+        make_vmlinux(path, build_id(release))
+        for noise in range(noise_files):
+            (modules / f"module{noise}.ko.debug").write_bytes(b"\0" * 64)
+        paths.append(path)
+    return paths
@@ -0,0 +1,280 @@
+"""Bulk triage of every crash dump, with resumable results."""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+import psutil
+
+from crash_mcp.catalog import FileCatalog
+from crash_mcp.config import Config, setup_logging
+from crash_mcp.crash_discovery import CrashDump, CrashDumpDiscovery
+from crash_mcp.crash_session import CrashSessionManager
+from crash_mcp.kernel_detection import KernelDetection
+from crash_mcp.kernel_index import KernelIndex
+from crash_mcp.resource_governor import ResourceGovernor
+from crash_mcp.signatures import SignatureIndex, signature_from_report
+from crash_mcp.triage import TriageEngine
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_pool_size(session_mb: int = 2048) -> int:
+    """Get how many crash processes fit the CPU count and available memory."""
+    cpus = os.cpu_count() or 1
+    if session_mb <= 0:
+        return cpus
+    try:
+        fits = psutil.virtual_memory().available // (session_mb * 1024 * 1024)
+    except (psutil.Error, OSError):
+        return cpus
+    return max(1, min(cpus, fits))
+
+
+class JsonlResults:
+    """Triage results appended to a JSON Lines file, one record per dump."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+", encoding="utf-8")
+        # Terminate a record cut short by an interrupted run
+        if self._file.tell():
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                self._file.write("\n")
+
+    def completed(self) -> Set[str]:
+        """Get the keys of dumps triaged successfully."""
+        done = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A record cut short by an interrupted run
+                    continue
+                if record.get("status") == "ok":
+                    done.add(record["key"])
+        return done
+
+    def write(self, record: dict):
+        """Append a record and flush it to disk."""
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+
+class SqliteResults:
+    """Triage results stored in a SQLite table keyed by dump."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS triage_results ("
+            "key TEXT PRIMARY KEY, dump TEXT, status TEXT, finished TEXT, record TEXT)"
+        )
+        self._conn.commit()
+
+    def completed(self) -> Set[str]:
+        """Get the keys of dumps triaged successfully."""
+        return {key for key, in self._conn.execute("SELECT key FROM triage_results WHERE status = 'ok'")}
+
+    def write(self, record: dict):
+        """Store a record, replacing an earlier one for the same dump."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO triage_results VALUES (?, ?, ?, ?, ?)",
+                (record["key"], record["dump"], record["status"], record["finished"], json.dumps(record))
+            )
+
+    def close(self):
+        """Close the database."""
+        self._conn.close()
+
+
+def open_results(path: str):
+    """Open a results file, SQLite for ``.db``/``.sqlite`` paths and JSON Lines otherwise."""
+    if Path(path).suffix in (".db", ".sqlite", ".sqlite3"):
+        return SqliteResults(path)
+    return JsonlResults(path)
+
+
+class BulkTriage:
+    """Triages many dumps with a bounded pool of crash processes.
+
+    Each dump is triaged by one crash process; ``workers`` dumps are in
+    flight at a time. Every result is written as soon as it is done, and
+    dumps already triaged successfully in the results file are skipped,
+    so an interrupted run resumes where it stopped. Failed dumps are
+    retried by the next run. With a ``signatures`` index, the signature of
+    each triaged dump is recorded and added to its result.
+    """
+
+    def __init__(self, manager: CrashSessionManager, kernel_detection: KernelDetection, results,
+                 workers: int = 1, command_timeout: int = 120, start_timeout: int = 180,
+                 signatures: Optional[SignatureIndex] = None):
+        self.manager = manager
+        self.signatures = signatures
+        self.kernel_detection = kernel_detection
+        self.results = results
+        self.workers = max(1, workers)
+        self.command_timeout = command_timeout
+        self.start_timeout = start_timeout
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.running = False
+        self.total = 0
+        self.skipped = 0
+        self.triaged = 0
+        self.failed = 0
+
+    def stop(self):
+        """Stop starting new dumps; dumps in flight finish."""
+        self._stop.set()
+
+    def get_stats(self) -> dict:
+        """Get progress counters."""
+        with self._lock:
+            return {
+                "running": self.running,
+                "workers": self.workers,
+                "total": self.total,
+                "skipped": self.skipped,
+                "triaged": self.triaged,
+                "failed": self.failed
+            }
+
+    def run(self, dumps: Iterable[CrashDump]) -> dict:
+        """Triage every dump not already done and return the progress counters."""
+        dumps = list(dumps)
+        done = self.results.completed()
+        todo = [dump for dump in dumps if dump.identity not in done]
+        with self._lock:
+            self.running = True
+            self.total = len(dumps)
+            self.skipped = len(dumps) - len(todo)
+        logger.info(f"Bulk triage of {len(todo)} dumps ({self.skipped} already done) "
+                    f"with {self.workers} workers")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crash-bulk") as pool:
+                try:
+                    list(pool.map(self._triage_one, todo))
+                except KeyboardInterrupt:
+                    # Let the dumps in flight finish and be recorded
+                    self.stop()
+                    raise
+        finally:
+            with self._lock:
+                self.running = False
+        return self.get_stats()
+
+    def _triage_one(self, dump: CrashDump):
+        """Triage one dump and record the result."""
+        if self._stop.is_set():
+            return
+
+        started = time.monotonic()
+        record = {"key": dump.identity, "dump": str(dump.path), "name": dump.name, "kernel": None}
+        try:
+            kernel = self.kernel_detection.find_matching_kernel(dump)
+            if not kernel:
+                record.update(status="error", error="No matching kernel found")
+            else:
+                record["kernel"] = str(kernel.path)
+                engine = TriageEngine(self.manager, workers=1, command_timeout=self.command_timeout,
+                                      keep_session=False)
+                report = engine.run(dump, kernel, self.start_timeout)
+                if report.get("error"):
+                    record.update(status="error", error=report["error"])
+                else:
+                    record.update(status="ok", report=report)
+                    signature = signature_from_report(report)
+                    if signature:
+                        record["signature"] = signature.hash
+                        if self.signatures:
+                            self.signatures.record(dump, signature)
+        except Exception as e:
+            logger.error(f"Error triaging crash dump {dump.name}: {e}")
+            record.update(status="error", error=str(e))
+
+        record["elapsed_ms"] = round((time.monotonic() - started) * 1000)
+        record["finished"] = datetime.now().isoformat()
+        with self._lock:
+            self.results.write(record)
+            if record["status"] == "ok":
+                self.triaged += 1
+            else:
+                self.failed += 1
+        logger.info(f"Triaged {dump.name}: {record['status']}")
+
+
+def main(argv: Optional[list] = None):
+    """Entry point for the bulk triage command."""
+    config = Config()
+    parser = argparse.ArgumentParser(description="Triage every crash dump in the crash dump path.")
+    parser.add_argument("-o", "--output", default=config.bulk_output,
+                        help="results file, SQLite for .db/.sqlite and JSON Lines otherwise "
+                             "(default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=0,
+                        help="crash processes to run at once (default: fit CPUs and available memory)")
+    parser.add_argument("--dump-path", default=str(config.crash_dump_path), help="crash dump directory")
+    parser.add_argument("--max-dumps", type=int, default=0, help="triage at most this many of the newest dumps")
+    parser.add_argument("--timeout", type=int, default=config.crash_timeout, help="timeout of each command")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    workers = args.workers or default_pool_size(config.bulk_session_mb)
+    catalog_path = config.catalog_path or None
+    discovery = CrashDumpDiscovery(args.dump_path, FileCatalog(catalog_path, namespace="dumps"))
+    kernel_detection = KernelDetection(
+        str(config.kernel_path),
+        FileCatalog(catalog_path, namespace="kernels"),
+        KernelIndex(catalog_path, workers=config.kernel_index_workers)
+    )
+    governor = ResourceGovernor(memory_mb=config.session_memory_mb, cpu_percent=config.session_cpu_percent,
+                                cgroup_root=config.cgroup_root or None, min_available_mb=config.min_available_mb)
+    manager = CrashSessionManager(max_sessions=workers, idle_timeout=0, queue_timeout=config.session_init_timeout,
+                                  crash_binary=config.crash_binary, governor=governor)
+    results = open_results(args.output)
+    signatures = SignatureIndex(catalog_path)
+    bulk = BulkTriage(manager, kernel_detection, results, workers=workers,
+                      command_timeout=args.timeout, start_timeout=config.session_init_timeout,
+                      signatures=signatures)
+
+    try:
+        dumps = discovery.find_crash_dumps(max_dumps=args.max_dumps or sys.maxsize)
+        stats = bulk.run(dumps)
+    except KeyboardInterrupt:
+        bulk.stop()
+        stats = bulk.get_stats()
+        logger.warning("Interrupted; rerun to resume")
+    finally:
+        manager.close_all_sessions()
+        results.close()
+        signatures.close()
+
+    print(json.dumps(dict(stats, output=args.output), indent=2))
+    return 0 if not stats["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""Persistent catalog of crash dump and kernel files."""
+
+import fnmatch
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Files modified this recently are re-stat'ed on every scan since they may still be growing
+SETTLE_SECONDS = 120
+
+# Directories modified this recently are re-read since a change within the
+# same mtime tick would otherwise go unnoticed on coarse-grained filesystems
+MTIME_GRANULARITY_NS = 2 * 10**9
+
+
+class CatalogEntry(NamedTuple):
+    """A cataloged file."""
+    path: Path
+    size: int
+    mtime: float
+    mtime_ns: int = 0
+
+
+class _Directory(NamedTuple):
+    """Cached state of a scanned directory."""
+    mtime_ns: int
+    subdirs: Tuple[str, ...]
+
+
+def match_patterns(patterns: Iterable[str]) -> Callable[[str], bool]:
+    """Build a file name predicate from glob patterns."""
+    patterns = tuple(patterns)
+    return lambda name: any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+class FileCatalog:
+    """Catalog of matching files under directory trees, refreshed incrementally.
+
+    Each directory is stored with its mtime and list of subdirectories, and
+    each matching file with its size and mtime. A rescan only stats the
+    directories: one whose mtime is unchanged has the same entries as last
+    time, so it is not listed again. Only directories that changed are
+    re-read, and recently modified files are re-stat'ed so growing dumps
+    are noticed. The catalog is kept in memory and mirrored to SQLite so it
+    survives restarts; ``db_path`` None keeps it in memory only.
+
+    Several catalogs can share one database file using different namespaces.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, namespace: str = "default"):
+        self.namespace = namespace
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._dirs: Dict[str, _Directory] = {}
+        self._files: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._conn = self._connect(db_path)
+        self._load()
+
+    def _connect(self, db_path: Optional[str]) -> Optional[sqlite3.Connection]:
+        """Open the backing database, falling back to memory only on error."""
+        if not db_path:
+            return None
+
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS directories ("
+                "namespace TEXT, path TEXT, mtime_ns INTEGER, subdirs TEXT, "
+                "PRIMARY KEY (namespace, path))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "namespace TEXT, dir TEXT, name TEXT, size INTEGER, mtime_ns INTEGER, "
+                "PRIMARY KEY (namespace, dir, name))"
+            )
+            conn.commit()
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Cannot open catalog database {db_path}, keeping catalog in memory: {e}")
+            return None
+
+    def _load(self):
+        """Load the persisted catalog into memory."""
+        if not self._conn:
+            return
+
+        try:
+            for path, mtime_ns, subdirs in self._conn.execute(
+                "SELECT path, mtime_ns, subdirs FROM directories WHERE namespace = ?", (self.namespace,)
+            ):
+                self._dirs[path] = _Directory(mtime_ns, tuple(json.loads(subdirs)))
+            for directory, name, size, mtime_ns in self._conn.execute(
+                "SELECT dir, name, size, mtime_ns FROM files WHERE namespace = ?", (self.namespace,)
+            ):
+                self._files.setdefault(directory, {})[name] = (size, mtime_ns)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Ignoring unreadable catalog {self.db_path}: {e}")
+            self._dirs.clear()
+            self._files.clear()
+
+    def scan(self, root: Path, match: Callable[[str], bool], max_depth: Optional[int] = None) -> List[CatalogEntry]:
+        """Refresh the catalog under ``root`` and return the matching files.
+
+        ``max_depth`` limits how many directory levels below ``root`` are
+        searched (0 is the root itself).
+        """
+        root_key = str(root)
+        changes = []
+
+        with self._lock:
+            visited: Dict[str, None] = {}
+            self._visit(root_key, 0, max_depth, match, visited, changes)
+
+            # Forget directories that disappeared or fell out of the search
+            prefix = root_key.rstrip(os.sep) + os.sep
+            for path in [p for p in self._dirs if (p == root_key or p.startswith(prefix)) and p not in visited]:
+                self._forget(path, changes)
+
+            self._persist(changes)
+
+            entries = []
+            for directory in visited:
+                for name, (size, mtime_ns) in sorted(self._files.get(directory, {}).items()):
+                    entries.append(CatalogEntry(Path(directory) / name, size, mtime_ns / 1e9, mtime_ns))
+        return entries
+
+    def directories(self, root: Path) -> List[str]:
+        """List the cataloged directories under ``root``, including itself."""
+        root_key = str(root)
+        prefix = root_key.rstrip(os.sep) + os.sep
+        with self._lock:
+            return [p for p in self._dirs if p == root_key or p.startswith(prefix)]
+
+    def _visit(self, path: str, depth: int, max_depth: Optional[int], match: Callable[[str], bool],
+               visited: Dict[str, None], changes: list):
+        """Refresh one directory and recurse into its subdirectories."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Cannot access directory {path}: {e}")
+            return
+
+        visited[path] = None
+        cached = self._dirs.get(path)
+        settled = time.time_ns() - st.st_mtime_ns > MTIME_GRANULARITY_NS
+        if cached and cached.mtime_ns == st.st_mtime_ns and settled:
+            subdirs = cached.subdirs
+            self._restat_recent(path, changes)
+        else:
+            subdirs = self._list(path, st.st_mtime_ns, match, changes)
+
+        if max_depth is not None and depth >= max_depth:
+            return
+        for name in subdirs:
+            self._visit(os.path.join(path, name), depth + 1, max_depth, match, visited, changes)
+
+    def _list(self, path: str, mtime_ns: int, match: Callable[[str], bool], changes: list) -> Tuple[str, ...]:
+        """Read a changed directory and record its subdirectories and matching files."""
+        subdirs = []
+        files = {}
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif match(entry.name) and entry.is_file():
+                            st = entry.stat()
+                            files[entry.name] = (st.st_size, st.st_mtime_ns)
+                    except OSError as e:
+                        logger.warning(f"Cannot access {entry.path}: {e}")
+        except PermissionError as e:
+            logger.warning(f"Permission denied accessing directory {path}: {e}")
+
+        directory = _Directory(mtime_ns, tuple(sorted(subdirs)))
+        self._dirs[path] = directory
+        self._files[path] = files
+        changes.append(("dir", path, directory, files))
+        return directory.subdirs
+
+    def _restat_recent(self, path: str, changes: list):
+        """Re-stat recently modified files in an unchanged directory."""
+        files = self._files.get(path)
+        if not files:
+            return
+
+        cutoff = (time.time() - SETTLE_SECONDS) * 1e9
+        changed = False
+        for name, (size, mtime_ns) in list(files.items()):
+            if mtime_ns < cutoff:
+                continue
+            try:
+                st = os.stat(os.path.join(path, name))
+            except OSError:
+                continue
+            if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+                files[name] = (st.st_size, st.st_mtime_ns)
+                changed = True
+
+        if changed:
+            changes.append(("dir", path, self._dirs[path], files))
+
+    def _forget(self, path: str, changes: list):
+        """Drop a directory from the catalog."""
+        self._dirs.pop(path, None)
+        self._files.pop(path, None)
+        changes.append(("forget", path, None, None))
+
+    def _persist(self, changes: list):
+        """Write changed directories to the database in one transaction."""
+        if not self._conn or not changes:
+            return
+
+        try:
+            with self._conn:
+                for kind, path, directory, files in changes:
+                    self._conn.execute("DELETE FROM files WHERE namespace = ? AND dir = ?", (self.namespace, path))
+                    if kind == "forget":
+                        self._conn.execute(
+                            "DELETE FROM directories WHERE namespace = ? AND path = ?", (self.namespace, path)
+                        )
+                        continue
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?)",
+                        (self.namespace, path, directory.mtime_ns, json.dumps(directory.subdirs))
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                        [(self.namespace, path, name, size, mtime_ns) for name, (size, mtime_ns) in files.items()]
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Cannot persist catalog changes to {self.db_path}: {e}")
+
+    def close(self):
+        """Close the backing database."""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
@@ -4,7 +4,15 @@ import logging
 import os
 import subprocess
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+
+def _env_list(name: str) -> Optional[List[str]]:
+    """Read a comma-separated list from the environment, or None if unset."""
+    value = os.getenv(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
 
 
 class Config:
@@ -14,9 +22,50 @@ class Config:
         self.crash_dump_path = Path(os.getenv("CRASH_DUMP_PATH", "/var/crash"))
         self.kernel_path = Path(os.getenv("KERNEL_PATH", "/boot"))
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
+        self.crash_binary = os.getenv("CRASH_BINARY", "crash")
         self.crash_timeout = int(os.getenv("CRASH_TIMEOUT", "120"))
         self.max_crash_dumps = int(os.getenv("MAX_CRASH_DUMPS", "10"))
         self.session_init_timeout = int(os.getenv("SESSION_INIT_TIMEOUT", "180"))
+        self.max_crash_sessions = int(os.getenv("MAX_CRASH_SESSIONS", "4"))
+        self.max_sessions_rss_mb = int(os.getenv("MAX_SESSIONS_RSS_MB", "0"))
+        self.session_memory_mb = int(os.getenv("CRASH_SESSION_MEMORY_MB", "0"))
+        self.session_cpu_percent = int(os.getenv("CRASH_SESSION_CPU_PERCENT", "0"))
+        self.cgroup_root = os.getenv("CRASH_CGROUP_ROOT", "")
+        self.min_available_mb = int(os.getenv("CRASH_MIN_AVAILABLE_MB", "0"))
+        self.session_idle_timeout = int(os.getenv("SESSION_IDLE_TIMEOUT", "1800"))
+        self.session_queue_timeout = int(os.getenv("SESSION_QUEUE_TIMEOUT", "60"))
+        self.heartbeat_interval = int(os.getenv("CRASH_HEARTBEAT_INTERVAL", "60"))
+        self.heartbeat_timeout = int(os.getenv("CRASH_HEARTBEAT_TIMEOUT", "30"))
+        self.recover_sessions = os.getenv("CRASH_RECOVER_SESSIONS", "true").lower() in ("1", "true", "yes")
+        self.share_sessions = os.getenv("CRASH_SHARE_SESSIONS", "false").lower() in ("1", "true", "yes")
+        self.spare_sessions = int(os.getenv("CRASH_SPARE_SESSIONS", "1"))
+        self.result_cache_mb = int(os.getenv("CRASH_CACHE_MAX_MB", "64"))
+        self.result_cache_dir = os.getenv("CRASH_CACHE_DIR", "")
+        self.cacheable_commands = _env_list("CRASH_CACHE_COMMANDS")
+        self.uncacheable_commands = _env_list("CRASH_CACHE_DENY")
+        self.output_max_bytes = int(os.getenv("CRASH_OUTPUT_MAX_BYTES", str(1024 * 1024)))
+        self.result_store_mb = int(os.getenv("CRASH_RESULT_STORE_MB", "256"))
+        self.catalog_path = os.getenv(
+            "CRASH_MCP_CATALOG", str(Path.home() / ".cache" / "crash-mcp" / "catalog.db")
+        )
+        self.watch_dumps = os.getenv("CRASH_WATCH_DUMPS", "true").lower() in ("1", "true", "yes")
+        self.watch_poll_interval = float(os.getenv("CRASH_WATCH_POLL_INTERVAL", "30"))
+        self.dump_settle_seconds = float(os.getenv("CRASH_DUMP_SETTLE_SECONDS", "10"))
+        self.prewarm = os.getenv("CRASH_PREWARM", "true").lower() in ("1", "true", "yes")
+        self.prewarm_commands = _env_list("CRASH_PREWARM_COMMANDS")
+        self.prewarm_max_load = float(os.getenv("CRASH_PREWARM_MAX_LOAD", "0.75"))
+        self.prewarm_min_free_mb = int(os.getenv("CRASH_PREWARM_MIN_FREE_MB", "2048"))
+        self.triage_workers = int(os.getenv("CRASH_TRIAGE_WORKERS", "3"))
+        self.bulk_output = os.getenv(
+            "CRASH_BULK_OUTPUT", str(Path.home() / ".cache" / "crash-mcp" / "triage-results.jsonl")
+        )
+        self.bulk_session_mb = int(os.getenv("CRASH_BULK_SESSION_MB", "2048"))
+        self.vmcore_cache_mb = int(os.getenv("CRASH_VMCORE_CACHE_MB", "64"))
+        self.vmcore_readahead = int(os.getenv("CRASH_VMCORE_READAHEAD", "16"))
+        self.vmcore_read_workers = int(os.getenv("CRASH_VMCORE_READ_WORKERS", "4"))
+        self.vmcore_readers = int(os.getenv("CRASH_VMCORE_READERS", "2"))
+        self.kernel_index_workers = int(os.getenv("KERNEL_INDEX_WORKERS", "0")) or None
+        self.crash_io_workers = int(os.getenv("CRASH_IO_WORKERS", str(max(4, self.max_crash_sessions * 2))))
 
 
 def setup_logging():
@@ -27,7 +76,7 @@ def setup_logging():
     )
 
 
-def check_system_requirements() -> Dict[str, Any]:
+def check_system_requirements(crash_binary: str = "crash") -> Dict[str, Any]:
     """Check system requirements for crash analysis."""
     requirements = {
         "crash_utility": False,
@@ -38,7 +87,7 @@ def check_system_requirements() -> Dict[str, Any]:
     
     # Check crash utility
     try:
-        result = subprocess.run(["crash", "--version"], capture_output=True, text=True, timeout=10)
+        result = subprocess.run([crash_binary, "--version"], capture_output=True, text=True, timeout=10)
         requirements["crash_utility"] = result.returncode == 0
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
@@ -57,10 +106,10 @@ def check_system_requirements() -> Dict[str, Any]:
     return requirements
 
 
-def validate_crash_utility() -> str:
+def validate_crash_utility(crash_binary: str = "crash") -> str:
     """Validate crash utility availability and return version."""
     try:
-        result = subprocess.run(["crash", "--version"], capture_output=True, text=True, timeout=10)
+        result = subprocess.run([crash_binary, "--version"], capture_output=True, text=True, timeout=10)
         if result.returncode == 0:
             return result.stdout.strip()
     except (subprocess.TimeoutExpired, FileNotFoundError):
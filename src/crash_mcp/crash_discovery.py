@@ -2,13 +2,24 @@
 
 import logging
 import os
+import threading
 from pathlib import Path
+from collections import OrderedDict
 from typing import List, NamedTuple, Optional
 from datetime import datetime
 
+from crash_mcp.catalog import FileCatalog, match_patterns
+from crash_mcp.vmcore_header import DumpHeader, read_dump_header
+
 
 logger = logging.getLogger(__name__)
 
+# Suffix kdump/makedumpfile use while a dump is still being written
+INCOMPLETE_SUFFIX = "-incomplete"
+
+# Dump headers kept in memory, keyed by dump identity
+HEADER_CACHE_SIZE = 256
+
 
 class CrashDump(NamedTuple):
     """Represents a crash dump file."""
@@ -22,6 +33,12 @@ class CrashDump(NamedTuple):
         """Get modification time (alias for timestamp)."""
         return self.timestamp
 
+    @property
+    def identity(self) -> str:
+        """Identify this version of the dump file by path, size and mtime."""
+        stamp = self.timestamp.isoformat() if self.timestamp else ""
+        return f"{self.path}|{self.size}|{stamp}"
+
     def to_dict(self) -> dict:
         """Convert crash dump to dictionary."""
         return {
@@ -37,8 +54,11 @@ class CrashDump(NamedTuple):
 
 class CrashDumpDiscovery:
     """Discovers crash dump files in the system."""
-    
-    def __init__(self, crash_dump_path: str):
+
+    # Directory levels below the crash dump path that are searched
+    max_depth = 3
+
+    def __init__(self, crash_dump_path: str, catalog: Optional[FileCatalog] = None):
         self.crash_dump_path = Path(crash_dump_path)
         self.dump_patterns = [
             "vmcore*",
@@ -46,62 +66,87 @@ class CrashDumpDiscovery:
             "crash*",
             "dump*"
         ]
+        self.catalog = catalog or FileCatalog(namespace="dumps")
+        self._match = match_patterns(self.dump_patterns)
+        # Live index maintained by a DumpWatcher, newest first
+        self._index: Optional[List[CrashDump]] = None
+        self._index_lock = threading.Lock()
+        self._headers: "OrderedDict[str, Optional[DumpHeader]]" = OrderedDict()
+        self._headers_lock = threading.Lock()
     
     def find_crash_dumps(self, max_dumps: int = 10) -> List[CrashDump]:
         """Find crash dump files in the system."""
+        with self._index_lock:
+            index = self._index
+        if index is not None:
+            return index[:max_dumps]
+
+        return self.scan_crash_dumps()[:max_dumps]
+
+    def scan_crash_dumps(self) -> List[CrashDump]:
+        """Scan the crash dump path for all complete-looking dump files, newest first."""
         dumps = []
         
         if not self.crash_dump_path.exists():
             logger.warning(f"Crash dump path does not exist: {self.crash_dump_path}")
             return dumps
         
-        try:
-            # Search in main directory and subdirectories
-            for root, dirs, files in os.walk(self.crash_dump_path):
-                root_path = Path(root)
-                
-                for file in files:
-                    file_path = root_path / file
-                    
-                    # Check if file matches dump patterns
-                    if any(file_path.match(pattern) for pattern in self.dump_patterns):
-                        try:
-                            stat = file_path.stat()
-                            dump = CrashDump(
-                                name=file,
-                                path=file_path,
-                                size=stat.st_size,
-                                timestamp=datetime.fromtimestamp(stat.st_mtime)
-                            )
-                            dumps.append(dump)
-                        except (OSError, PermissionError) as e:
-                            logger.warning(f"Cannot access dump file {file_path}: {e}")
-                            continue
-                
-                # Limit search depth to avoid excessive recursion
-                if len(str(root_path).split(os.sep)) - len(str(self.crash_dump_path).split(os.sep)) > 2:
-                    dirs.clear()
-        
-        except PermissionError as e:
-            logger.error(f"Permission denied accessing crash dump directory: {e}")
+        # Incrementally refresh the catalog instead of walking the whole tree
+        for entry in self.catalog.scan(self.crash_dump_path, self._match, self.max_depth):
+            if entry.path.name.endswith(INCOMPLETE_SUFFIX):
+                continue
+            dumps.append(CrashDump(
+                name=entry.path.name,
+                path=entry.path,
+                size=entry.size,
+                timestamp=datetime.fromtimestamp(entry.mtime)
+            ))
         
-        # Sort by timestamp (newest first) and limit results
+        # Sort by timestamp (newest first)
         dumps.sort(key=lambda x: x.timestamp, reverse=True)
-        return dumps[:max_dumps]
+        return dumps
+
+    def update_index(self, dumps: Optional[List[CrashDump]]):
+        """Replace the live dump index; None goes back to scanning on every call."""
+        if dumps is not None:
+            dumps = sorted(dumps, key=lambda x: x.timestamp, reverse=True)
+        with self._index_lock:
+            self._index = dumps
     
     def get_dump_info(self, dump: CrashDump) -> dict:
         """Get detailed information about a crash dump."""
+        header = self.get_dump_header(dump)
         return {
             "name": dump.name,
             "path": str(dump.path),
             "size": dump.size,
             "size_mb": round(dump.size / (1024 * 1024), 2),
             "timestamp": dump.timestamp.isoformat(),
-            "readable": os.access(dump.path, os.R_OK)
+            "readable": os.access(dump.path, os.R_OK),
+            "header": header.to_dict() if header else None
         }
 
+    def get_dump_header(self, dump: CrashDump) -> Optional[DumpHeader]:
+        """Get the parsed header of a dump, reading it only once per dump version."""
+        with self._headers_lock:
+            if dump.identity in self._headers:
+                self._headers.move_to_end(dump.identity)
+                return self._headers[dump.identity]
+
+        header = read_dump_header(dump.path)
+        with self._headers_lock:
+            self._headers[dump.identity] = header
+            while len(self._headers) > HEADER_CACHE_SIZE:
+                self._headers.popitem(last=False)
+        return header
+
     def get_latest_crash_dump(self) -> Optional[CrashDump]:
         """Get the most recent crash dump."""
+        with self._index_lock:
+            index = self._index
+        if index is not None:
+            return index[0] if index else None
+
         dumps = self.find_crash_dumps(max_dumps=1)
         return dumps[0] if dumps else None
 
@@ -127,6 +172,10 @@ class CrashDumpDiscovery:
             if not path.exists() or not path.is_file():
                 return False
 
+            # Never analyze a dump kdump is still writing
+            if filename.endswith(INCOMPLETE_SUFFIX):
+                return False
+
             # Check if filename matches dump patterns
             return any(Path(filename).match(pattern) for pattern in self.dump_patterns)
         except Exception as e:
@@ -1,124 +1,511 @@
 """Crash session management."""
 
+import itertools
+import json
 import logging
 import pexpect
+import psutil
+import re
 import subprocess
+import threading
 import time
-from typing import Optional, Tuple
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
+from crash_mcp.metrics import STATUS_TIMEOUT, Metrics, command_status
+from crash_mcp.parsers import get_parser, parse_output
+from crash_mcp.resource_governor import Placement, ResourceGovernor
+from crash_mcp.result_cache import ResultCache
+from crash_mcp.result_store import CommandOutput
 
 logger = logging.getLogger(__name__)
 
+_session_counter = itertools.count(1)
+
+# Client that owns sessions started outside any transport connection (stdio)
+DEFAULT_CLIENT = "default"
+
+# mod options that load or unload module debuginfo
+_MOD_STATE_OPTIONS = ("-s", "-S", "-d", "-D", "-r", "-R")
+
+# crash waiting for input at the end of what it printed so far
+_PROMPT_END_RE = re.compile(rb"crash> ?$")
+
+# pty read size and the minimum interval between progress callbacks
+_READ_SIZE = 64 * 1024
+PROGRESS_INTERVAL = 0.5
+
+# Called with (bytes, lines) read so far while a command runs
+ProgressCallback = Callable[[int, int], None]
+
+# Bytes held back from a command's output so a marker split across reads is seen
+_FRAME_TAIL = 256
+
+# Seconds between host memory checks when the governor has a floor
+PRESSURE_CHECK_INTERVAL = 5
+
+# Bytes of command input sent ahead of the command crash is executing
+PIPELINE_WINDOW = 2048
+
+# A complete line holding nothing but crash prompts
+_PROMPT_ONLY_RE = re.compile(rb"\s*(?:crash> ?)+")
+
+
+class BatchResult(NamedTuple):
+    """Result of one command of a batch."""
+    command: str
+    output: CommandOutput
+    error: str
+    return_code: int
+    elapsed: float
+    cached: bool = False
+
+
+def is_state_command(command: str) -> bool:
+    """Check if a command changes the state of the crash session."""
+    words = command.split()
+    if not words:
+        return False
+
+    verb, args = words[0], words[1:]
+    if verb in ("set", "extend", "alias"):
+        return bool(args)
+    if verb == "mod":
+        return any(arg in _MOD_STATE_OPTIONS for arg in args)
+    if verb == "gdb":
+        return bool(args) and args[0] == "set"
+    return False
+
+
+def _classify_output(output: CommandOutput) -> Tuple[str, int]:
+    """Get the error message and return code of a completed command's output."""
+    # crash reports failures such as unknown commands as "crash: ..."
+    first_line = output.read_page(0, max_bytes=4096, max_lines=1)[0].strip()
+    if first_line.startswith("crash: "):
+        return f"Crash error: {first_line}", 1
+    return "", 0
+
+
+def _startup_error(banner: CommandOutput) -> str:
+    """Get the "crash: ..." line explaining a failed startup, if any."""
+    matches, _ = banner.grep(r"^crash: ", max_matches=1)
+    return matches[0][1].strip() if matches else ""
+
+
+class SessionAdmissionError(Exception):
+    """Raised when no crash process slot frees up within the queue timeout."""
+
 
 class CrashSession:
     """Represents an active crash analysis session."""
 
-    def __init__(self, dump_path: str, kernel_path: str):
+    def __init__(self, dump_path: str, kernel_path: str, crash_binary: str = "crash",
+                 governor: Optional[ResourceGovernor] = None):
         self.dump_path = dump_path
         self.kernel_path = kernel_path
+        self.crash_binary = crash_binary
+        self.governor = governor
+        self.placement: Optional[Placement] = None
         self.process = None
-        self.session_id = f"crash_{int(time.time())}"
+        self.session_id = f"crash_{int(time.time())}_{next(_session_counter)}"
+        self.owner: Optional[str] = None
         self.active = False
-        self.prompt_patterns = [
-            r'crash> ',           # Standard prompt with space
-            r'crash>',            # Prompt without space
-            r'crash>\s*',         # Prompt with optional whitespace
-        ]
+        self.started_at = None
+        self.last_used = time.time()
+        # State-setting commands run so far, in order
+        self.state_commands: List[str] = []
+        # Set while a replacement crash process is being started after this one died
+        self.recovering = False
+        self.recovered = threading.Event()
+        self.restarts = 0
+        # Commands run in crash, their wall time and output, and timeouts
+        self.commands_run = 0
+        self.command_seconds = 0.0
+        self.output_bytes = 0
+        self.timeouts = 0
+        # Serializes command I/O on the pexpect channel
+        self._io_lock = threading.Lock()
+        # Marker lines printed after each framed command; the token is unique
+        # per session and the sequence number identifies the command. A
+        # printed marker starts its line or follows a prompt, unlike the
+        # marker in an echoed ``echo`` command line
+        self._marker_token = uuid.uuid4().hex[:12]
+        self._marker_seq = itertools.count(1)
+        token = self._marker_token.encode()
+        self._marker_re = re.compile(
+            rb"(?:crash> )*(?:echo __CMCP_" + token + rb"_\d+_END__ *\r?\n)?"
+            rb"(?:(?:crash> )+|(?<=\n))__CMCP_" + token + rb"_(\d+)_END__ *\r?\n"
+        )
+        # The same marker at the start of a line already split off
+        self._marker_line_re = re.compile(rb"(?:crash> )*__CMCP_" + token + rb"_(\d+)_END__ *\r?\n")
 
     def is_active(self) -> bool:
         """Check if the session is active."""
         return self.active
 
+    @property
+    def key(self) -> Tuple[str, str, Optional[str]]:
+        """Get the pool key of this session (owner is None when shared)."""
+        return (self.dump_path, self.kernel_path, self.owner)
+
+    def touch(self):
+        """Mark the session as used now."""
+        self.last_used = time.time()
+
+    def idle_time(self) -> float:
+        """Get the number of seconds since the session was last used."""
+        return time.time() - self.last_used
+
+    def is_busy(self) -> bool:
+        """Check if a command is currently running in the session."""
+        return self._io_lock.locked()
+
+    def get_rss(self) -> int:
+        """Get the resident memory of the crash process in bytes."""
+        if not self.process or not self.process.pid:
+            return 0
+        try:
+            return psutil.Process(self.process.pid).memory_info().rss
+        except (psutil.Error, OSError):
+            return 0
+
+    def get_cpu_seconds(self) -> float:
+        """Get the user and system CPU time of the crash process in seconds."""
+        if not self.process or not self.process.pid:
+            return 0.0
+        try:
+            times = psutil.Process(self.process.pid).cpu_times()
+            return times.user + times.system
+        except (psutil.Error, OSError):
+            return 0.0
+
+    def get_resource_usage(self) -> Optional[dict]:
+        """Get the limits and resource usage of the crash process, if governed."""
+        if not self.governor or not self.placement:
+            return None
+        return self.governor.usage(self.placement, self.process.pid if self.process else None)
+
+    def _account(self, elapsed: float, output: CommandOutput, error: str, return_code: int):
+        """Add one command to the session's counters."""
+        self.commands_run += 1
+        self.command_seconds += elapsed
+        self.output_bytes += output.size
+        if command_status(error, return_code) == STATUS_TIMEOUT:
+            self.timeouts += 1
+
     def start(self, timeout: int = 180) -> bool:
         """Start the crash session."""
         try:
             # Build crash command with --no_scroll to prevent pager issues
-            cmd_parts = ['crash', '--no_scroll', self.kernel_path, self.dump_path]
+            cmd_parts = [self.crash_binary, '--no_scroll', self.kernel_path, self.dump_path]
             cmd = ' '.join(cmd_parts)
 
             logger.info(f"Starting crash process: {cmd}")
 
-            # Start crash process
-            self.process = pexpect.spawn(cmd, timeout=timeout)
+            # Start crash process; without tty echo, pipelined input does not
+            # show up in the middle of command output
+            preexec = None
+            if self.governor:
+                self.placement = self.governor.place(self.session_id)
+                preexec = self.placement.preexec
+            self.process = pexpect.spawn(cmd, timeout=timeout, echo=False, preexec_fn=preexec)
+            # pexpect otherwise sleeps 50 ms before every send, which would
+            # dominate the cost of each command and defeat pipelining
+            self.process.delaybeforesend = None
 
-            # Wait for initial prompt
-            expect_list = self.prompt_patterns + ['crash: .*', pexpect.TIMEOUT, pexpect.EOF]
-
-            index = self.process.expect(expect_list, timeout=timeout)
+            banner = CommandOutput()
+            try:
+                error = self._read_startup(timeout, banner)
+            finally:
+                detail = _startup_error(banner)
+                banner.close()
 
-            if index < len(self.prompt_patterns):
-                logger.info(f"Crash session started successfully: {self.session_id}")
-                self.active = True
-                return True
-            elif index == len(self.prompt_patterns):
-                # Error pattern
-                error_msg = self.process.after.decode('utf-8', errors='ignore')
-                logger.error(f"Crash startup error: {error_msg}")
-                return False
-            elif index == len(self.prompt_patterns) + 1:
-                # Timeout
-                logger.error(f"Crash startup timed out after {timeout} seconds")
-                return False
-            else:
-                # EOF
-                logger.error("Crash process terminated during startup")
+            if error:
+                logger.error(f"Crash startup failed: {error}" + (f": {detail}" if detail else ""))
+                self.close()
                 return False
 
+            logger.info(f"Crash session started successfully: {self.session_id}")
+            self.active = True
+            self.started_at = time.time()
+            self.touch()
+            return True
+
         except Exception as e:
             logger.error(f"Failed to start crash session: {e}")
             return False
     
     def execute_command(self, command: str, timeout: int = 120) -> Tuple[str, str, int]:
-        """Execute a command in the crash session."""
+        """Execute a command in the crash session.
+
+        Commands on one session are serialized; callers on other threads
+        block until the running command has returned to the prompt.
+        """
+        output, error, return_code = self.run_command(command, timeout)
+        try:
+            return (output.text() if return_code == 0 else ""), error, return_code
+        finally:
+            output.close()
+
+    def run_command(self, command: str, timeout: int = 120,
+                    on_progress: Optional[ProgressCallback] = None) -> Tuple[CommandOutput, str, int]:
+        """Execute a command, streaming its output into a CommandOutput.
+
+        ``on_progress`` is called from this thread with the bytes and lines
+        read so far, at most every PROGRESS_INTERVAL seconds.
+        """
+        with self._io_lock:
+            started = time.monotonic()
+            output, error, return_code = self._execute_command(command, timeout, on_progress)
+            self._account(time.monotonic() - started, output, error, return_code)
+            if return_code == 0 and is_state_command(command):
+                self.state_commands.append(command.strip())
+            return output, error, return_code
+
+    def _execute_command(self, command: str, timeout: int,
+                         on_progress: Optional[ProgressCallback]) -> Tuple[CommandOutput, str, int]:
+        """Execute a command while holding the session I/O lock."""
         if not self.is_active() or not self.process:
-            return "", "Session not active", 1
+            return CommandOutput(), "Session not active", 1
 
+        self.touch()
         try:
             logger.info(f"Executing crash command: {command}")
 
-            # Send command to crash process
-            self.process.sendline(command)
-
-            # Wait for prompt to return
-            expect_list = self.prompt_patterns + ['crash: .*', pexpect.TIMEOUT, pexpect.EOF]
-
-            index = self.process.expect(expect_list, timeout=timeout)
-
-            if index < len(self.prompt_patterns):
-                # Successfully got prompt back
-                output = self.process.before.decode('utf-8', errors='ignore')
-                # Clean up the output by removing the command echo
-                lines = output.split('\n')
-                if lines and lines[0].strip() == command.strip():
-                    output = '\n'.join(lines[1:])
-                return output.strip(), "", 0
-            elif index == len(self.prompt_patterns):
-                # Error pattern matched
-                error_msg = self.process.after.decode('utf-8', errors='ignore')
-                return "", f"Crash error: {error_msg}", 1
-            elif index == len(self.prompt_patterns) + 1:
-                # Timeout
-                return "", f"Command '{command}' timed out after {timeout} seconds", 1
-            else:
-                # EOF - crash process died
-                self.active = False
-                return "", "Crash process terminated unexpectedly", 1
+            result = self._run_framed([command], timeout, on_progress)[0]
+            return result.output, result.error, result.return_code
 
         except Exception as e:
             logger.error(f"Error executing command '{command}': {e}")
-            return "", str(e), 1
-    
+            return CommandOutput(), str(e), 1
+
+    def _read_startup(self, timeout: int, banner: CommandOutput) -> Optional[str]:
+        """Read the startup banner until the first prompt and sync on a marker.
+
+        Only the newly read tail is checked for the prompt. A banner line
+        that looks like a prompt cannot desynchronize the session: the
+        marker that follows is only printed once crash really reads input.
+        Returns an error message, or None once the session is ready.
+        """
+        deadline = time.monotonic() + timeout
+        pending = b""
+        while not _PROMPT_END_RE.search(pending):
+            if len(pending) > _FRAME_TAIL:
+                banner.write(pending[:-_FRAME_TAIL])
+                pending = pending[-_FRAME_TAIL:]
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                banner.write(pending)
+                return f"timed out after {timeout} seconds"
+            try:
+                pending += self.process.read_nonblocking(_READ_SIZE, timeout=min(remaining, PROGRESS_INTERVAL))
+            except pexpect.TIMEOUT:
+                pass
+            except pexpect.EOF:
+                banner.write(pending)
+                return "crash process terminated during startup"
+
+        banner.write(pending)
+        self.process.buffer = b""
+        remaining = max(1, int(deadline - time.monotonic()))
+        result = self._run_framed([""], remaining, None)[0]
+        banner.write(result.output.read_page(0)[0].encode())
+        result.output.close()
+        return result.error or None
+
+    def run_batch(self, commands: Sequence[str], timeout: int = 120,
+                  on_progress: Optional[ProgressCallback] = None) -> List[BatchResult]:
+        """Execute several commands in one round-trip.
+
+        The commands are pipelined into crash, each followed by a marker
+        line, and the output is split at the markers rather than at prompts.
+        ``timeout`` applies to the whole batch.
+        """
+        if not commands:
+            return []
+        with self._io_lock:
+            results = self._execute_batch(commands, timeout, on_progress)
+            for result in results:
+                self._account(result.elapsed, result.output, result.error, result.return_code)
+                if result.return_code == 0 and is_state_command(result.command):
+                    self.state_commands.append(result.command.strip())
+            return results
+
+    def _execute_batch(self, commands: Sequence[str], timeout: int,
+                       on_progress: Optional[ProgressCallback]) -> List[BatchResult]:
+        """Execute a batch while holding the session I/O lock."""
+        if not self.is_active() or not self.process:
+            return [BatchResult(command, CommandOutput(), "Session not active", 1, 0.0) for command in commands]
+
+        self.touch()
+        logger.info(f"Executing crash batch of {len(commands)} commands")
+        try:
+            return self._run_framed(commands, timeout, on_progress)
+        except Exception as e:
+            logger.error(f"Error executing crash batch: {e}")
+            return [BatchResult(command, CommandOutput(), str(e), 1, 0.0) for command in commands]
+
+    def ping(self, timeout: int) -> bool:
+        """Check that crash still answers, without running a command.
+
+        The probe is only the framing marker, printed by crash's builtin
+        echo, so it does not fork a process that memory limits could
+        refuse. A session running a command on another thread counts as
+        alive.
+        """
+        if not self._io_lock.acquire(blocking=False):
+            return True
+        try:
+            if not self.is_active() or not self.process:
+                return False
+            result, = self._run_framed([""], timeout, None)
+            result.output.close()
+            return result.return_code == 0
+        except Exception as e:
+            logger.error(f"Error pinging crash session {self.session_id}: {e}")
+            return False
+        finally:
+            self._io_lock.release()
+
+    def _marker_command(self, seq: int) -> str:
+        """Build the command that prints the marker ending framed command ``seq``."""
+        # crash's builtin echo, unlike a ! shell escape, does not fork the
+        # crash process
+        return f"echo __CMCP_{self._marker_token}_{seq}_END__"
+
+    def _run_framed(self, commands: Sequence[str], timeout: int,
+                    on_progress: Optional[ProgressCallback]) -> List[BatchResult]:
+        """Send commands followed by markers and split the output at the markers.
+
+        Up to PIPELINE_WINDOW bytes of input are kept in flight. Prompts and
+        echoed input at the start of each command's output are dropped, and
+        only the newly read tail is searched for the marker pattern. Markers
+        of commands abandoned by an earlier timeout are skipped along with
+        their output.
+        """
+        seqs = [next(self._marker_seq) for _ in commands]
+        # An empty command only frames what crash prints before it reads input
+        inputs = [((command.strip() + "\n" if command.strip() else "") + self._marker_command(seq) + "\n").encode()
+                  for command, seq in zip(commands, seqs)]
+        sent_lines = {line for data in inputs for line in data.split(b"\n") if line}
+        outputs = [CommandOutput() for _ in commands]
+        results: List[BatchResult] = []
+
+        deadline = time.monotonic() + timeout
+        last_progress = time.monotonic()
+        pending = self.process.buffer
+        self.process.buffer = b""
+        next_send = 0
+        in_flight = 0
+        head = True
+        # Whether pending starts a line, i.e. was not cut mid-line to bound it
+        line_start = True
+        segment_start = time.monotonic()
+
+        def fail(error: str) -> List[BatchResult]:
+            outputs[len(results)].write(pending)
+            for index in range(len(results), len(commands)):
+                outputs[index].finish()
+                results.append(BatchResult(commands[index], outputs[index], error, 1,
+                                           time.monotonic() - segment_start))
+            return results
+
+        while len(results) < len(commands):
+            current = len(results)
+            # Whatever fits in the window goes out in a single write
+            window = []
+            while next_send < len(commands) and (
+                    next_send == current or in_flight + len(inputs[next_send]) <= PIPELINE_WINDOW):
+                window.append(inputs[next_send])
+                in_flight += len(inputs[next_send])
+                next_send += 1
+            if window:
+                self.process.send(b"".join(window))
+
+            if head:
+                # Drop prompts and echoed input before the command's output
+                while pending.startswith(b"crash> "):
+                    pending = pending[7:]
+                newline = pending.find(b"\n")
+                if newline >= 0 and pending[:newline].strip() in sent_lines:
+                    pending = pending[newline + 1:]
+                    continue
+                if newline >= 0 or not any(line.startswith(pending.strip()) for line in sent_lines | {b"crash>"}):
+                    head = False
+
+            match = (line_start and self._marker_line_re.match(pending)) or self._marker_re.search(pending)
+            if match:
+                seq = int(match.group(1))
+                if seq == seqs[current]:
+                    outputs[current].write(pending[:match.start()])
+                    outputs[current].finish()
+                    now = time.monotonic()
+                    error, return_code = _classify_output(outputs[current])
+                    results.append(BatchResult(commands[current], outputs[current], error, return_code,
+                                               now - segment_start))
+                    segment_start = now
+                    in_flight -= len(inputs[current])
+                else:
+                    # Left over from a command abandoned after a timeout
+                    outputs[current].close()
+                    outputs[current] = CommandOutput()
+                pending = pending[match.end():]
+                head = True
+                line_start = True
+                continue
+
+            if not head and len(pending) > _FRAME_TAIL:
+                outputs[current].write(pending[:-_FRAME_TAIL])
+                line_start = pending[-_FRAME_TAIL - 1] == ord("\n")
+                pending = pending[-_FRAME_TAIL:]
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return fail(f"Command '{commands[current]}' timed out after {timeout} seconds")
+
+            try:
+                pending += self.process.read_nonblocking(_READ_SIZE, timeout=min(remaining, PROGRESS_INTERVAL))
+            except pexpect.TIMEOUT:
+                pass
+            except pexpect.EOF:
+                self.active = False
+                return fail("Crash process terminated unexpectedly")
+
+            if on_progress and time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
+                on_progress(sum(output.size for output in outputs), sum(output.lines for output in outputs))
+
+        # Wait for the prompt following the last marker so the next command
+        # starts on a clean channel
+        while not _PROMPT_ONLY_RE.fullmatch(pending):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending += self.process.read_nonblocking(_READ_SIZE, timeout=min(remaining, PROGRESS_INTERVAL))
+            except (pexpect.TIMEOUT, pexpect.EOF):
+                break
+        else:
+            pending = b""
+        self.process.buffer = pending
+        return results
+
     def close(self):
         """Close the crash session."""
         if self.process:
             try:
-                # Try to quit gracefully first
-                if self.active:
+                # Try to quit gracefully first, unless a command is still
+                # running on another thread
+                if self.active and self._io_lock.acquire(blocking=False):
                     try:
                         self.process.sendline('quit')
                         self.process.expect(pexpect.EOF, timeout=5)
                     except:
                         pass
+                    finally:
+                        self._io_lock.release()
 
                 # Force close if still alive
                 if self.process.isalive():
@@ -130,66 +517,860 @@ class CrashSession:
                 logger.error(f"Error closing session: {e}")
             finally:
                 self.process = None
+        if self.placement:
+            self.governor.release(self.placement)
+            self.placement = None
         self.active = False
 
 
 class CrashSessionManager:
-    """Manages crash analysis sessions."""
-    
-    def __init__(self):
-        self.active_session: Optional[CrashSession] = None
-    
-    def start_session(self, crash_dump, kernel_file, timeout: int = 180) -> bool:
-        """Start a new crash analysis session."""
-        # Close existing session if any
-        if self.active_session:
-            self.close_session()
+    """Manages a pool of warm crash analysis sessions shared by many clients.
+
+    Sessions are keyed by (dump path, kernel path, owner) so switching back
+    to an already opened dump reuses the running crash process instead of
+    paying the full startup again. Each client (an SSE connection, or
+    ``DEFAULT_CLIENT`` for stdio) is bound to at most one session. With
+    ``share_sessions`` enabled the owner is None and clients analyzing the
+    same dump share one read-only session; otherwise every client gets its
+    own crash process.
+
+    The pool is bounded by process count and total resident memory. Sessions
+    no client is bound to are evicted least recently used first; when every
+    slot is held by a bound session, new starts queue for up to
+    ``queue_timeout`` seconds and then fail with SessionAdmissionError.
+    Sessions idle for longer than ``idle_timeout`` seconds are reaped.
+    A crash process that dies, or stops answering the heartbeat sent to
+    idle sessions every ``heartbeat_interval`` seconds, is closed. With
+    ``recover_sessions`` a bound session is instead replaced in the
+    background by one on the same (dump, kernel) with its state commands
+    replayed, and its clients' commands wait for the replacement. A client
+    whose session cannot be restarted is left without one rather than moved
+    to another dump.
+    With a ResourceGovernor, every crash process is started under its
+    memory and CPU limits, and idle sessions are closed whenever host
+    available memory drops below the governor's floor.
+
+    Once a dump has been opened, up to ``spare_sessions`` further crash
+    processes for the same (dump, kernel) are started in the background
+    and kept unowned. A client opening that dump again takes a spare
+    instead of paying the symbol load; spares only use slots nobody is
+    waiting for and are the first to be evicted.
+    """
+
+    def __init__(self, max_sessions: int = 4, max_rss_mb: int = 0, idle_timeout: int = 1800,
+                 queue_timeout: int = 60, share_sessions: bool = False,
+                 result_cache: Optional[ResultCache] = None, spare_sessions: int = 0,
+                 metrics: Optional[Metrics] = None, crash_binary: str = "crash",
+                 governor: Optional[ResourceGovernor] = None, heartbeat_interval: int = 0,
+                 heartbeat_timeout: int = 30, recover_sessions: bool = False, recovery_timeout: int = 180):
+        self.max_sessions = max(1, max_sessions)
+        self.max_rss_mb = max_rss_mb
+        self.idle_timeout = idle_timeout
+        self.queue_timeout = queue_timeout
+        self.share_sessions = share_sessions
+        self.result_cache = result_cache
+        self.metrics = metrics
+        self.crash_binary = crash_binary
+        self.governor = governor
+        self.heartbeat_interval = max(0, heartbeat_interval)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.recover_sessions = recover_sessions
+        self.recovery_timeout = recovery_timeout
+        # Dump of each client whose session died and could not be restarted
+        self.lost_sessions: Dict[str, str] = {}
+        self.spare_sessions = max(0, spare_sessions)
+        self.sessions: "OrderedDict[Tuple[str, str, Optional[str]], CrashSession]" = OrderedDict()
+        self.bindings: Dict[str, CrashSession] = {}
+        self.spares: "OrderedDict[Tuple[str, str], List[CrashSession]]" = OrderedDict()
+        self._spares_starting: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.RLock()
+        self._slot_freed = threading.Condition(self._lock)
+        # Start lock of each session key and the number of starts holding or awaiting it
+        self._start_locks: Dict[Tuple[str, str, Optional[str]], List] = {}
+        # Sessions dropped from the pool whose crash process is still to be closed
+        self._detached: List[CrashSession] = []
+        self._starting = 0
+        self._waiting = 0
+        self._reaper: Optional[threading.Thread] = None
+        self._stop_reaper = threading.Event()
+
+    @property
+    def active_session(self) -> Optional[CrashSession]:
+        """Get the session bound to the default client."""
+        return self.bindings.get(DEFAULT_CLIENT)
+
+    def get_session(self, client_id: str = DEFAULT_CLIENT) -> Optional[CrashSession]:
+        """Get the session bound to a client."""
+        return self.bindings.get(client_id)
+
+    def start_session(self, crash_dump, kernel_file, timeout: int = 180,
+                      client_id: str = DEFAULT_CLIENT, spare: bool = True, private: bool = False) -> bool:
+        """Start a crash analysis session for a client, reusing a warm one when possible.
+
+        With ``spare`` False no spare session is started for the dump; with
+        ``private`` True the client gets its own session even when sessions
+        are shared.
+        """
+        owner = None if self.share_sessions and not private else client_id
+        key = (str(crash_dump.path), str(kernel_file.path), owner)
+
+        # Concurrent starts of the same session wait for a single crash process
+        with self._lock:
+            entry = self._start_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                return self._start_session(key, client_id, crash_dump, kernel_file, timeout, spare)
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._start_locks[key]
+            self._close_detached()
 
+    def _start_session(self, key: Tuple[str, str, Optional[str]], client_id: str,
+                       crash_dump, kernel_file, timeout: int, spare: bool = True) -> bool:
+        """Start or reuse the session for ``key`` while holding its start lock."""
+        with self._lock:
+            self._reap_idle()
+
+            session = self.sessions.get(key)
+            if session and session.is_active():
+                logger.info(f"Reusing warm crash session: {session.session_id}")
+                self.sessions.move_to_end(key)
+                session.touch()
+                self._bind(client_id, session)
+                self._record_start("warm")
+                return True
+            if session:
+                self._remove_session(session)
+
+            # The client's previous session stays warm but becomes evictable,
+            # so it can make room for the new one; it is bound again if the
+            # new one cannot be started
+            previous = self.bindings.get(client_id)
+            self._unbind(client_id)
+            taken = self._take_spare(key)
+            if taken:
+                logger.info(f"Using spare crash session: {taken.session_id}")
+                self.sessions[key] = taken
+                self._bind(client_id, taken)
+                if spare:
+                    self._schedule_spare(key, timeout)
+                self._record_start("spare")
+                return True
+            try:
+                self._admit()
+            except SessionAdmissionError:
+                self._restore_binding(client_id, previous)
+                raise
+            self._starting += 1
+
+        # Evicted processes exit before the new one starts
+        self._close_detached()
+        session = None
+        started = False
+        start_time = time.monotonic()
         try:
             logger.info(f"Starting crash session with dump: {crash_dump.name}, kernel: {kernel_file.name}")
 
             # Create new session
-            session = CrashSession(str(crash_dump.path), str(kernel_file.path))
+            session = CrashSession(str(crash_dump.path), str(kernel_file.path), self.crash_binary, self.governor)
+            session.owner = key[2]
 
             # Actually start the crash process
-            if session.start(timeout):
-                self.active_session = session
-                logger.info(f"Crash session started successfully: {session.session_id}")
-                return True
-            else:
+            started = session.start(timeout)
+            if not started:
                 logger.error("Failed to start crash process")
-                return False
 
         except Exception as e:
             logger.error(f"Failed to start crash session: {e}")
-            return False
-    
-    def execute_command(self, command: str, timeout: int = 120) -> Tuple[str, str, int]:
-        """Execute a command in the active session."""
-        if not self.active_session:
-            return "", "No active crash session", 1
-        
-        return self.active_session.execute_command(command, timeout)
-    
-    def is_session_active(self) -> bool:
-        """Check if there's an active session."""
-        return self.active_session is not None and self.active_session.is_active()
-    
-    def get_session_info(self) -> dict:
-        """Get information about the active session."""
-        if not self.active_session:
-            return {"active": False}
-        
+
+        self._record_start("cold", time.monotonic() - start_time, started)
+        with self._lock:
+            self._starting -= 1
+            if not started:
+                self._restore_binding(client_id, previous)
+                self._slot_freed.notify_all()
+                return False
+
+            self.sessions[key] = session
+            self._bind(client_id, session)
+            self._enforce_memory_limit()
+            self._relieve_memory_pressure()
+            self._ensure_reaper()
+            if spare:
+                self._schedule_spare(key, timeout)
+
+        logger.info(f"Crash session started successfully: {session.session_id}")
+        return True
+
+    def _take_spare(self, key: Tuple[str, str, Optional[str]]) -> Optional[CrashSession]:
+        """Hand the oldest live spare for the key's (dump, kernel) to its owner."""
+        for spare in list(self.spares.get(key[:2], [])):
+            if not spare.is_active():
+                self._remove_session(spare)
+                continue
+            self._remove_spare(spare)
+            spare.owner = key[2]
+            spare.touch()
+            return spare
+        return None
+
+    def _schedule_spare(self, key: Tuple[str, str, Optional[str]], timeout: int):
+        """Start a spare session in the background if one is missing and a slot is free."""
+        pair = key[:2]
+        if self.spare_sessions <= 0 or self._stop_reaper.is_set():
+            return
+        # Spares never take a slot from a queued start or force an eviction
+        if (len(self.spares.get(pair, [])) + self._spares_starting.get(pair, 0) >= self.spare_sessions
+                or self._waiting or self._process_count() >= self.max_sessions):
+            return
+
+        self._starting += 1
+        self._spares_starting[pair] = self._spares_starting.get(pair, 0) + 1
+        threading.Thread(target=self._start_spare, args=(pair, timeout),
+                         name="crash-spare-session", daemon=True).start()
+
+    def _start_spare(self, pair: Tuple[str, str], timeout: int):
+        """Start a spare crash process for a (dump, kernel) pair."""
+        session = CrashSession(*pair, crash_binary=self.crash_binary, governor=self.governor)
+        started = False
+        start_time = time.monotonic()
+        try:
+            logger.info(f"Starting spare crash session for dump: {pair[0]}")
+            started = session.start(timeout)
+        except Exception as e:
+            logger.error(f"Failed to start spare crash session: {e}")
+        self._record_start("background", time.monotonic() - start_time, started)
+
+        with self._lock:
+            self._starting -= 1
+            self._spares_starting[pair] -= 1
+            if not self._spares_starting[pair]:
+                del self._spares_starting[pair]
+            if started and not self._stop_reaper.is_set():
+                self.spares.setdefault(pair, []).append(session)
+                self.spares.move_to_end(pair)
+                self._enforce_memory_limit()
+                self._relieve_memory_pressure()
+                self._ensure_reaper()
+            elif started:
+                self._detached.append(session)
+            self._slot_freed.notify_all()
+        self._close_detached()
+
+    def execute_command(self, command: str, timeout: int = 120,
+                        client_id: str = DEFAULT_CLIENT) -> Tuple[str, str, int]:
+        """Execute a command in the client's session."""
+        output, error, return_code = self.run_command(command, timeout, client_id)
+        try:
+            return (output.text() if return_code == 0 else ""), error, return_code
+        finally:
+            output.close()
+
+    def run_command(self, command: str, timeout: int = 120, client_id: str = DEFAULT_CLIENT,
+                    on_progress: Optional[ProgressCallback] = None) -> Tuple[CommandOutput, str, int]:
+        """Execute a command in the client's session, streaming its output.
+
+        The caller owns the returned CommandOutput and must close it.
+        """
+        session = self._bound_session(client_id)
+        if not session:
+            return CommandOutput(), "No active crash session", 1
+
+        if session.owner is None and is_state_command(command) and self._client_count(session) > 1:
+            return CommandOutput(), (f"Command '{command}' would change the state of a session shared "
+                                     "with other clients; shared sessions are read-only"), 1
+
+        key = None
+        if self.result_cache and not is_state_command(command):
+            key = self.result_cache.make_key(session.dump_path, session.kernel_path,
+                                             command, session.state_commands)
+        if key:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                session.touch()
+                if self.metrics:
+                    self.metrics.record_cache_hit(command, len(cached))
+                return CommandOutput.from_text(cached), "", 0
+
+        started = time.monotonic()
+        output, error, return_code = session.run_command(command, timeout, on_progress)
+        if self.metrics:
+            self.metrics.record_command(command, time.monotonic() - started, output.size,
+                                        command_status(error, return_code))
+        if not session.is_active() and self._session_died(session):
+            error += "; the session is being restarted"
+        # Outputs larger than the whole cache are not worth materializing
+        if key and return_code == 0 and output.size <= self.result_cache.max_bytes:
+            self.result_cache.put(key, output.text())
+        return output, error, return_code
+
+    def run_structured(self, command: str, timeout: int = 120, client_id: str = DEFAULT_CLIENT,
+                       on_progress: Optional[ProgressCallback] = None) -> Tuple[Optional[dict], str, int]:
+        """Execute a command in the client's session and parse its output into records.
+
+        The parsed form is cached next to the text, so repeated structured
+        requests skip both crash and the parser. Returns None as the
+        parsed form for commands without a parser.
+        """
+        if get_parser(command) is None:
+            return None, f"No structured parser for command '{command}'", 1
+
+        session = self._bound_session(client_id)
+        key = None
+        if session and self.result_cache and not is_state_command(command):
+            key = self.result_cache.make_key(session.dump_path, session.kernel_path,
+                                             command, session.state_commands)
+        if key:
+            key = self.result_cache.structured_key(key)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                session.touch()
+                if self.metrics:
+                    self.metrics.record_cache_hit(command, len(cached))
+                return json.loads(cached), "", 0
+
+        output, error, return_code = self.run_command(command, timeout, client_id, on_progress)
+        try:
+            if return_code != 0:
+                return None, error, return_code
+            parsed = parse_output(command, output.text())
+        finally:
+            output.close()
+
+        if key:
+            self.result_cache.put(key, json.dumps(parsed))
+        return parsed, "", 0
+
+    def run_batch(self, commands: Sequence[str], timeout: int = 120, client_id: str = DEFAULT_CLIENT,
+                  on_progress: Optional[ProgressCallback] = None) -> List[BatchResult]:
+        """Execute several commands in the client's session in one round-trip.
+
+        Cached results are served for commands before the first state
+        command of the batch; the rest are pipelined into crash. The caller
+        owns the returned outputs and must close them.
+        """
+        session = self._bound_session(client_id)
+        if not session:
+            return [BatchResult(command, CommandOutput(), "No active crash session", 1, 0.0)
+                    for command in commands]
+
+        if (session.owner is None and any(is_state_command(command) for command in commands)
+                and self._client_count(session) > 1):
+            return [BatchResult(command, CommandOutput(), "Batch would change the state of a session shared "
+                                "with other clients; shared sessions are read-only", 1, 0.0)
+                    for command in commands]
+
+        # Keys assume the batch's own state commands succeed
+        results: List[Optional[BatchResult]] = [None] * len(commands)
+        keys: List[Optional[str]] = [None] * len(commands)
+        state = list(session.state_commands)
+        for index, command in enumerate(commands):
+            if is_state_command(command):
+                state.append(command.strip())
+                continue
+            if not self.result_cache:
+                continue
+            keys[index] = self.result_cache.make_key(session.dump_path, session.kernel_path, command, state)
+            if keys[index] and len(state) == len(session.state_commands):
+                cached = self.result_cache.get(keys[index])
+                if cached is not None:
+                    results[index] = BatchResult(command, CommandOutput.from_text(cached), "", 0, 0.0, True)
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        session.touch()
+        for index, result in zip(pending, session.run_batch([commands[i] for i in pending], timeout, on_progress)):
+            results[index] = result
+        if not session.is_active():
+            self._session_died(session)
+
+        if self.metrics:
+            for result in results:
+                if result.cached:
+                    self.metrics.record_cache_hit(result.command, result.output.size)
+                else:
+                    self.metrics.record_command(result.command, result.elapsed, result.output.size,
+                                                command_status(result.error, result.return_code))
+
+        for index, result in enumerate(results):
+            if is_state_command(result.command) and result.return_code != 0:
+                # Later keys assumed this command succeeded
+                break
+            if (keys[index] and not result.cached and result.return_code == 0
+                    and result.output.size <= self.result_cache.max_bytes):
+                self.result_cache.put(keys[index], result.output.text())
+        return results
+
+    def is_session_active(self, client_id: str = DEFAULT_CLIENT) -> bool:
+        """Check if the client has an active session."""
+        session = self.bindings.get(client_id)
+        return session is not None and session.is_active()
+
+    def wait_for_recovery(self, client_id: str = DEFAULT_CLIENT) -> bool:
+        """Wait for the client's session to be restarted if its crash process died.
+
+        Returns whether the client has an active session afterwards.
+        """
+        session = self._bound_session(client_id)
+        return session is not None and session.is_active()
+
+    def get_lost_session(self, client_id: str = DEFAULT_CLIENT) -> Optional[str]:
+        """Get the dump of the client's session if it died and could not be restarted."""
+        return self.lost_sessions.get(client_id)
+
+    def check_sessions(self) -> List[str]:
+        """Ping idle sessions and recover those whose crash process died or hangs."""
+        with self._lock:
+            candidates = list(self.sessions.values()) + self._all_spares()
+        failed = []
+        for session in candidates:
+            if session.recovering or session.is_busy():
+                continue
+            if session.is_active() and session.ping(self.heartbeat_timeout):
+                continue
+            logger.warning(f"Crash session {session.session_id} failed its heartbeat")
+            failed.append(session.session_id)
+            self._session_died(session)
+        return failed
+
+    def get_session_info(self, client_id: str = DEFAULT_CLIENT) -> dict:
+        """Get information about the client's session and the session pool."""
+        with self._lock:
+            session = self.bindings.get(client_id)
+            pooled = [self._describe_session(pooled) for pooled in self.sessions.values()]
+            pool = {
+                "max_sessions": self.max_sessions,
+                "starting": self._starting,
+                "queued": self._waiting,
+                "spares": sum(len(spares) for spares in self.spares.values()),
+                "connected_clients": len(self.bindings)
+            }
+            if self.governor:
+                pool["governor"] = self.governor.get_stats()
+
+        if not session:
+            info = {"active": False, "pooled_sessions": pooled, "pool": pool}
+            if client_id in self.lost_sessions:
+                info["lost_dump_path"] = self.lost_sessions[client_id]
+            return info
+
         return {
             "active": True,
-            "session_id": self.active_session.session_id,
-            "dump_path": self.active_session.dump_path,
-            "kernel_path": self.active_session.kernel_path
+            "session_id": session.session_id,
+            "dump_path": session.dump_path,
+            "kernel_path": session.kernel_path,
+            "shared": session.owner is None,
+            "recovering": session.recovering,
+            "restarts": session.restarts,
+            "resources": session.get_resource_usage(),
+            "pooled_sessions": pooled,
+            "pool": pool
         }
-    
-    def close_session(self):
-        """Close the active session."""
-        if self.active_session:
-            logger.info(f"Closing crash session: {self.active_session.session_id}")
-            self.active_session.close()
-            self.active_session = None
+
+    def close_session(self, client_id: str = DEFAULT_CLIENT):
+        """Close the client's session, or detach from it if other clients share it."""
+        with self._lock:
+            self.lost_sessions.pop(client_id, None)
+            session = self.bindings.get(client_id)
+            if not session:
+                return
+            if self._client_count(session) > 1:
+                self._unbind(client_id)
+            else:
+                self._remove_session(session)
+        self._close_detached()
+
+    def release_client(self, client_id: str):
+        """Forget a disconnected client; its session stays warm in the pool."""
+        with self._lock:
+            self.lost_sessions.pop(client_id, None)
+            if client_id in self.bindings:
+                logger.info(f"Releasing crash session binding for client: {client_id}")
+                self._unbind(client_id)
+
+    def park_session(self, client_id: str) -> bool:
+        """Unbind a client and keep its session as a spare for the next client opening the dump.
+
+        A session other clients are bound to or that ran state commands is
+        only unbound. Returns whether the session became a spare.
+        """
+        with self._lock:
+            session = self.bindings.get(client_id)
+            if not session:
+                return False
+            self._unbind(client_id)
+            if self._client_count(session) or session.state_commands or not session.is_active():
+                return False
+
+            if self.sessions.get(session.key) is session:
+                del self.sessions[session.key]
+            session.owner = None
+            self.spares.setdefault(session.key[:2], []).append(session)
+            self.spares.move_to_end(session.key[:2])
+            logger.info(f"Parked crash session as a spare: {session.session_id}")
+            return True
+
+    def is_dump_open(self, dump_path: str) -> bool:
+        """Check if any pooled or spare session has a dump open."""
+        with self._lock:
+            return (any(key[0] == dump_path for key in self.sessions)
+                    or any(pair[0] == dump_path for pair in self.spares))
+
+    def idle_slots(self) -> int:
+        """Count the crash processes that could start without queueing or evicting a session."""
+        with self._lock:
+            return 0 if self._waiting else max(0, self.max_sessions - self._process_count())
+
+    def has_idle_capacity(self) -> bool:
+        """Check if a crash process could start without queueing or evicting a session."""
+        return self.idle_slots() > 0
+
+    def has_queued_starts(self) -> bool:
+        """Check if a session start is waiting for a crash process slot."""
+        return self._waiting > 0
+
+    def close_all_sessions(self):
+        """Close every pooled session and stop the idle reaper."""
+        self._stop_reaper.set()
+        with self._lock:
+            for session in list(self.sessions.values()):
+                self._remove_session(session)
+            for session in list(self.bindings.values()):
+                self._remove_session(session)
+            for session in self._all_spares():
+                self._remove_session(session)
+        self._close_detached()
+
+    def reap_idle_sessions(self) -> List[str]:
+        """Close sessions idle for longer than the idle timeout."""
+        with self._lock:
+            reaped = self._reap_idle()
+        self._close_detached()
+        return reaped
+
+    def _reap_idle(self) -> List[str]:
+        """Drop sessions idle for longer than the idle timeout from the pool."""
+        reaped = []
+        if self.idle_timeout <= 0:
+            return reaped
+
+        for session in list(self.sessions.values()) + self._all_spares():
+            if session.is_busy() or session.recovering:
+                continue
+            if not session.is_active() or session.idle_time() > self.idle_timeout:
+                logger.info(f"Reaping idle crash session: {session.session_id}")
+                reaped.append(session.session_id)
+                self._remove_session(session)
+        return reaped
+
+    def get_total_rss(self) -> int:
+        """Get the combined resident memory of all pooled sessions in bytes."""
+        with self._lock:
+            return sum(session.get_rss() for session in list(self.sessions.values()) + self._all_spares())
+
+    def get_process_stats(self) -> List[dict]:
+        """Get resource usage and command counters of every running pooled crash process.
+
+        Sessions that are closed or exit while their stats are read are left out.
+        """
+        with self._lock:
+            processes = [(session, "session") for session in self.sessions.values()]
+            processes += [(spare, "spare") for spare in self._all_spares()]
+        stats = []
+        for session, role in processes:
+            process = session.process
+            if not session.is_active() or not process:
+                continue
+            try:
+                stats.append({
+                    "session_id": session.session_id,
+                    "role": role,
+                    "dump_path": session.dump_path,
+                    "pid": process.pid,
+                    "rss_bytes": session.get_rss(),
+                    "cpu_seconds": round(session.get_cpu_seconds(), 3),
+                    "commands": session.commands_run,
+                    "command_seconds": round(session.command_seconds, 3),
+                    "output_bytes": session.output_bytes,
+                    "timeouts": session.timeouts,
+                    "busy": session.is_busy()
+                })
+            except Exception as e:
+                logger.debug(f"Skipping stats of crash session {session.session_id}: {e}")
+        return stats
+
+    def _bound_session(self, client_id: str) -> Optional[CrashSession]:
+        """Get the client's session, waiting while its crash process is being restarted."""
+        session = self.bindings.get(client_id)
+        if session and session.recovering:
+            session.recovered.wait(self.recovery_timeout)
+            session = self.bindings.get(client_id)
+        return session
+
+    def _session_died(self, session: CrashSession) -> bool:
+        """Handle a crash process that exited or hangs.
+
+        A pooled session clients are bound to is restarted in the
+        background; any other is closed. Returns whether a restart began.
+        """
+        with self._lock:
+            if session.recovering:
+                return True
+            clients = [client_id for client_id, bound in self.bindings.items() if bound is session]
+            pooled = self.sessions.get(session.key) is session
+            restart = self.recover_sessions and pooled and clients and not self._stop_reaper.is_set()
+            if not restart:
+                logger.warning(f"Crash session {session.session_id} died, closing it")
+                for client_id in clients:
+                    self.lost_sessions[client_id] = session.dump_path
+                self._remove_session(session)
+            else:
+                logger.warning(f"Crash session {session.session_id} on {session.dump_path} died, restarting it")
+                session.recovering = True
+                session.recovered.clear()
+        if not restart:
+            self._close_detached()
+            return False
+        threading.Thread(target=self._recover_session, args=(session,),
+                         name="crash-session-recovery", daemon=True).start()
+        return True
+
+    def _recover_session(self, session: CrashSession):
+        """Replace a dead session's crash process and replay its state commands."""
+        # A hung process is still running
+        session.close()
+        replacement = CrashSession(session.dump_path, session.kernel_path, self.crash_binary, self.governor)
+        replacement.owner = session.owner
+        replacement.restarts = session.restarts + 1
+        started = False
+        start_time = time.monotonic()
+        try:
+            started = replacement.start(self.recovery_timeout)
+            if started and session.state_commands:
+                logger.info(f"Replaying {len(session.state_commands)} state commands in {replacement.session_id}")
+                for result in replacement.run_batch(session.state_commands, self.recovery_timeout):
+                    if result.return_code != 0:
+                        logger.warning(f"Replaying '{result.command}' failed: {result.error}")
+                    result.output.close()
+        except Exception as e:
+            logger.error(f"Failed to restart crash session {session.session_id}: {e}")
+        self._record_start("recovery", time.monotonic() - start_time, started)
+
+        with self._lock:
+            current = self.sessions.get(session.key) is session
+            clients = [client_id for client_id, bound in self.bindings.items() if bound is session]
+            if started and current and not self._stop_reaper.is_set():
+                self.sessions[session.key] = replacement
+                for client_id in clients:
+                    self.bindings[client_id] = replacement
+                logger.info(f"Recovered crash session {session.session_id} as {replacement.session_id}")
+            else:
+                if started:
+                    self._detached.append(replacement)
+                for client_id in clients:
+                    self.lost_sessions[client_id] = session.dump_path
+                if current:
+                    self._remove_session(session)
+            session.recovering = False
+            session.recovered.set()
+        self._close_detached()
+
+    def _record_start(self, kind: str, elapsed: float = 0.0, ok: bool = True):
+        """Record a session start in the metrics, if any."""
+        if self.metrics:
+            self.metrics.record_session_start(kind, elapsed, ok)
+
+    def _all_spares(self) -> List[CrashSession]:
+        """Get every spare session, least recently started dump first."""
+        return [spare for spares in self.spares.values() for spare in spares]
+
+    def _process_count(self) -> int:
+        """Count the crash processes running or being started."""
+        return len(self.sessions) + sum(len(spares) for spares in self.spares.values()) + self._starting
+
+    def _describe_session(self, session: CrashSession) -> dict:
+        """Describe a pooled session."""
+        return {
+            "session_id": session.session_id,
+            "dump_path": session.dump_path,
+            "kernel_path": session.kernel_path,
+            "active": session.is_active(),
+            "shared": session.owner is None,
+            "clients": self._client_count(session),
+            "busy": session.is_busy(),
+            "idle_seconds": round(session.idle_time(), 1),
+            "rss_mb": round(session.get_rss() / (1024 * 1024), 2),
+            "commands": session.commands_run,
+            "timeouts": session.timeouts,
+            "recovering": session.recovering,
+            "restarts": session.restarts,
+            "resources": session.get_resource_usage()
+        }
+
+    def _client_count(self, session: CrashSession) -> int:
+        """Count the clients bound to a session."""
+        return sum(1 for bound in self.bindings.values() if bound is session)
+
+    def _bind(self, client_id: str, session: CrashSession):
+        """Bind a client to a session."""
+        self.lost_sessions.pop(client_id, None)
+        previous = self.bindings.get(client_id)
+        self.bindings[client_id] = session
+        if previous is not None and previous is not session:
+            self._slot_freed.notify_all()
+
+    def _unbind(self, client_id: str):
+        """Drop a client's binding, making an unshared session evictable."""
+        if self.bindings.pop(client_id, None) is not None:
+            self._slot_freed.notify_all()
+
+    def _restore_binding(self, client_id: str, previous: Optional[CrashSession]):
+        """Bind a client back to its previous session if that is still pooled and running."""
+        if (previous is not None and client_id not in self.bindings and previous.is_active()
+                and self.sessions.get(previous.key) is previous):
+            self._bind(client_id, previous)
+
+    def _remove_session(self, session: CrashSession):
+        """Drop a session from the pool and unbind its clients.
+
+        Its crash process is closed by the next ``_close_detached`` call,
+        once the pool lock is released.
+        """
+        logger.info(f"Closing crash session: {session.session_id}")
+        if self.sessions.get(session.key) is session:
+            del self.sessions[session.key]
+        self._remove_spare(session)
+        for client_id in [cid for cid, bound in self.bindings.items() if bound is session]:
+            del self.bindings[client_id]
+        if session not in self._detached:
+            self._detached.append(session)
+        self._slot_freed.notify_all()
+
+    def _close_detached(self):
+        """Close the crash processes of sessions dropped from the pool.
+
+        Closing waits for crash to quit, so it must not hold the pool lock.
+        """
+        with self._lock:
+            detached, self._detached = self._detached, []
+        for session in detached:
+            session.close()
+
+    def _remove_spare(self, session: CrashSession):
+        """Drop a session from the spares without closing it."""
+        spares = self.spares.get(session.key[:2])
+        if spares and session in spares:
+            spares.remove(session)
+            if not spares:
+                del self.spares[session.key[:2]]
+
+    def _evict_one(self) -> bool:
+        """Evict a spare, or else the least recently used session no client is bound to."""
+        for session in self._all_spares() + list(self.sessions.values()):
+            if self._client_count(session) == 0 and not session.is_busy():
+                logger.info(f"Evicting least recently used crash session: {session.session_id}")
+                self._remove_session(session)
+                return True
+        return False
+
+    def _admit(self):
+        """Wait until a crash process slot is free, evicting unbound sessions first."""
+        deadline = time.monotonic() + self.queue_timeout
+        while self._process_count() >= self.max_sessions:
+            if self._evict_one():
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SessionAdmissionError(
+                    f"All {self.max_sessions} crash process slots are in use; "
+                    f"no slot freed up within {self.queue_timeout} seconds"
+                )
+
+            logger.info(f"Waiting up to {remaining:.0f}s for a crash process slot")
+            self._waiting += 1
+            try:
+                self._slot_freed.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+    def _enforce_memory_limit(self):
+        """Evict unbound sessions while the pool exceeds its RSS cap."""
+        if self.max_rss_mb <= 0:
+            return
+
+        limit = self.max_rss_mb * 1024 * 1024
+        while len(self.sessions) + len(self._all_spares()) > 1 and self.get_total_rss() > limit:
+            logger.info(f"Pool RSS above {self.max_rss_mb} MB, evicting an idle session")
+            if not self._evict_one():
+                break
+
+    def relieve_memory_pressure(self) -> List[str]:
+        """Close idle sessions while host available memory is below the governor's floor.
+
+        Spares and sessions no client is bound to go first; then sessions
+        clients are bound to but not running a command, least recently used
+        first, as losing one is better than the host swapping.
+        """
+        with self._lock:
+            closed = self._relieve_memory_pressure()
+        self._close_detached()
+        return closed
+
+    def _relieve_memory_pressure(self) -> List[str]:
+        """Drop idle sessions from the pool while host available memory is below the floor."""
+        closed = []
+        if not self.governor:
+            return closed
+
+        while self.governor.under_memory_pressure():
+            candidates = [session for session in self._all_spares() + list(self.sessions.values())
+                          if not session.is_busy()]
+            if not candidates:
+                break
+            unbound = [session for session in candidates if self._client_count(session) == 0]
+            session = (unbound or candidates)[0]
+            level = logging.INFO if unbound else logging.WARNING
+            logger.log(level, f"Host available memory below {self.governor.min_available_mb} MB, "
+                              f"closing idle crash session: {session.session_id}")
+            closed.append(session.session_id)
+            self._remove_session(session)
+        return closed
+
+    def _watches_memory(self) -> bool:
+        """Check if the reaper has to watch host memory."""
+        return bool(self.governor and self.governor.min_available_mb)
+
+    def _ensure_reaper(self):
+        """Start the background idle reaper thread if needed."""
+        if self.idle_timeout <= 0 and not self._watches_memory() and self.heartbeat_interval <= 0:
+            return
+        if self._reaper and self._reaper.is_alive():
+            return
+
+        self._stop_reaper.clear()
+        self._reaper = threading.Thread(target=self._reaper_loop, name="crash-session-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reaper_loop(self):
+        """Periodically reap idle sessions, relieve memory pressure and check sessions are alive."""
+        interval = max(1, min(60, self.idle_timeout // 2)) if self.idle_timeout > 0 else 60
+        if self._watches_memory():
+            interval = min(interval, PRESSURE_CHECK_INTERVAL)
+        if self.heartbeat_interval > 0:
+            interval = min(interval, self.heartbeat_interval)
+        last_heartbeat = time.monotonic()
+        while not self._stop_reaper.wait(interval):
+            try:
+                self.reap_idle_sessions()
+                with self._lock:
+                    self._enforce_memory_limit()
+                    self._relieve_memory_pressure()
+                self._close_detached()
+                if self.heartbeat_interval > 0 and time.monotonic() - last_heartbeat >= self.heartbeat_interval:
+                    last_heartbeat = time.monotonic()
+                    self.check_sessions()
+            except Exception as e:
+                logger.error(f"Error reaping idle crash sessions: {e}")
@@ -0,0 +1,270 @@
+"""Live crash dump index driven by inotify, with a polling fallback."""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from crash_mcp.crash_discovery import CrashDump, CrashDumpDiscovery
+
+
+logger = logging.getLogger(__name__)
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Minimum seconds between rescans triggered by bursts of events
+RESCAN_INTERVAL = 1.0
+
+
+class Inotify:
+    """Minimal ctypes binding for Linux inotify."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        """Watch a directory and return its watch descriptor."""
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def remove_watch(self, wd: int):
+        """Stop watching a directory."""
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """Read pending (watch descriptor, mask, name) events without blocking."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        """Close the inotify descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class DumpWatcher:
+    """Keeps the discovery's live dump index current.
+
+    Directories under the crash dump path are watched with inotify; any
+    create, move, delete or close-after-write triggers an incremental catalog
+    rescan. Without inotify the catalog is rescanned every ``poll_interval``
+    seconds. A new dump is only added to the index once it has not been
+    modified for ``settle_seconds`` (and is not a ``-incomplete`` file), so
+    sessions are never started on a dump kdump is still writing.
+    ``on_new_dump`` is called from the watcher thread for each dump that
+    lands after the watcher started.
+    """
+
+    def __init__(self, discovery: CrashDumpDiscovery,
+                 on_new_dump: Optional[Callable[[CrashDump], None]] = None,
+                 poll_interval: float = 30, settle_seconds: float = 10,
+                 use_inotify: bool = True):
+        self.discovery = discovery
+        self.on_new_dump = on_new_dump
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.use_inotify = use_inotify
+        self._inotify: Optional[Inotify] = None
+        self._watches: Dict[int, str] = {}
+        self._indexed: Dict[Path, CrashDump] = {}
+        self._pending: Dict[Path, CrashDump] = {}
+        # Guards _pending, which callers read while the watcher thread updates it
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake_r = self._wake_w = -1
+        self._last_scan = 0.0
+
+    @property
+    def mode(self) -> str:
+        """Get the change detection mode in use."""
+        return "inotify" if self._inotify else "polling"
+
+    def start(self):
+        """Build the initial index and start watching."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        if self.use_inotify:
+            try:
+                self._inotify = Inotify()
+            except OSError as e:
+                logger.warning(f"inotify unavailable, polling {self.discovery.crash_dump_path} instead: {e}")
+                self._inotify = None
+
+        self._stop.clear()
+        self._wake_r, self._wake_w = os.pipe()
+        self._refresh(initial=True)
+        self._thread = threading.Thread(target=self._run, name="crash-dump-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.discovery.crash_dump_path} for new crash dumps ({self.mode})")
+
+    def stop(self):
+        """Stop watching and fall back to scanning on demand."""
+        self._stop.set()
+        if self._wake_w >= 0:
+            os.write(self._wake_w, b"x")
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        for fd in (self._wake_r, self._wake_w):
+            if fd >= 0:
+                os.close(fd)
+        self._wake_r = self._wake_w = -1
+        self._watches.clear()
+        self.discovery.update_index(None)
+
+    def get_pending_dumps(self) -> List[CrashDump]:
+        """Get dumps that are still being written."""
+        with self._lock:
+            return list(self._pending.values())
+
+    def _run(self):
+        """Watcher thread main loop."""
+        while not self._stop.is_set():
+            timeout = self.poll_interval
+            if self._pending:
+                timeout = min(timeout, max(0.1, self.settle_seconds / 2))
+
+            if self._inotify:
+                try:
+                    ready, _, _ = select.select([self._inotify.fd, self._wake_r], [], [], timeout)
+                except (OSError, ValueError):
+                    break
+                if self._stop.is_set():
+                    break
+                if self._inotify.fd in ready:
+                    # Coalesce bursts of events into one rescan
+                    delay = RESCAN_INTERVAL - (time.monotonic() - self._last_scan)
+                    if delay > 0 and self._stop.wait(delay):
+                        break
+                    self._handle_events(self._inotify.read_events())
+            elif self._stop.wait(timeout):
+                break
+
+            # Rescan on events, and periodically as a safety net for missed
+            # events; unchanged directories cost one stat each
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing crash dump index: {e}")
+
+    def _handle_events(self, events: List[Tuple[int, int, str]]):
+        """Process inotify events."""
+        for wd, mask, _ in events:
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+            elif mask & IN_Q_OVERFLOW:
+                logger.warning("inotify event queue overflowed, rescanning crash dump path")
+
+    def _sync_watches(self):
+        """Watch every directory the catalog searches, dropping vanished ones."""
+        if not self._inotify:
+            return
+
+        root = self.discovery.crash_dump_path
+        wanted = set(self.discovery.catalog.directories(root))
+
+        watched = set(self._watches.values())
+        for directory in wanted - watched:
+            try:
+                self._watches[self._inotify.add_watch(directory)] = directory
+            except OSError as e:
+                logger.warning(f"Cannot watch {directory}: {e}")
+        for wd, directory in list(self._watches.items()):
+            if directory not in wanted:
+                del self._watches[wd]
+                try:
+                    self._inotify.remove_watch(wd)
+                except OSError:
+                    pass
+
+    def _refresh(self, initial: bool = False):
+        """Rescan the catalog and update the live index."""
+        self._last_scan = time.monotonic()
+        now = time.time()
+        current = {dump.path: dump for dump in self.discovery.scan_crash_dumps()}
+        self._sync_watches()
+        landed = []
+
+        for path in list(self._indexed):
+            if path not in current:
+                del self._indexed[path]
+
+        with self._lock:
+            for path in list(self._pending):
+                if path not in current:
+                    del self._pending[path]
+
+            for path, dump in current.items():
+                if now - dump.timestamp.timestamp() < self.settle_seconds:
+                    # Still being written; keep it out of the index until it settles
+                    self._indexed.pop(path, None)
+                    self._pending[path] = dump
+                    continue
+
+                self._pending.pop(path, None)
+                if path not in self._indexed and not initial:
+                    landed.append(dump)
+                self._indexed[path] = dump
+
+        self.discovery.update_index(list(self._indexed.values()))
+
+        for dump in landed:
+            logger.info(f"New crash dump available: {dump.path}")
+            if self.on_new_dump:
+                try:
+                    self.on_new_dump(dump)
+                except Exception as e:
+                    logger.error(f"Error handling new crash dump {dump.path}: {e}")
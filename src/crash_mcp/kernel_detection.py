@@ -6,6 +6,10 @@ import re
 from pathlib import Path
 from typing import List, NamedTuple, Optional
 
+from crash_mcp.catalog import FileCatalog
+from crash_mcp.kernel_index import KernelIndex
+from crash_mcp.vmcore_header import read_dump_header
+
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +20,8 @@ class KernelFile(NamedTuple):
     path: Path
     version: str
     size: int
+    build_id: Optional[str] = None
+    compiler: Optional[str] = None
 
     def to_dict(self) -> dict:
         """Convert kernel file to dictionary."""
@@ -23,6 +29,8 @@ class KernelFile(NamedTuple):
             "name": self.name,
             "path": str(self.path),
             "version": self.version,
+            "build_id": self.build_id,
+            "compiler": self.compiler,
             "size": self.size,
             "size_mb": round(self.size / (1024 * 1024), 2),
             "readable": os.access(self.path, os.R_OK)
@@ -32,8 +40,11 @@ class KernelFile(NamedTuple):
 class KernelDetection:
     """Detects available kernel files for crash analysis."""
     
-    def __init__(self, kernel_path: str):
+    def __init__(self, kernel_path: str, catalog: Optional[FileCatalog] = None,
+                 index: Optional[KernelIndex] = None):
         self.kernel_path = Path(kernel_path)
+        self.catalog = catalog or FileCatalog(namespace="kernels")
+        self.index = index or KernelIndex()
         self.debug_paths = [
             Path("/usr/lib/debug/lib/modules"),
             Path("/usr/lib/debug/boot"),
@@ -42,6 +53,28 @@ class KernelDetection:
     
     def find_kernel_files(self) -> List[KernelFile]:
         """Find available kernel files."""
+        kernels = self._collect_kernel_files()
+        
+        # Remove duplicates: a build-id identifies a build, so distinct
+        # builds sharing a version are all kept; images without one (vmlinuz)
+        # are only listed for versions no debug kernel covers
+        seen_builds = set()
+        seen_versions = set()
+        unique_kernels = []
+        for kernel in kernels:
+            if kernel.build_id:
+                if kernel.build_id in seen_builds:
+                    continue
+                seen_builds.add(kernel.build_id)
+            elif kernel.version in seen_versions:
+                continue
+            unique_kernels.append(kernel)
+            seen_versions.add(kernel.version)
+        
+        return unique_kernels
+    
+    def _collect_kernel_files(self) -> List[KernelFile]:
+        """Collect kernel files from all search paths, debug symbols first."""
         kernels = []
         
         # Search in debug symbol directories first (preferred)
@@ -49,48 +82,37 @@ class KernelDetection:
             if debug_path.exists():
                 kernels.extend(self._search_directory(debug_path))
         
-        # Remove duplicates based on version
-        seen_versions = set()
-        unique_kernels = []
-        for kernel in kernels:
-            if kernel.version not in seen_versions:
-                unique_kernels.append(kernel)
-                seen_versions.add(kernel.version)
-        
-        return unique_kernels
+        return kernels
     
     def _search_directory(self, directory: Path) -> List[KernelFile]:
         """Search for kernel files in a directory."""
         kernels = []
         
-        try:
-            for root, dirs, files in os.walk(directory):
-                root_path = Path(root)
-                
-                for file in files:
-                    file_path = root_path / file
-                    
-                    # Look for vmlinux (debug symbols) and vmlinuz (compressed kernel)
-                    if file in ["vmlinux", "vmlinuz"] or file.startswith("vmlinuz-"):
-                        version = self._extract_version(file, root_path)
-                        if version:
-                            try:
-                                stat = file_path.stat()
-                                kernel = KernelFile(
-                                    name=file,
-                                    path=file_path,
-                                    version=version,
-                                    size=stat.st_size
-                                )
-                                kernels.append(kernel)
-                            except (OSError, PermissionError) as e:
-                                logger.warning(f"Cannot access kernel file {file_path}: {e}")
-        
-        except PermissionError as e:
-            logger.warning(f"Permission denied accessing directory {directory}: {e}")
+        # Incrementally refresh the catalog instead of walking the whole tree
+        entries = self.catalog.scan(directory, self._is_kernel_file)
+        builds = self.index.lookup(
+            (entry.path, entry.size, entry.mtime_ns) for entry in entries if entry.path.name == "vmlinux"
+        )
+        for entry in entries:
+            version = self._extract_version(entry.path.name, entry.path.parent)
+            if version:
+                build = builds.get(str(entry.path))
+                kernels.append(KernelFile(
+                    name=entry.path.name,
+                    path=entry.path,
+                    version=version,
+                    size=entry.size,
+                    build_id=build.build_id if build else None,
+                    compiler=build.compiler if build else None
+                ))
         
         return kernels
     
+    @staticmethod
+    def _is_kernel_file(name: str) -> bool:
+        """Check if a file name is a vmlinux (debug symbols) or vmlinuz (compressed kernel)."""
+        return name in ["vmlinux", "vmlinuz"] or name.startswith("vmlinuz-")
+    
     def _extract_version(self, filename: str, directory: Path) -> str:
         """Extract kernel version from filename or directory path."""
         # Try to extract from filename
@@ -111,18 +133,56 @@ class KernelDetection:
         return "unknown"
     
     def find_matching_kernel(self, crash_dump) -> Optional[KernelFile]:
-        """Find a kernel file that matches the crash dump."""
-        kernels = self.find_kernel_files()
+        """Find a kernel file that matches the crash dump.
+        
+        The dump header is read first: a vmlinux with the dump's build-id
+        is preferred, then one whose version equals the dump's OSRELEASE.
+        Only when the header cannot be read is the first available kernel
+        used.
+        """
+        kernels = self._collect_kernel_files()
         
         if not kernels:
             logger.warning("No kernel files found")
             return None
         
-        # For now, return the first available kernel
-        # In a real implementation, this would match based on dump metadata
-        kernel = kernels[0]
-        logger.info(f"Selected kernel: {kernel.name} (version: {kernel.version})")
-        return kernel
+        header = read_dump_header(crash_dump.path)
+        if header is None or not (header.build_id or header.release):
+            kernel = kernels[0]
+            logger.warning(f"Cannot read release from {crash_dump.name}, using first kernel: {kernel.path}")
+            return kernel
+        
+        # crash needs the debug symbols in vmlinux; vmlinuz is a last resort
+        debug_kernels = [kernel for kernel in kernels if kernel.name == "vmlinux"]
+        
+        if header.build_id:
+            for kernel in debug_kernels:
+                if kernel.build_id == header.build_id:
+                    logger.info(f"Selected kernel by build-id {header.build_id}: {kernel.path}")
+                    return kernel
+        
+        if header.release:
+            for kernel in debug_kernels + [k for k in kernels if k.name != "vmlinux"]:
+                if kernel.version != header.release:
+                    continue
+                if header.build_id and kernel.build_id and kernel.build_id != header.build_id:
+                    # Same version string, different build
+                    continue
+                logger.info(f"Selected kernel by release {header.release}: {kernel.path}")
+                return kernel
+        
+        logger.warning(
+            f"No kernel matches crash dump {crash_dump.name} "
+            f"(release: {header.release}, build-id: {header.build_id})"
+        )
+        return None
+    
+    def get_build_id(self, kernel: KernelFile) -> Optional[str]:
+        """Get the GNU build-id of a vmlinux, parsed once per (path, size, mtime)."""
+        if kernel.build_id:
+            return kernel.build_id
+        build = self.index.get(kernel.path)
+        return build.build_id if build else None
     
     def get_kernel_info(self, kernel: KernelFile) -> dict:
         """Get detailed information about a kernel file."""
@@ -130,6 +190,8 @@ class KernelDetection:
             "name": kernel.name,
             "path": str(kernel.path),
             "version": kernel.version,
+            "build_id": kernel.build_id,
+            "compiler": kernel.compiler,
             "size": kernel.size,
             "size_mb": round(kernel.size / (1024 * 1024), 2),
             "readable": os.access(kernel.path, os.R_OK)
@@ -0,0 +1,138 @@
+"""Persistent build-id index of kernel images."""
+
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from crash_mcp.vmcore_header import read_elf_build_info
+
+
+logger = logging.getLogger(__name__)
+
+# Below this many unparsed images the pool is not worth starting
+PARALLEL_THRESHOLD = 4
+
+
+class KernelBuild(NamedTuple):
+    """Identity of a kernel image read from its ELF notes and sections."""
+    build_id: Optional[str]
+    compiler: Optional[str]
+
+
+def default_workers() -> int:
+    """Get the default number of parser threads."""
+    return min(8, (os.cpu_count() or 1) * 2)
+
+
+class KernelIndex:
+    """Build-ids of vmlinux images keyed by (path, size, mtime).
+
+    An image is only parsed the first time it is seen or after it changed;
+    parsing reads the ELF section headers, ``.note.gnu.build-id`` and
+    ``.comment`` through a memory map. Results are mirrored to SQLite
+    (``db_path`` None keeps them in memory only) so a restart does not
+    re-read a large ``/usr/lib/debug`` tree. Batches of unparsed images are
+    spread over a thread pool, which keeps many cold reads in flight.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, workers: Optional[int] = None):
+        self.db_path = db_path
+        self.workers = max(1, workers or default_workers())
+        self._lock = threading.Lock()
+        self._builds: Dict[str, Tuple[int, int, KernelBuild]] = {}
+        self._conn = self._connect(db_path)
+        self._load()
+
+    def _connect(self, db_path: Optional[str]) -> Optional[sqlite3.Connection]:
+        """Open the backing database, falling back to memory only on error."""
+        if not db_path:
+            return None
+
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kernel_builds ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, build_id TEXT, compiler TEXT)"
+            )
+            conn.commit()
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Cannot open kernel index database {db_path}, keeping index in memory: {e}")
+            return None
+
+    def _load(self):
+        """Load the persisted index into memory."""
+        if not self._conn:
+            return
+
+        try:
+            for path, size, mtime_ns, build_id, compiler in self._conn.execute(
+                "SELECT path, size, mtime_ns, build_id, compiler FROM kernel_builds"
+            ):
+                self._builds[path] = (size, mtime_ns, KernelBuild(build_id, compiler))
+        except sqlite3.Error as e:
+            logger.warning(f"Ignoring unreadable kernel index {self.db_path}: {e}")
+            self._builds.clear()
+
+    def lookup(self, files: Iterable[Tuple[Path, int, int]]) -> Dict[str, KernelBuild]:
+        """Get the build of each (path, size, mtime_ns), parsing new or changed images."""
+        files = list(files)
+        result = {}
+        stale = []
+        with self._lock:
+            for path, size, mtime_ns in files:
+                cached = self._builds.get(str(path))
+                if cached and cached[:2] == (size, mtime_ns):
+                    result[str(path)] = cached[2]
+                else:
+                    stale.append((path, size, mtime_ns))
+
+        if not stale:
+            return result
+
+        if len(stale) >= PARALLEL_THRESHOLD and self.workers > 1:
+            logger.info(f"Indexing {len(stale)} kernel images with {self.workers} workers")
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="kernel-index") as pool:
+                builds = list(pool.map(lambda item: KernelBuild(*read_elf_build_info(item[0])), stale))
+        else:
+            builds = [KernelBuild(*read_elf_build_info(path)) for path, _, _ in stale]
+
+        with self._lock:
+            for (path, size, mtime_ns), build in zip(stale, builds):
+                self._builds[str(path)] = (size, mtime_ns, build)
+                result[str(path)] = build
+            self._persist([(str(path), size, mtime_ns, build.build_id, build.compiler)
+                           for (path, size, mtime_ns), build in zip(stale, builds)])
+        return result
+
+    def get(self, path: Path) -> Optional[KernelBuild]:
+        """Get the build of one image, or None if it cannot be accessed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return self.lookup([(path, st.st_size, st.st_mtime_ns)])[str(path)]
+
+    def _persist(self, rows: list):
+        """Write parsed images to the database in one transaction."""
+        if not self._conn or not rows:
+            return
+
+        try:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO kernel_builds VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Cannot persist kernel index to {self.db_path}: {e}")
+
+    def close(self):
+        """Close the backing database."""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,262 @@
+"""Command and session metrics, with latency histograms and Prometheus output."""
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+# Sub-bucket bits of the latency histograms: 32 buckets per power of two, ~3% precision
+SUB_BUCKET_BITS = 6
+
+# Percentiles reported for every histogram
+PERCENTILES = (0.5, 0.9, 0.99, 0.999)
+
+# Distinct command verbs tracked; further verbs are counted as "other"
+MAX_VERBS = 200
+
+# Command outcomes
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+
+
+def command_verb(command: str) -> str:
+    """Get the verb a command is aggregated under."""
+    words = command.split()
+    return words[0] if words else ""
+
+
+def command_status(error: str, return_code: int) -> str:
+    """Classify a command result as ok, error or timeout."""
+    if return_code == 0:
+        return STATUS_OK
+    return STATUS_TIMEOUT if "timed out" in error else STATUS_ERROR
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the style of HdrHistogram.
+
+    Durations are recorded in microseconds into buckets that split every
+    power of two into ``2 ** (SUB_BUCKET_BITS - 1)`` equal parts, so any
+    percentile is accurate to a few percent with a few hundred counters
+    whatever the range, from microsecond cache hits to hour-long commands.
+    Not thread-safe; Metrics serializes access.
+    """
+
+    _half = 1 << (SUB_BUCKET_BITS - 1)
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        """Record one duration."""
+        seconds = max(0.0, seconds)
+        index = self._index(int(seconds * 1_000_000))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def _index(self, micros: int) -> int:
+        """Get the bucket of a duration in microseconds."""
+        if micros < 2 * self._half:
+            return micros
+        shift = micros.bit_length() - SUB_BUCKET_BITS
+        return shift * self._half + (micros >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        """Get the largest duration in microseconds that falls in a bucket."""
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        top = index - shift * self._half
+        return ((top + 1) << shift) - 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Get the duration in seconds below which ``fraction`` of the recorded ones fall."""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index) / 1_000_000, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        """Summarize the histogram in milliseconds."""
+        summary = {"count": self.count}
+        if self.count:
+            summary.update(
+                mean_ms=round(self.total / self.count * 1000, 3),
+                min_ms=round(self.min * 1000, 3),
+                max_ms=round(self.max * 1000, 3),
+                **{f"p{_percentile_label(fraction)}_ms": round(self.percentile(fraction) * 1000, 3)
+                   for fraction in PERCENTILES}
+            )
+        return summary
+
+
+def _percentile_label(fraction: float) -> str:
+    """Name a percentile: 0.5 -> 50, 0.999 -> 99.9."""
+    return f"{fraction * 100:g}"
+
+
+class CommandStats:
+    """Counters and latency of one command verb."""
+
+    def __init__(self):
+        self.statuses = {STATUS_OK: 0, STATUS_ERROR: 0, STATUS_TIMEOUT: 0}
+        self.cache_hits = 0
+        self.output_bytes = 0
+        self.latency = LatencyHistogram()
+
+    def to_dict(self) -> dict:
+        """Convert to a dictionary."""
+        return dict(self.statuses, cache_hits=self.cache_hits, output_bytes=self.output_bytes,
+                    latency=self.latency.to_dict())
+
+
+class Metrics:
+    """Thread-safe registry of command and session start metrics.
+
+    Commands are aggregated by verb: executions by outcome, output bytes,
+    result cache hits, and a latency histogram of the executions that
+    reached crash. Session starts are aggregated by kind: ``warm`` (a
+    pooled session was reused), ``spare`` (a pre-started one was taken),
+    ``cold`` (a crash process was started for a client), ``background``
+    (a spare was started) and ``recovery`` (a dead one was replaced).
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._commands: Dict[str, CommandStats] = {}
+        self._starts: Dict[str, dict] = {}
+
+    def _command(self, command: str) -> CommandStats:
+        """Get the stats of a command's verb, creating them if needed."""
+        verb = command_verb(command)
+        stats = self._commands.get(verb)
+        if stats is None:
+            if len(self._commands) >= MAX_VERBS:
+                verb = "other"
+                stats = self._commands.get(verb)
+            if stats is None:
+                stats = self._commands[verb] = CommandStats()
+        return stats
+
+    def record_command(self, command: str, elapsed: float, output_bytes: int, status: str):
+        """Record a command that ran in crash."""
+        with self._lock:
+            stats = self._command(command)
+            stats.statuses[status] += 1
+            stats.output_bytes += output_bytes
+            stats.latency.record(elapsed)
+
+    def record_cache_hit(self, command: str, output_bytes: int = 0):
+        """Record a command answered from the result cache."""
+        with self._lock:
+            stats = self._command(command)
+            stats.cache_hits += 1
+            stats.output_bytes += output_bytes
+
+    def record_session_start(self, kind: str, elapsed: float = 0.0, ok: bool = True):
+        """Record a session start of the given kind."""
+        with self._lock:
+            start = self._starts.setdefault(kind, {"ok": 0, "failed": 0, "latency": LatencyHistogram()})
+            start["ok" if ok else "failed"] += 1
+            if ok and kind in ("cold", "background", "recovery"):
+                start["latency"].record(elapsed)
+
+    def snapshot(self) -> dict:
+        """Get every metric as a dictionary."""
+        with self._lock:
+            return {
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "commands": {verb: stats.to_dict() for verb, stats in sorted(self._commands.items())},
+                "session_starts": {
+                    kind: {"ok": start["ok"], "failed": start["failed"], "latency": start["latency"].to_dict()}
+                    for kind, start in sorted(self._starts.items())
+                }
+            }
+
+    def render_prometheus(self, processes: Iterable[dict] = (), pool: Optional[dict] = None) -> str:
+        """Render the metrics, crash process stats and pool gauges in Prometheus text format."""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP crash_mcp_{name} {help_text}")
+            lines.append(f"# TYPE crash_mcp_{name} {kind}")
+
+        def sample(name: str, labels: dict, value):
+            label_text = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+            lines.append(f"crash_mcp_{name}{{{label_text}}} {value}" if label_text else f"crash_mcp_{name} {value}")
+
+        with self._lock:
+            family("uptime_seconds", "gauge", "Seconds since the server started")
+            sample("uptime_seconds", {}, round(time.time() - self.started, 3))
+
+            family("commands_total", "counter", "Crash commands executed, by verb and outcome")
+            for verb, stats in sorted(self._commands.items()):
+                for status, count in stats.statuses.items():
+                    sample("commands_total", {"verb": verb, "status": status}, count)
+            family("command_cache_hits_total", "counter", "Commands answered from the result cache")
+            for verb, stats in sorted(self._commands.items()):
+                sample("command_cache_hits_total", {"verb": verb}, stats.cache_hits)
+            family("command_output_bytes_total", "counter", "Bytes of command output returned")
+            for verb, stats in sorted(self._commands.items()):
+                sample("command_output_bytes_total", {"verb": verb}, stats.output_bytes)
+            family("command_duration_seconds", "summary", "Wall time of commands run in crash")
+            for verb, stats in sorted(self._commands.items()):
+                _summary(sample, "command_duration_seconds", {"verb": verb}, stats.latency)
+
+            family("session_starts_total", "counter", "Session starts, by kind and result")
+            for kind, start in sorted(self._starts.items()):
+                sample("session_starts_total", {"kind": kind, "result": "ok"}, start["ok"])
+                sample("session_starts_total", {"kind": kind, "result": "failed"}, start["failed"])
+            family("session_start_duration_seconds", "summary", "Wall time of crash process startups")
+            for kind, start in sorted(self._starts.items()):
+                if start["latency"].count:
+                    _summary(sample, "session_start_duration_seconds", {"kind": kind}, start["latency"])
+
+        # Entries lacking their labels cannot be told apart and are skipped
+        processes = [process for process in processes
+                     if all(process.get(label) is not None for label in ("session_id", "role", "dump_path"))]
+        for name, key, kind, help_text in (
+                ("process_rss_bytes", "rss_bytes", "gauge", "Resident memory of a crash process"),
+                ("process_cpu_seconds_total", "cpu_seconds", "counter", "CPU time of a crash process"),
+                ("process_commands_total", "commands", "counter", "Commands run by a crash process"),
+                ("process_timeouts_total", "timeouts", "counter", "Commands of a crash process that timed out")):
+            family(name, kind, help_text)
+            for process in processes:
+                if process.get(key) is not None:
+                    sample(name, {"session_id": process["session_id"], "role": process["role"],
+                                  "dump": process["dump_path"]}, process[key])
+
+        if pool:
+            family("pool", "gauge", "Crash session pool occupancy")
+            for key in ("sessions", "spares", "starting", "queued", "max_sessions"):
+                if key in pool:
+                    sample("pool", {"state": key}, pool[key])
+        return "\n".join(lines) + "\n"
+
+
+def _summary(sample, name: str, labels: dict, histogram: LatencyHistogram):
+    """Emit a histogram as a Prometheus summary."""
+    for fraction in PERCENTILES:
+        value = histogram.percentile(fraction)
+        sample(name, dict(labels, quantile=f"{fraction:g}"), value if value is not None else "NaN")
+    sample(name + "_sum", labels, round(histogram.total, 6))
+    sample(name + "_count", labels, histogram.count)
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
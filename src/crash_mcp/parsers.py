@@ -0,0 +1,276 @@
+"""Parsers turning crash command output into records."""
+
+import re
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+
+_TASK_HEADER_RE = re.compile(r'PID:\s*(\d+)\s+TASK:\s*([0-9a-f]+)\s+CPU:\s*(\d+)\s+COMMAND:\s*"([^"]*)"')
+_FRAME_RE = re.compile(r"^\s*#(\d+)\s+\[([0-9a-f]+)\]\s+(\S+)(?:\s+at\s+([0-9a-f]+))?(?:\s+\[([^\]]+)\])?")
+_EXCEPTION_RE = re.compile(r"\[exception RIP:\s*([^\]]+)\]")
+_SYS_RE = re.compile(r"^\s*([A-Z][A-Z _-]*):\s?(.*)$")
+# ``log -m`` prints the level after the timestamp; older crash versions print it first
+_LOG_RE = re.compile(r"^(?:<(\d)>)?\[\s*(\d+\.\d+)\]\s?(?:<(\d)>)?(.*)$")
+_KMEM_RE = re.compile(r"^\s*([A-Z][A-Z ]*?)\s+(\d+)\s+([\d.]+ [KMGT]?B)(?:\s+(\d+)% of)?")
+_RUNQ_CPU_RE = re.compile(r"^\s*CPU (\d+) RUNQUEUE: ([0-9a-f]+)")
+_RUNQ_TASK_RE = re.compile(r'^\s*(?:CURRENT:|\[\s*(\d+)\])\s+PID:\s*(\d+)\s+TASK:\s*([0-9a-f]+)\s+COMMAND:\s*"([^"]*)"')
+_HEX_RE = re.compile(r"[0-9a-f]+")
+
+# ps options that filter tasks without changing the output format
+_PS_FILTER_OPTIONS = frozenset(("-k", "-u", "-G", "-y"))
+
+
+class Record:
+    """Base of the parsed records: compact ``__slots__`` objects that convert to dicts."""
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-ready dict, nested records included."""
+        return {name: _to_json(getattr(self, name)) for name in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Frame(Record):
+    """One backtrace frame."""
+    __slots__ = ("level", "sp", "function", "address", "module")
+
+
+class Backtrace(Record):
+    """Backtrace of one task; ``exception_rip`` is set for exception frames."""
+    __slots__ = ("pid", "task", "cpu", "command", "frames", "exception_rip")
+
+
+class LogLine(Record):
+    """One kernel log line; ``timestamp`` is seconds since boot."""
+    __slots__ = ("timestamp", "level", "text")
+
+
+class Module(Record):
+    """One loaded kernel module."""
+    __slots__ = ("address", "name", "base", "size", "object_file")
+
+
+class MemoryRow(Record):
+    """One row of the ``kmem -i`` table."""
+    __slots__ = ("label", "pages", "size", "percent")
+
+
+class QueuedTask(Record):
+    """A task on a run queue; ``prio`` is None for the running task."""
+    __slots__ = ("prio", "pid", "task", "command")
+
+
+class RunQueue(Record):
+    """The run queue of one CPU."""
+    __slots__ = ("cpu", "address", "current", "queued")
+
+
+class TaskTable:
+    """``ps`` output as column arrays, one entry per task.
+
+    Numeric columns are ``array`` objects and the rest plain lists, so a
+    dump with 100k tasks costs a few MB instead of 100k dicts.
+    """
+
+    __slots__ = ("active", "pid", "ppid", "cpu", "task", "state", "mem", "vsz", "rss", "comm")
+
+    def __init__(self):
+        self.active = array("b")
+        self.pid = array("q")
+        self.ppid = array("q")
+        self.cpu = array("l")
+        self.task: List[str] = []
+        self.state: List[str] = []
+        self.mem = array("d")
+        self.vsz = array("q")
+        self.rss = array("q")
+        self.comm: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.pid)
+
+    def append(self, active: bool, pid: int, ppid: int, cpu: int, task: str, state: str,
+               mem: float, vsz: int, rss: int, comm: str):
+        """Add a task."""
+        self.active.append(active)
+        self.pid.append(pid)
+        self.ppid.append(ppid)
+        self.cpu.append(cpu)
+        self.task.append(task)
+        self.state.append(state)
+        self.mem.append(mem)
+        self.vsz.append(vsz)
+        self.rss.append(rss)
+        self.comm.append(comm)
+
+    def row(self, index: int) -> dict:
+        """Get one task as a dict."""
+        return {name: getattr(self, name)[index] for name in self.__slots__}
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-ready dict of columns."""
+        columns = {name: list(getattr(self, name)) for name in self.__slots__}
+        columns["active"] = [bool(value) for value in self.active]
+        return {"count": len(self), "columns": columns}
+
+
+def _to_json(value: Any) -> Any:
+    """Convert parsed values to JSON-ready ones."""
+    if isinstance(value, (Record, TaskTable)):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    return value
+
+
+def parse_bt(text: str) -> List[Backtrace]:
+    """Parse ``bt`` or ``bt -a`` output into one backtrace per task."""
+    traces = []
+    current = None
+    for line in text.splitlines():
+        match = _FRAME_RE.match(line)
+        if match:
+            if current is None:
+                current = Backtrace(None, None, None, None, [], None)
+                traces.append(current)
+            current.frames.append(Frame(int(match.group(1)), match.group(2), match.group(3),
+                                        match.group(4), match.group(5)))
+            continue
+        match = _TASK_HEADER_RE.search(line)
+        if match:
+            current = Backtrace(int(match.group(1)), match.group(2), int(match.group(3)), match.group(4), [], None)
+            traces.append(current)
+            continue
+        match = _EXCEPTION_RE.search(line)
+        if match and current is not None:
+            current.exception_rip = match.group(1).strip()
+    return traces
+
+
+def parse_ps(text: str) -> TaskTable:
+    """Parse ``ps`` output into column arrays."""
+    table = TaskTable()
+    for line in text.splitlines():
+        active = line.startswith(">")
+        words = (line[1:] if active else line).split(None, 8)
+        if len(words) < 9 or not words[0].isdigit():
+            continue
+        try:
+            table.append(active, int(words[0]), int(words[1]), int(words[2]) if words[2].isdigit() else -1,
+                         words[3], words[4], float(words[5]), int(words[6]), int(words[7]), words[8])
+        except ValueError:
+            continue
+    return table
+
+
+def parse_sys(text: str) -> Dict[str, str]:
+    """Parse the ``KEY: value`` fields of ``sys`` output."""
+    fields = {}
+    for line in text.splitlines():
+        match = _SYS_RE.match(line)
+        if match:
+            fields.setdefault(match.group(1).strip(), match.group(2).strip())
+    return fields
+
+
+def parse_log(text: str) -> List[LogLine]:
+    """Parse ``log`` output; lines without a timestamp keep it None."""
+    lines = []
+    for line in text.splitlines():
+        match = _LOG_RE.match(line)
+        if match:
+            level = match.group(3) or match.group(1)
+            lines.append(LogLine(float(match.group(2)), int(level) if level else None, match.group(4)))
+        elif line.strip():
+            lines.append(LogLine(None, None, line))
+    return lines
+
+
+def parse_kmem_info(text: str) -> List[MemoryRow]:
+    """Parse the ``kmem -i`` table."""
+    rows = []
+    for line in text.splitlines():
+        match = _KMEM_RE.match(line)
+        if match:
+            rows.append(MemoryRow(match.group(1).strip(), int(match.group(2)), match.group(3),
+                                  int(match.group(4)) if match.group(4) else None))
+    return rows
+
+
+def parse_mod(text: str) -> List[Module]:
+    """Parse ``mod`` output."""
+    modules = []
+    for line in text.splitlines():
+        words = line.split(None, 4)
+        if len(words) >= 4 and _HEX_RE.fullmatch(words[0]) and words[3].isdigit():
+            modules.append(Module(words[0], words[1], words[2], int(words[3]),
+                                  words[4].strip() if len(words) > 4 else None))
+    return modules
+
+
+def parse_runq(text: str) -> List[RunQueue]:
+    """Parse ``runq`` output into one run queue per CPU."""
+    queues = []
+    current = None
+    for line in text.splitlines():
+        match = _RUNQ_CPU_RE.match(line)
+        if match:
+            current = RunQueue(int(match.group(1)), match.group(2), None, [])
+            queues.append(current)
+            continue
+        match = _RUNQ_TASK_RE.match(line)
+        if match and current is not None:
+            prio = match.group(1)
+            task = QueuedTask(int(prio) if prio else None, int(match.group(2)), match.group(3), match.group(4))
+            if prio is None:
+                current.current = task
+            else:
+                current.queued.append(task)
+    return queues
+
+
+def get_parser(command: str) -> Optional[Callable[[str], Any]]:
+    """Get the parser for a command, or None if its output has no structured form."""
+    if "|" in command or ">" in command:
+        return None
+    words = command.split()
+    if not words:
+        return None
+
+    verb, args = words[0], words[1:]
+    options = [arg for arg in args if arg.startswith("-")]
+    if verb == "bt":
+        return parse_bt
+    if verb == "ps" and all(option in _PS_FILTER_OPTIONS for option in options):
+        return parse_ps
+    if verb == "sys" and options in ([], ["-t"]) and len(args) == len(options):
+        return parse_sys
+    if verb == "log" and all(option == "-m" for option in options) and len(args) == len(options):
+        return parse_log
+    if verb == "kmem" and args == ["-i"]:
+        return parse_kmem_info
+    if verb == "mod" and not args:
+        return parse_mod
+    if verb == "runq" and not args:
+        return parse_runq
+    return None
+
+
+def parse_output(command: str, text: str) -> Optional[dict]:
+    """Parse a command's output into a JSON-ready dict, or None if it has no parser."""
+    parser = get_parser(command)
+    if parser is None:
+        return None
+    return {"command": " ".join(command.split()), "type": command.split()[0], "data": _to_json(parser(text))}
@@ -0,0 +1,199 @@
+"""Background prewarming of crash sessions for newly arrived dumps."""
+
+import logging
+import os
+import threading
+from collections import deque
+from typing import Deque, List, Optional, Sequence
+
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSessionManager, is_state_command
+from crash_mcp.kernel_detection import KernelDetection
+
+
+logger = logging.getLogger(__name__)
+
+# Client id the prewarmer binds its sessions to while warming them
+PREWARM_CLIENT = "prewarm"
+
+# Commands run on a prewarmed session to fill the result cache
+DEFAULT_PREWARM_COMMANDS = ("sys", "log | tail", "bt", "ps -S")
+
+# Most dumps waiting to be prewarmed; older ones are dropped first
+MAX_PENDING_DUMPS = 16
+
+# Seconds between budget checks while prewarming is held back
+BUDGET_RETRY_INTERVAL = 15.0
+
+
+def read_mem_available() -> Optional[int]:
+    """Get the available system memory in bytes, or None if unknown."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def read_load_per_cpu() -> Optional[float]:
+    """Get the one minute load average per CPU, or None if unknown."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return None
+
+
+class Prewarmer:
+    """Opens crash sessions for new dumps before anyone asks for them.
+
+    Dumps submitted (normally by the dump watcher) are prewarmed one at a
+    time, newest first: the matching kernel is resolved, a session is
+    started and the triage ``commands`` are run into the result cache.
+    The warmed session is then parked as a spare, so the first client to
+    open the dump takes it without waiting for crash to load symbols.
+
+    Prewarming always yields to interactive use. It only starts a session
+    when a crash process slot is free and no start is queued, the load
+    average per CPU is at most ``max_load`` and at least ``min_free_mb`` of
+    memory is available; otherwise it retries later. Triage stops early
+    when an interactive start queues for a slot.
+    """
+
+    def __init__(self, manager: CrashSessionManager, kernel_detection: KernelDetection,
+                 commands: Sequence[str] = DEFAULT_PREWARM_COMMANDS, max_load: float = 0.75,
+                 min_free_mb: int = 2048, start_timeout: int = 180, command_timeout: int = 120):
+        self.manager = manager
+        self.kernel_detection = kernel_detection
+        # State commands would keep the session from being handed out as a spare
+        self.commands = [command for command in commands if not is_state_command(command)]
+        self.max_load = max_load
+        self.min_free_mb = min_free_mb
+        self.start_timeout = start_timeout
+        self.command_timeout = command_timeout
+        self._pending: Deque[CrashDump] = deque(maxlen=MAX_PENDING_DUMPS)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.current: Optional[str] = None
+        self.prewarmed = 0
+        self.failed = 0
+        self.deferrals = 0
+
+    def start(self):
+        """Start the prewarming thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="crash-prewarm", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the prewarming thread and drop pending dumps."""
+        self._stop.set()
+        with self._cond:
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def submit(self, dump: CrashDump):
+        """Queue a dump for prewarming."""
+        with self._cond:
+            if any(pending.path == dump.path for pending in self._pending):
+                return
+            self._pending.append(dump)
+            self._cond.notify_all()
+
+    def get_pending_dumps(self) -> List[CrashDump]:
+        """Get the dumps waiting to be prewarmed, next first."""
+        with self._cond:
+            return list(reversed(self._pending))
+
+    def get_stats(self) -> dict:
+        """Get prewarming counters."""
+        return {
+            "current": self.current,
+            "pending_dumps": [str(dump.path) for dump in self.get_pending_dumps()],
+            "prewarmed": self.prewarmed,
+            "failed": self.failed,
+            "deferrals": self.deferrals,
+            "commands": list(self.commands)
+        }
+
+    def check_budget(self) -> Optional[str]:
+        """Get the reason prewarming must wait, or None if it may run now."""
+        if not self.manager.has_idle_capacity():
+            return "no idle crash process slot"
+
+        load = read_load_per_cpu()
+        if self.max_load > 0 and load is not None and load > self.max_load:
+            return f"load average {load:.2f} per CPU above {self.max_load}"
+
+        available = read_mem_available()
+        if self.min_free_mb > 0 and available is not None and available < self.min_free_mb * 1024 * 1024:
+            return f"{available // (1024 * 1024)} MB available, below {self.min_free_mb} MB"
+        return None
+
+    def _run(self):
+        """Prewarm queued dumps until stopped."""
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._pending and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    return
+                dump = self._pending[-1]
+
+            reason = self.check_budget()
+            if reason:
+                self.deferrals += 1
+                logger.debug(f"Deferring prewarm of {dump.name}: {reason}")
+                self._stop.wait(BUDGET_RETRY_INTERVAL)
+                continue
+
+            with self._cond:
+                if dump in self._pending:
+                    self._pending.remove(dump)
+            self.current = str(dump.path)
+            try:
+                if self.prewarm(dump):
+                    self.prewarmed += 1
+                else:
+                    self.failed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error prewarming crash dump {dump.name}: {e}")
+            finally:
+                self.current = None
+
+    def prewarm(self, dump: CrashDump) -> bool:
+        """Start a session for a dump, run the triage commands and park it as a spare."""
+        if self.manager.is_dump_open(str(dump.path)):
+            logger.info(f"Not prewarming {dump.name}: a session already has it open")
+            return True
+
+        kernel = self.kernel_detection.find_matching_kernel(dump)
+        if not kernel:
+            logger.warning(f"Not prewarming {dump.name}: no matching kernel found")
+            return False
+
+        logger.info(f"Prewarming crash session for dump: {dump.name}, kernel: {kernel.name}")
+        if not self.manager.start_session(dump, kernel, self.start_timeout, PREWARM_CLIENT, spare=False):
+            return False
+
+        try:
+            for command in self.commands:
+                if self._stop.is_set() or self.manager.has_queued_starts():
+                    logger.info(f"Stopping prewarm triage of {dump.name} for interactive use")
+                    break
+                output, error, _ = self.manager.run_command(command, self.command_timeout, PREWARM_CLIENT)
+                output.close()
+                if error:
+                    logger.warning(f"Prewarm command '{command}' on {dump.name} failed: {error}")
+        finally:
+            self.manager.park_session(PREWARM_CLIENT)
+        return True
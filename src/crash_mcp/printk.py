@@ -0,0 +1,164 @@
+"""Kernel log extraction straight from the printk buffer of a crash dump."""
+
+import logging
+import struct
+from pathlib import Path
+from typing import List, Union
+
+from crash_mcp.parsers import LogLine
+from crash_mcp.vmcore_reader import VmcoreError, VmcoreReader
+
+
+logger = logging.getLogger(__name__)
+
+# Lockless ring descriptor state: the top two bits of state_var, the rest is the id
+DESC_FLAGS_SHIFT = 62
+DESC_ID_MASK = (1 << DESC_FLAGS_SHIFT) - 1
+DESC_COMMITTED = 1
+DESC_FINALIZED = 2
+
+# Sanity bounds on ring sizes read from the dump
+MAX_COUNT_BITS = 24
+MAX_SIZE_BITS = 30
+
+
+def read_dump_log(source: Union[str, Path, VmcoreReader], **reader_options) -> List[LogLine]:
+    """Read the kernel log of a crash dump without the crash utility.
+
+    Uses the lockless ring buffer (``prb``, 5.10 and later) or the
+    structured ``log_buf`` (3.5 to 5.9), both located through VMCOREINFO.
+    ``source`` is the dump path, or an open reader that is left open so
+    its page cache serves later reads; ``reader_options`` are passed to
+    the VmcoreReader opened for a path. Raises VmcoreError when the dump
+    or its printk buffer cannot be read.
+    """
+    if isinstance(source, VmcoreReader):
+        return _read_log(source)
+    with VmcoreReader(source, **reader_options) as reader:
+        return _read_log(reader)
+
+
+def _read_log(reader: VmcoreReader) -> List[LogLine]:
+    """Read the kernel log through whichever printk buffer the dump has."""
+    if reader.has_symbol("prb"):
+        return _read_lockless_log(reader)
+    if reader.has_symbol("log_buf") and "SIZE(printk_log)" in reader.vmcoreinfo:
+        return _read_structured_log(reader)
+    raise VmcoreError("VMCOREINFO locates no supported printk buffer")
+
+
+def format_log(lines: List[LogLine]) -> str:
+    """Format log lines the way the crash ``log`` command does."""
+    formatted = []
+    for line in lines:
+        prefix = f"[{line.timestamp:12.6f}] " if line.timestamp is not None else ""
+        formatted.append(prefix + line.text.replace("\n", "\n" + " " * len(prefix)))
+    return "\n".join(formatted)
+
+
+def _read_lockless_log(reader: VmcoreReader) -> List[LogLine]:
+    """Decode the records of the lockless printk ring buffer, oldest first."""
+    counter = reader.offset("atomic_long_t.counter")
+    prb = reader.read_u64(reader.symbol("prb"))
+    desc_ring = prb + reader.offset("printk_ringbuffer.desc_ring")
+    data_ring = prb + reader.offset("printk_ringbuffer.text_data_ring")
+
+    count_bits = reader.read_u32(desc_ring + reader.offset("prb_desc_ring.count_bits"))
+    size_bits = reader.read_u32(data_ring + reader.offset("prb_data_ring.size_bits"))
+    if count_bits > MAX_COUNT_BITS or size_bits > MAX_SIZE_BITS:
+        raise VmcoreError(f"Implausible printk ring sizes ({count_bits} and {size_bits} bits)")
+    descs = reader.read_u64(desc_ring + reader.offset("prb_desc_ring.descs"))
+    infos = reader.read_u64(desc_ring + reader.offset("prb_desc_ring.infos"))
+    head_id = reader.read_u64(desc_ring + reader.offset("prb_desc_ring.head_id") + counter)
+    tail_id = reader.read_u64(desc_ring + reader.offset("prb_desc_ring.tail_id") + counter)
+    data = reader.read_u64(data_ring + reader.offset("prb_data_ring.data"))
+
+    desc_count = 1 << count_bits
+    data_size = 1 << size_bits
+    desc_size = reader.size("prb_desc")
+    info_size = reader.size("printk_info")
+    state_offset = reader.offset("prb_desc.state_var") + counter
+    lpos_offset = reader.offset("prb_desc.text_blk_lpos")
+    begin_offset = lpos_offset + reader.offset("prb_data_blk_lpos.begin")
+    next_offset = lpos_offset + reader.offset("prb_data_blk_lpos.next")
+    ts_offset = reader.offset("printk_info.ts_nsec")
+    len_offset = reader.offset("printk_info.text_len")
+
+    # Read each array in one go instead of record by record
+    desc_bytes = reader.read(descs, desc_count * desc_size)
+    info_bytes = reader.read(infos, desc_count * info_size)
+    text_bytes = reader.read(data, data_size)
+    ulong = struct.Struct(reader.endian + "Q")
+    ushort = struct.Struct(reader.endian + "H")
+
+    lines = []
+    desc_id = tail_id
+    for _ in range(desc_count):
+        index = desc_id % desc_count
+        desc = index * desc_size
+        state_var, = ulong.unpack_from(desc_bytes, desc + state_offset)
+        state = state_var >> DESC_FLAGS_SHIFT
+        if state_var & DESC_ID_MASK == desc_id and state in (DESC_COMMITTED, DESC_FINALIZED):
+            begin, = ulong.unpack_from(desc_bytes, desc + begin_offset)
+            end, = ulong.unpack_from(desc_bytes, desc + next_offset)
+            block = _data_block(begin, end, size_bits)
+            if block:
+                start, length = block
+                info = index * info_size
+                ts_nsec, = ulong.unpack_from(info_bytes, info + ts_offset)
+                text_len, = ushort.unpack_from(info_bytes, info + len_offset)
+                # The block starts with the descriptor id
+                text = text_bytes[start + 8:start + 8 + min(text_len, length - 8)]
+                lines.append(LogLine(ts_nsec / 1e9, None, text.decode("utf-8", errors="replace")))
+        if desc_id == head_id:
+            break
+        desc_id = (desc_id + 1) & DESC_ID_MASK
+    return lines
+
+
+def _data_block(begin: int, end: int, size_bits: int):
+    """Get the (offset, size) of a record's data block, or None if it has none."""
+    # Data-less records have the low bit of their positions set
+    if begin & 1 or end & 1:
+        return None
+    size = 1 << size_bits
+    if begin >> size_bits == end >> size_bits and begin < end:
+        return begin % size, end - begin
+    # A block that would cross the end of the ring is stored at its start
+    if (begin + size) >> size_bits == end >> size_bits:
+        return 0, end % size
+    return None
+
+
+def _read_structured_log(reader: VmcoreReader) -> List[LogLine]:
+    """Decode the records of the structured log buffer, oldest first."""
+    buffer_len = reader.read_u32(reader.symbol("log_buf_len"))
+    buffer = reader.read(reader.read_u64(reader.symbol("log_buf")), buffer_len)
+    first = reader.read_u32(reader.symbol("log_first_idx"))
+    last = reader.read_u32(reader.symbol("log_next_idx"))
+    record_size = reader.size("printk_log")
+    ts_offset = reader.offset("printk_log.ts_nsec")
+    len_offset = reader.offset("printk_log.len")
+    text_len_offset = reader.offset("printk_log.text_len")
+    ulong = struct.Struct(reader.endian + "Q")
+    ushort = struct.Struct(reader.endian + "H")
+
+    lines = []
+    index = first
+    # Bound the walk so a corrupt buffer cannot loop forever
+    for _ in range(buffer_len // record_size + 1):
+        if index == last or index + record_size > buffer_len:
+            break
+        length, = ushort.unpack_from(buffer, index + len_offset)
+        if not length:
+            # A zero length record marks the wrap to the start of the buffer
+            if index == 0:
+                break
+            index = 0
+            continue
+        ts_nsec, = ulong.unpack_from(buffer, index + ts_offset)
+        text_len, = ushort.unpack_from(buffer, index + text_len_offset)
+        text = buffer[index + record_size:index + record_size + text_len]
+        lines.append(LogLine(ts_nsec / 1e9, None, text.decode("utf-8", errors="replace")))
+        index += length
+    return lines
@@ -0,0 +1,221 @@
+"""Resource limits and accounting for crash processes."""
+
+import logging
+import os
+import resource
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Union
+
+import psutil
+
+
+logger = logging.getLogger(__name__)
+
+# Placement modes
+MODE_CGROUP = "cgroup"
+MODE_RLIMIT = "rlimit"
+MODE_NONE = "none"
+
+# cpu.max period in microseconds
+CPU_PERIOD = 100000
+
+# Priority crash processes drop to when a CPU cap cannot be enforced by a cgroup
+FALLBACK_NICE = 10
+
+# Prefix of the per-process cgroups created under the cgroup root
+CGROUP_PREFIX = "crash-"
+
+
+class Placement(NamedTuple):
+    """Where and how one crash process is constrained."""
+    mode: str
+    cgroup: Optional[Path]
+    preexec: Optional[Callable[[], None]]
+
+
+class ResourceGovernor:
+    """Constrains crash processes and watches host memory.
+
+    Each crash process gets ``memory_mb`` of memory and ``cpu_percent`` of
+    one CPU (0 leaves either unlimited). When ``cgroup_root`` is a writable
+    cgroup v2 directory, typically one delegated to the server, every
+    process is started in its own child cgroup with ``memory.max`` and
+    ``cpu.max`` set, so it is OOM-killed on its own instead of pushing the
+    host into swap, and its memory and CPU usage are read from the cgroup.
+    Otherwise the memory cap becomes an ``RLIMIT_DATA`` limit (heap and
+    private mappings; Linux ignores ``RLIMIT_RSS``) and a CPU cap lowers the
+    process priority instead.
+
+    Independently, ``min_available_mb`` is the host memory that should stay
+    available: below it the session manager closes idle sessions before
+    the host starts to swap.
+    """
+
+    def __init__(self, memory_mb: int = 0, cpu_percent: int = 0,
+                 cgroup_root: Optional[Union[str, Path]] = None, min_available_mb: int = 0):
+        self.memory_mb = max(0, memory_mb)
+        self.cpu_percent = max(0, cpu_percent)
+        self.min_available_mb = max(0, min_available_mb)
+        self.cgroup_root = Path(cgroup_root) if cgroup_root else None
+        self.mode = self._detect_mode()
+
+    def _detect_mode(self) -> str:
+        """Pick cgroup placement when the root is usable, else rlimits."""
+        if self.cgroup_root:
+            if self._setup_cgroup_root():
+                return MODE_CGROUP
+            logger.warning(f"Cannot use cgroup root {self.cgroup_root}, falling back to rlimits")
+        return MODE_RLIMIT if self.memory_mb or self.cpu_percent else MODE_NONE
+
+    def _setup_cgroup_root(self) -> bool:
+        """Check the cgroup root and enable the controllers children need."""
+        root = self.cgroup_root
+        try:
+            controllers = (root / "cgroup.controllers").read_text().split()
+        except OSError:
+            return False
+        if not os.access(root, os.W_OK):
+            return False
+
+        wanted = [name for name, needed in (("memory", self.memory_mb), ("cpu", self.cpu_percent)) if needed]
+        missing = [name for name in wanted if name not in controllers]
+        if missing:
+            logger.warning(f"cgroup root {root} lacks the {', '.join(missing)} controller(s)")
+            return False
+        try:
+            enabled = (root / "cgroup.subtree_control").read_text().split()
+            for name in wanted:
+                if name not in enabled:
+                    (root / "cgroup.subtree_control").write_text(f"+{name}")
+        except OSError as e:
+            logger.warning(f"Cannot enable controllers in {root}: {e}")
+            return False
+        return True
+
+    def place(self, session_id: str) -> Placement:
+        """Prepare the constraints of a crash process about to be started.
+
+        Returns the cgroup created for it, if any, and a function to run in
+        the child between fork and exec.
+        """
+        if self.mode == MODE_CGROUP:
+            cgroup = self.cgroup_root / f"{CGROUP_PREFIX}{session_id}"
+            try:
+                cgroup.mkdir(exist_ok=True)
+                if self.memory_mb:
+                    (cgroup / "memory.max").write_text(str(self.memory_mb * 1024 * 1024))
+                if self.cpu_percent:
+                    (cgroup / "cpu.max").write_text(f"{self.cpu_percent * CPU_PERIOD // 100} {CPU_PERIOD}")
+            except OSError as e:
+                logger.error(f"Cannot create cgroup {cgroup}, starting unconstrained: {e}")
+                self._remove_cgroup(cgroup)
+                return Placement(MODE_NONE, None, None)
+            procs = str(cgroup / "cgroup.procs")
+
+            def join_cgroup():
+                with open(procs, "w") as f:
+                    f.write(str(os.getpid()))
+
+            return Placement(MODE_CGROUP, cgroup, join_cgroup)
+
+        if self.mode == MODE_RLIMIT:
+            memory = self.memory_mb * 1024 * 1024
+            nice = FALLBACK_NICE if self.cpu_percent else 0
+
+            def set_limits():
+                if memory:
+                    resource.setrlimit(resource.RLIMIT_DATA, (memory, memory))
+                if nice:
+                    os.nice(nice)
+
+            return Placement(MODE_RLIMIT, None, set_limits)
+
+        return Placement(MODE_NONE, None, None)
+
+    def release(self, placement: Placement):
+        """Clean up after a crash process has exited."""
+        if placement.cgroup:
+            self._remove_cgroup(placement.cgroup)
+
+    @staticmethod
+    def _remove_cgroup(cgroup: Path):
+        """Remove a per-process cgroup; it must have no processes left."""
+        try:
+            cgroup.rmdir()
+        except OSError as e:
+            logger.debug(f"Cannot remove cgroup {cgroup}: {e}")
+
+    def usage(self, placement: Placement, pid: Optional[int]) -> dict:
+        """Get the limits and resource usage of a crash process."""
+        usage = {
+            "mode": placement.mode,
+            "memory_limit_mb": self.memory_mb or None,
+            "cpu_limit_percent": self.cpu_percent or None,
+            "rss_mb": None,
+            "cpu_seconds": None
+        }
+        if pid:
+            try:
+                process = psutil.Process(pid)
+                usage["rss_mb"] = round(process.memory_info().rss / (1024 * 1024), 2)
+                times = process.cpu_times()
+                usage["cpu_seconds"] = round(times.user + times.system, 3)
+            except (psutil.Error, OSError):
+                pass
+        if placement.cgroup:
+            usage["cgroup"] = str(placement.cgroup)
+            current = _read_int(placement.cgroup / "memory.current")
+            peak = _read_int(placement.cgroup / "memory.peak")
+            usage["memory_current_mb"] = round(current / (1024 * 1024), 2) if current is not None else None
+            usage["memory_peak_mb"] = round(peak / (1024 * 1024), 2) if peak is not None else None
+            usage["oom_kills"] = _read_keyed(placement.cgroup / "memory.events", "oom_kill")
+            cpu_usec = _read_keyed(placement.cgroup / "cpu.stat", "usage_usec")
+            if cpu_usec is not None:
+                usage["cpu_seconds"] = round(cpu_usec / 1000000, 3)
+        return usage
+
+    def available_memory(self) -> Optional[int]:
+        """Get the host memory available without swapping in bytes."""
+        try:
+            return psutil.virtual_memory().available
+        except (psutil.Error, OSError):
+            return None
+
+    def under_memory_pressure(self) -> bool:
+        """Check if host available memory is below the configured floor."""
+        if not self.min_available_mb:
+            return False
+        available = self.available_memory()
+        return available is not None and available < self.min_available_mb * 1024 * 1024
+
+    def get_stats(self) -> dict:
+        """Get the governor configuration and host memory state."""
+        available = self.available_memory()
+        return {
+            "mode": self.mode,
+            "cgroup_root": str(self.cgroup_root) if self.mode == MODE_CGROUP else None,
+            "memory_limit_mb": self.memory_mb or None,
+            "cpu_limit_percent": self.cpu_percent or None,
+            "min_available_mb": self.min_available_mb or None,
+            "available_mb": round(available / (1024 * 1024)) if available is not None else None
+        }
+
+
+def _read_int(path: Path) -> Optional[int]:
+    """Read a cgroup file holding a single number."""
+    try:
+        return int(path.read_text().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _read_keyed(path: Path, key: str) -> Optional[int]:
+    """Read one value of a flat-keyed cgroup file such as memory.events."""
+    try:
+        for line in path.read_text().splitlines():
+            name, _, value = line.partition(" ")
+            if name == key:
+                return int(value)
+    except (OSError, ValueError):
+        pass
+    return None
@@ -0,0 +1,228 @@
+"""Result cache for idempotent crash commands."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Commands whose output only depends on the (static) dump, kernel and session state
+DEFAULT_CACHEABLE_COMMANDS = (
+    "bt", "dev", "dis", "files", "foreach", "ipcs", "irq", "kmem", "list", "log",
+    "mach", "mod", "mount", "net", "p", "ps", "ptov", "rd", "runq", "search",
+    "struct", "swap", "sym", "sys", "task", "timer", "tree", "union", "vm",
+    "vtop", "waitq", "whatis"
+)
+
+# Commands that are never cached, even when listed as cacheable
+DEFAULT_UNCACHEABLE_COMMANDS = (
+    "alias", "exit", "extend", "gdb", "q", "quit", "repeat", "set", "wr"
+)
+
+# Bytes of the dump file hashed into its content identity
+HEADER_HASH_BYTES = 64 * 1024
+
+_QUOTED_RE = re.compile(r"\"[^\"]*\"|'[^']*'")
+# A ``>`` or ``>>`` token followed by a filename; ``task->comm`` is no redirect
+_REDIRECT_RE = re.compile(r"(?:^|\s)>>?\s*[^\s>]")
+
+
+def normalize_command(command: str) -> str:
+    """Normalize a crash command for use in a cache key."""
+    return " ".join(command.split())
+
+
+def is_redirected(command: str) -> bool:
+    """Check if a command redirects its output to a file, outside of quoted arguments."""
+    return bool(_REDIRECT_RE.search(_QUOTED_RE.sub('""', command)))
+
+
+class ResultCache:
+    """Content-addressed cache of crash command output.
+
+    Entries are keyed by the identity of the dump and kernel (size plus a
+    hash of the file header), the state-setting commands already run in
+    the session and the normalized command. The memory tier is an LRU
+    bounded by ``max_bytes``; with ``cache_dir`` set, entries are also
+    written compressed to disk so they survive server restarts.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, cache_dir: Optional[str] = None,
+                 cacheable: Iterable[str] = DEFAULT_CACHEABLE_COMMANDS,
+                 uncacheable: Iterable[str] = DEFAULT_UNCACHEABLE_COMMANDS):
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cacheable = frozenset(cacheable)
+        self.uncacheable = frozenset(uncacheable)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._identities: Dict[Tuple[str, int, int, int, int], str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.cache_dir:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Disabling on-disk result cache at {self.cache_dir}: {e}")
+                self.cache_dir = None
+
+    def is_cacheable(self, command: str) -> bool:
+        """Check if a command's output may be cached."""
+        normalized = normalize_command(command)
+        if not normalized or normalized.startswith("!") or is_redirected(normalized):
+            return False
+
+        verb = normalized.split()[0]
+        return verb in self.cacheable and verb not in self.uncacheable
+
+    def make_key(self, dump_path: str, kernel_path: str, command: str,
+                 state: Sequence[str] = ()) -> Optional[str]:
+        """Build the cache key for a command, or None if it is not cacheable."""
+        if not self.is_cacheable(command):
+            return None
+
+        try:
+            identity = [
+                self.file_identity(dump_path),
+                self.file_identity(kernel_path),
+                [normalize_command(c) for c in state],
+                normalize_command(command)
+            ]
+        except OSError as e:
+            logger.warning(f"Cannot identify dump or kernel for caching: {e}")
+            return None
+
+        return hashlib.sha256(json.dumps(identity).encode()).hexdigest()
+
+    def structured_key(self, key: str) -> str:
+        """Derive the key under which the parsed form of a cached output is kept."""
+        return hashlib.sha256(f"{key}:structured".encode()).hexdigest()
+
+    def file_identity(self, path: str) -> str:
+        """Get the content identity of a file: its size and a hash of its header.
+
+        The header hash is computed once per (device, inode, size, mtime).
+        """
+        st = os.stat(path)
+        stat_key = (path, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            identity = self._identities.get(stat_key)
+        if identity:
+            return identity
+
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read(HEADER_HASH_BYTES)).hexdigest()
+        identity = f"{st.st_size}:{digest}"
+
+        with self._lock:
+            self._identities[stat_key] = identity
+        return identity
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached result."""
+        with self._lock:
+            output = self._entries.get(key)
+            if output is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return output
+
+        output = self._read_disk(key)
+        with self._lock:
+            if output is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, output)
+        return output
+
+    def put(self, key: str, output: str):
+        """Store a command result."""
+        with self._lock:
+            self._store(key, output)
+        self._write_disk(key, output)
+
+    def clear(self):
+        """Drop every in-memory entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        """Get hit/miss counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "memory_bytes": self._bytes,
+                "max_memory_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "disk_dir": str(self.cache_dir) if self.cache_dir else None
+            }
+
+    def _store(self, key: str, output: str):
+        """Insert into the memory tier, evicting least recently used entries."""
+        size = len(output)
+        if size > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+
+        self._entries[key] = output
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        """Get the on-disk location of an entry."""
+        return self.cache_dir / key[:2] / f"{key}.z"
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        """Read an entry from the disk tier."""
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, output: str):
+        """Write an entry to the disk tier atomically."""
+        if not self.cache_dir:
+            return
+
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(output.encode("utf-8"), 6))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Cannot write cache entry {key}: {e}")
@@ -0,0 +1,348 @@
+"""Server-side storage of crash command output."""
+
+import bisect
+import logging
+import mmap
+import re
+import tempfile
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+# Output up to this size stays in memory; beyond it it is spilled to a temp file
+SPOOL_MEMORY_LIMIT = 1024 * 1024
+
+# Every this many lines the line index records an offset
+LINE_INDEX_STRIDE = 1024
+
+
+class OutputClosedError(Exception):
+    """Raised when reading an output that was closed, e.g. evicted from the result store."""
+
+
+class CommandOutput:
+    """Output of one crash command, written incrementally as it is read.
+
+    Line endings are normalized from the pty's CRLF to LF. Small outputs
+    stay in memory and larger ones are spilled to an anonymous temp file,
+    so a command printing hundreds of MB never has to be held as a Python
+    string. Once complete, an output can be sealed: a spilled one is then
+    memory-mapped, and line ranges, the tail and regex matches are served
+    from the map with the help of a sparse line index.
+    """
+
+    def __init__(self, memory_limit: int = SPOOL_MEMORY_LIMIT):
+        self._file = tempfile.SpooledTemporaryFile(max_size=memory_limit, prefix="crash-mcp-out-")
+        self._memory_limit = memory_limit
+        self._lock = threading.Lock()
+        self._cr = False
+        self._started = False
+        self._view: Optional[Union[mmap.mmap, bytes]] = None
+        self._line_index: Optional[array] = None
+        self.size = 0
+        self.lines = 0
+        self.closed = False
+
+    @classmethod
+    def from_text(cls, text: str) -> "CommandOutput":
+        """Wrap already complete output (e.g. a cached result)."""
+        output = cls()
+        output.write(text.encode("utf-8"))
+        output.finish()
+        return output
+
+    def write(self, data: bytes):
+        """Append raw pty output."""
+        if self._cr:
+            data = b"\r" + data
+            self._cr = False
+        if data.endswith(b"\r"):
+            # A CRLF may be split across reads
+            data = data[:-1]
+            self._cr = True
+        data = data.replace(b"\r\n", b"\n")
+        if not self._started:
+            # Drop leading blank space, as the buffered output was stripped
+            data = data.lstrip()
+            self._started = bool(data)
+        if not data:
+            return
+
+        with self._lock:
+            self._file.seek(0, 2)
+            self._file.write(data)
+            self.size += len(data)
+            self.lines += data.count(b"\n")
+
+    def finish(self):
+        """Mark the output complete, dropping a dangling carriage return."""
+        self._cr = False
+
+    def seal(self):
+        """Make the complete output read-only and map it for random access."""
+        with self._lock:
+            if self.closed:
+                raise OutputClosedError("Output was closed")
+            if self._view is not None:
+                return
+            if self.size > self._memory_limit:
+                self._file.rollover()
+                self._file.flush()
+                self._view = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._file.seek(0)
+                self._view = self._file.read()
+
+    @property
+    def line_count(self) -> int:
+        """Get the number of lines, counting an unterminated last line."""
+        with self._lock:
+            unterminated = self.size and self._read(self.size - 1, 1) != b"\n"
+        return self.lines + (1 if unterminated else 0)
+
+    def _read(self, offset: int, size: int) -> bytes:
+        """Read bytes while holding the lock."""
+        if self.closed:
+            raise OutputClosedError("Output was closed")
+        if self._view is not None:
+            return self._view[offset:offset + size]
+        self._file.seek(offset)
+        return self._file.read(size)
+
+    def text(self) -> str:
+        """Get the whole output as a string."""
+        with self._lock:
+            data = self._read(0, self.size)
+        return data.decode("utf-8", errors="ignore").strip()
+
+    def read_page(self, offset: int = 0, max_bytes: Optional[int] = None,
+                  max_lines: Optional[int] = None) -> Tuple[str, Optional[int]]:
+        """Read a page starting at ``offset``.
+
+        A page ends after ``max_lines`` lines or ``max_bytes`` bytes,
+        whichever comes first; a byte-limited page is cut back to the last
+        full line when there is one. Returns the text and the offset of the
+        next page, or None when the output is exhausted.
+        """
+        offset = max(0, min(offset, self.size))
+        limit = self.size - offset if max_bytes is None else min(max_bytes, self.size - offset)
+        with self._lock:
+            data = self._read(offset, limit)
+
+        if max_lines is not None:
+            end = -1
+            for _ in range(max_lines):
+                end = data.find(b"\n", end + 1)
+                if end < 0:
+                    break
+            if end >= 0:
+                data = data[:end + 1]
+
+        if offset + len(data) < self.size and not data.endswith(b"\n"):
+            cut = data.rfind(b"\n")
+            if cut >= 0:
+                data = data[:cut + 1]
+
+        next_offset = offset + len(data)
+        return (data.decode("utf-8", errors="ignore"),
+                next_offset if next_offset < self.size else None)
+
+    def read_lines(self, start: int, count: int) -> List[Tuple[int, str]]:
+        """Get up to ``count`` (line number, text) pairs from line ``start`` (1-based)."""
+        self.seal()
+        with self._lock:
+            if self.closed:
+                raise OutputClosedError("Output was closed")
+            if self._view is None:
+                return []
+            index = self._get_line_index()
+            view = self._view
+            pos = self._line_offset(index, max(0, start - 1))
+            result = []
+            number = max(1, start)
+            while pos < self.size and len(result) < count:
+                end = view.find(b"\n", pos)
+                end = self.size if end < 0 else end
+                result.append((number, view[pos:end].decode("utf-8", errors="ignore")))
+                pos = end + 1
+                number += 1
+            return result
+
+    def tail(self, count: int) -> List[Tuple[int, str]]:
+        """Get the last ``count`` lines as (line number, text) pairs."""
+        total = self.line_count
+        return self.read_lines(max(1, total - count + 1), count)
+
+    def grep(self, pattern: str, max_matches: int = 200,
+             ignore_case: bool = False) -> Tuple[List[Tuple[int, str]], bool]:
+        """Get the lines matching a regex, and whether more matched than returned.
+
+        The regex is run over the whole mapped output rather than line by
+        line; line numbers come from the sparse line index.
+        """
+        regex = re.compile(pattern.encode("utf-8"), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+        self.seal()
+        with self._lock:
+            if self.closed:
+                raise OutputClosedError("Output was closed")
+            if self._view is None:
+                return [], False
+            index = self._get_line_index()
+            view = self._view
+            matches = []
+            pos = 0
+            while pos <= self.size:
+                match = regex.search(view, pos)
+                if not match:
+                    return matches, False
+                if len(matches) >= max_matches:
+                    return matches, True
+                start = view.rfind(b"\n", 0, match.start()) + 1
+                end = view.find(b"\n", match.start())
+                end = self.size if end < 0 else end
+                matches.append((self._line_number(index, start),
+                                view[start:end].decode("utf-8", errors="ignore")))
+                pos = end + 1
+            return matches, False
+
+    def _get_line_index(self) -> array:
+        """Get the offsets of every LINE_INDEX_STRIDE-th line, building them once."""
+        if self._line_index is None:
+            index = array("Q", [0])
+            view = self._view
+            pos = 0
+            lines = 0
+            while True:
+                pos = view.find(b"\n", pos) + 1
+                if pos <= 0 or pos >= self.size:
+                    break
+                lines += 1
+                if lines % LINE_INDEX_STRIDE == 0:
+                    index.append(pos)
+            self._line_index = index
+        return self._line_index
+
+    def _line_offset(self, index: array, line: int) -> int:
+        """Get the offset of a 0-based line, or the output size past the end."""
+        block = min(line // LINE_INDEX_STRIDE, len(index) - 1)
+        pos = index[block]
+        for _ in range(line - block * LINE_INDEX_STRIDE):
+            pos = self._view.find(b"\n", pos) + 1
+            if pos <= 0:
+                return self.size
+        return pos
+
+    def _line_number(self, index: array, offset: int) -> int:
+        """Get the 1-based number of the line starting at ``offset``."""
+        block = bisect.bisect_right(index, offset) - 1
+        pos = index[block]
+        number = block * LINE_INDEX_STRIDE + 1
+        while True:
+            pos = self._view.find(b"\n", pos, offset) + 1
+            if pos <= 0:
+                return number
+            number += 1
+
+    def close(self):
+        """Release the buffer, map and temp file; later reads raise OutputClosedError."""
+        with self._lock:
+            self.closed = True
+            if isinstance(self._view, mmap.mmap):
+                self._view.close()
+            self._view = None
+            self._line_index = None
+            self._file.close()
+
+
+class StoredOutput(NamedTuple):
+    """An output held in the result store."""
+    output: CommandOutput
+    command: str
+    created: float
+    owner: Optional[str] = None
+
+
+class ResultStore:
+    """Outputs kept on the server so callers can page and search through them.
+
+    Each stored output gets a random handle and, when given, the client it
+    belongs to; other clients cannot look it up. Outputs are sealed (spilled
+    ones memory-mapped) when stored, and the least recently used ones are
+    dropped once together they exceed ``max_bytes``; the newest output is
+    always kept, even when it alone is larger than the budget.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._outputs: "OrderedDict[str, StoredOutput]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def add(self, output: CommandOutput, command: str = "", owner: Optional[str] = None) -> str:
+        """Store an output for a client and return its handle."""
+        output.seal()
+        handle = uuid.uuid4().hex[:16]
+        with self._lock:
+            self._outputs[handle] = StoredOutput(output, command, time.time(), owner)
+            self._bytes += output.size
+            while self._bytes > self.max_bytes and len(self._outputs) > 1:
+                _, evicted = self._outputs.popitem(last=False)
+                self._bytes -= evicted.output.size
+                self.evictions += 1
+                evicted.output.close()
+        return handle
+
+    def get(self, handle: str, client_id: Optional[str] = None) -> Optional[CommandOutput]:
+        """Look up a stored output on behalf of a client."""
+        stored = self.lookup(handle, client_id)
+        return stored.output if stored else None
+
+    def lookup(self, handle: str, client_id: Optional[str] = None) -> Optional[StoredOutput]:
+        """Look up a stored output with its metadata on behalf of a client.
+
+        Outputs stored for another client are reported as unknown.
+        """
+        with self._lock:
+            stored = self._outputs.get(handle)
+            if stored is None or stored.owner is not None and stored.owner != client_id:
+                return None
+            self._outputs.move_to_end(handle)
+            return stored
+
+    def get_stats(self) -> dict:
+        """Get occupancy counters."""
+        with self._lock:
+            return {
+                "entries": len(self._outputs),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions
+            }
+
+    def close(self):
+        """Drop every stored output."""
+        with self._lock:
+            for stored in self._outputs.values():
+                stored.output.close()
+            self._outputs.clear()
+            self._bytes = 0
+
+
+def make_continuation(handle: str, offset: int) -> str:
+    """Build the token that resumes reading an output at ``offset``."""
+    return f"{handle}:{offset}"
+
+
+def parse_continuation(token: str) -> Tuple[str, int]:
+    """Split a continuation token into handle and offset."""
+    handle, sep, offset = token.partition(":")
+    if not sep or not offset.isdigit():
+        raise ValueError(f"Invalid continuation token: {token}")
+    return handle, int(offset)
@@ -6,10 +6,18 @@ An MCP server that provides crash dump analysis tools.
 """
 
 import asyncio
+import contextvars
+import functools
 import json
 import logging
 import os
+import re
 import sys
+import threading
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Any, Dict, List, Optional, Sequence
 
 try:
@@ -33,10 +41,25 @@ from pydantic import BaseModel
 
 # Import crash-related modules from crashmcp
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'crashmcp', 'src'))
+from crash_mcp.bulk_triage import BulkTriage, default_pool_size, open_results
+from crash_mcp.catalog import FileCatalog
 from crash_mcp.config import Config, setup_logging, check_system_requirements, validate_crash_utility
-from crash_mcp.crash_discovery import CrashDumpDiscovery
-from crash_mcp.crash_session import CrashSessionManager
+from crash_mcp.crash_discovery import CrashDump, CrashDumpDiscovery
+from crash_mcp.crash_session import DEFAULT_CLIENT, CrashSessionManager, SessionAdmissionError
+from crash_mcp.dump_watcher import DumpWatcher
 from crash_mcp.kernel_detection import KernelDetection
+from crash_mcp.kernel_index import KernelIndex
+from crash_mcp.metrics import Metrics
+from crash_mcp.parsers import LogLine
+from crash_mcp.prewarm import DEFAULT_PREWARM_COMMANDS, Prewarmer
+from crash_mcp.printk import format_log, read_dump_log
+from crash_mcp.resource_governor import ResourceGovernor
+from crash_mcp.result_cache import DEFAULT_CACHEABLE_COMMANDS, DEFAULT_UNCACHEABLE_COMMANDS, ResultCache
+from crash_mcp.result_store import (CommandOutput, OutputClosedError, ResultStore, make_continuation,
+                                    parse_continuation)
+from crash_mcp.signatures import SignatureIndex, signature_from_report
+from crash_mcp.triage import TriageEngine
+from crash_mcp.vmcore_reader import VmcoreError, VmcoreReaderPool
 
 # Load environment variables
 try:
@@ -51,19 +74,86 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Lines of a stored output shown in the summary returned by crash_command
+SUMMARY_HEAD_LINES = 40
+SUMMARY_HEAD_BYTES = 16 * 1024
+SUMMARY_TAIL_LINES = 10
+SUMMARY_LINE_CHARS = 1000
+
+# Most commands accepted by one crash_batch call
+MAX_BATCH_COMMANDS = 64
+
+# Identifies the transport connection a tool call arrived on; tool handlers
+# inherit it from the task that runs the MCP server for that connection
+_client_id = contextvars.ContextVar("crash_mcp_client_id", default=DEFAULT_CLIENT)
+
 
 class CrashCommandParams(BaseModel):
     """Parameters for crash command tool."""
-    command: str
+    command: Optional[str] = None
+    timeout: Optional[int] = 120
+    max_bytes: Optional[int] = None
+    max_lines: Optional[int] = None
+    continuation: Optional[str] = None
+    structured: Optional[bool] = False
+
+
+class CrashBatchParams(BaseModel):
+    """Parameters for crash batch tool."""
+    commands: List[str]
     timeout: Optional[int] = 120
 
 
+class ReadOutputParams(BaseModel):
+    """Parameters for read crash output tool."""
+    handle: str
+    start_line: Optional[int] = 1
+    num_lines: Optional[int] = 200
+    tail: Optional[int] = None
+    grep: Optional[str] = None
+    ignore_case: Optional[bool] = False
+    max_matches: Optional[int] = 200
+
+
 class StartSessionParams(BaseModel):
     """Parameters for start session tool."""
     dump_name: Optional[str] = None
     timeout: Optional[int] = 120
 
 
+class TriageParams(BaseModel):
+    """Parameters for triage dump tool."""
+    dump_name: Optional[str] = None
+    workers: Optional[int] = None
+    timeout: Optional[int] = 120
+
+
+class BulkTriageParams(BaseModel):
+    """Parameters for triage all dumps tool."""
+    output: Optional[str] = None
+    workers: Optional[int] = None
+    max_dumps: Optional[int] = None
+
+
+class ListClustersParams(BaseModel):
+    """Parameters for list crash clusters tool."""
+    limit: Optional[int] = 20
+
+
+class MatchSignatureParams(BaseModel):
+    """Parameters for match crash signature tool."""
+    dump_name: Optional[str] = None
+    timeout: Optional[int] = 120
+
+
+class DumpLogParams(BaseModel):
+    """Parameters for get dump log tool."""
+    dump_name: Optional[str] = None
+    tail: Optional[int] = None
+    max_bytes: Optional[int] = None
+    max_lines: Optional[int] = None
+
+
 class ListDumpsParams(BaseModel):
     """Parameters for list dumps tool."""
     max_dumps: Optional[int] = 10
@@ -75,9 +165,69 @@ class CrashMCPServer:
     def __init__(self):
         self.config = Config()
         self.server = Server("crash-mcp")
-        self.crash_discovery = CrashDumpDiscovery(str(self.config.crash_dump_path))
-        self.crash_session_manager = CrashSessionManager()
-        self.kernel_detection = KernelDetection(str(self.config.kernel_path))
+        catalog_path = self.config.catalog_path or None
+        self.crash_discovery = CrashDumpDiscovery(
+            str(self.config.crash_dump_path), FileCatalog(catalog_path, namespace="dumps")
+        )
+        self.result_cache = None
+        if self.config.result_cache_mb > 0:
+            self.result_cache = ResultCache(
+                max_bytes=self.config.result_cache_mb * 1024 * 1024,
+                cache_dir=self.config.result_cache_dir or None,
+                cacheable=self.config.cacheable_commands or DEFAULT_CACHEABLE_COMMANDS,
+                uncacheable=self.config.uncacheable_commands or DEFAULT_UNCACHEABLE_COMMANDS
+            )
+        self.metrics = Metrics()
+        self.resource_governor = ResourceGovernor(
+            memory_mb=self.config.session_memory_mb,
+            cpu_percent=self.config.session_cpu_percent,
+            cgroup_root=self.config.cgroup_root or None,
+            min_available_mb=self.config.min_available_mb
+        )
+        self.crash_session_manager = CrashSessionManager(
+            max_sessions=self.config.max_crash_sessions,
+            max_rss_mb=self.config.max_sessions_rss_mb,
+            idle_timeout=self.config.session_idle_timeout,
+            queue_timeout=self.config.session_queue_timeout,
+            share_sessions=self.config.share_sessions,
+            result_cache=self.result_cache,
+            spare_sessions=self.config.spare_sessions,
+            metrics=self.metrics,
+            crash_binary=self.config.crash_binary,
+            governor=self.resource_governor,
+            heartbeat_interval=self.config.heartbeat_interval,
+            heartbeat_timeout=self.config.heartbeat_timeout,
+            recover_sessions=self.config.recover_sessions,
+            recovery_timeout=self.config.session_init_timeout
+        )
+        # Outputs larger than one page, kept for continuation requests
+        self.result_store = ResultStore(max_bytes=self.config.result_store_mb * 1024 * 1024)
+        # Open dumps of get_dump_log, so repeated reads hit the decoded page cache
+        self.vmcore_readers = VmcoreReaderPool(
+            max_readers=self.config.vmcore_readers,
+            cache_bytes=self.config.vmcore_cache_mb * 1024 * 1024,
+            readahead=self.config.vmcore_readahead,
+            workers=self.config.vmcore_read_workers
+        )
+        self.kernel_detection = KernelDetection(
+            str(self.config.kernel_path),
+            FileCatalog(catalog_path, namespace="kernels"),
+            KernelIndex(catalog_path, workers=self.config.kernel_index_workers)
+        )
+        # Dedicated threads for blocking crash process I/O so a long command
+        # never stalls the event loop or the default executor
+        self.crash_executor = ThreadPoolExecutor(
+            max_workers=self.config.crash_io_workers,
+            thread_name_prefix="crash-io"
+        )
+        self.dump_watcher: Optional[DumpWatcher] = None
+        self.prewarmer: Optional[Prewarmer] = None
+        self.signature_index = SignatureIndex(catalog_path)
+        self.bulk_triage: Optional[BulkTriage] = None
+        self._bulk_output: Optional[str] = None
+        # Connected MCP sessions that receive server-initiated notifications
+        self._client_sessions = weakref.WeakSet()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._setup_tools()
     
     def _setup_tools(self):
@@ -86,6 +236,7 @@ class CrashMCPServer:
         @self.server.list_tools()
         async def handle_list_tools() -> List[Tool]:
             """List available tools."""
+            self._remember_client_session()
             return [
                 Tool(
                     name="crash_command",
@@ -101,9 +252,221 @@ class CrashMCPServer:
                                 "type": "integer",
                                 "description": "Command timeout in seconds (optional, default 120s for large dumps)",
                                 "default": 120
+                            },
+                            "max_bytes": {
+                                "type": "integer",
+                                "description": "Maximum bytes of output to return (optional, defaults to the server limit)"
+                            },
+                            "max_lines": {
+                                "type": "integer",
+                                "description": "Maximum lines of output to return (optional)"
+                            },
+                            "continuation": {
+                                "type": "string",
+                                "description": "Token from a truncated result; returns the next page instead of running a command"
+                            },
+                            "structured": {
+                                "type": "boolean",
+                                "description": "Return the output parsed into JSON records (bt, ps, sys, log, "
+                                               "kmem -i, mod and runq)",
+                                "default": False
+                            }
+                        },
+                        "required": []
+                    }
+                ),
+                Tool(
+                    name="crash_batch",
+                    description="Execute several crash commands in one round-trip and get per-command "
+                                "results and timings",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "commands": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": f"Crash commands to execute in order (at most {MAX_BATCH_COMMANDS})"
+                            },
+                            "timeout": {
+                                "type": "integer",
+                                "description": "Timeout for the whole batch in seconds (optional, default 120s)",
+                                "default": 120
+                            }
+                        },
+                        "required": ["commands"]
+                    }
+                ),
+                Tool(
+                    name="read_crash_output",
+                    description="Read line ranges, the tail or regex matches of a large crash_command output "
+                                "stored on the server, without re-running the command",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "handle": {
+                                "type": "string",
+                                "description": "Output handle returned by crash_command"
+                            },
+                            "start_line": {
+                                "type": "integer",
+                                "description": "First line to return, 1-based (optional, default 1)",
+                                "default": 1
+                            },
+                            "num_lines": {
+                                "type": "integer",
+                                "description": "Number of lines to return (optional, default 200)",
+                                "default": 200
+                            },
+                            "tail": {
+                                "type": "integer",
+                                "description": "Return the last N lines instead of a range (optional)"
+                            },
+                            "grep": {
+                                "type": "string",
+                                "description": "Return lines matching this regular expression instead of a range (optional)"
+                            },
+                            "ignore_case": {
+                                "type": "boolean",
+                                "description": "Match grep case-insensitively (optional)",
+                                "default": False
+                            },
+                            "max_matches": {
+                                "type": "integer",
+                                "description": "Maximum grep matches to return (optional, default 200)",
+                                "default": 200
+                            }
+                        },
+                        "required": ["handle"]
+                    }
+                ),
+                Tool(
+                    name="triage_dump",
+                    description="Produce a structured first-look report for a crash dump: panic string, "
+                                "faulting task, backtrace, taint flags, uptime, loaded modules, memory "
+                                "usage and hung tasks",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "dump_name": {
+                                "type": "string",
+                                "description": "Name of the crash dump file (optional, uses the session's "
+                                               "dump or the latest if not specified)"
+                            },
+                            "workers": {
+                                "type": "integer",
+                                "description": "Crash processes to spread the triage commands over "
+                                               "(optional, defaults to the server setting)"
+                            },
+                            "timeout": {
+                                "type": "integer",
+                                "description": "Timeout of each triage command in seconds (optional, default 120s)",
+                                "default": 120
+                            }
+                        },
+                        "required": []
+                    }
+                ),
+                Tool(
+                    name="triage_all_dumps",
+                    description="Triage every crash dump in the background with a bounded pool of crash "
+                                "processes, writing one result per dump to a resumable JSONL or SQLite "
+                                "file; call again to see progress",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "output": {
+                                "type": "string",
+                                "description": "Results file, SQLite for .db/.sqlite and JSON Lines otherwise "
+                                               "(optional, defaults to the server setting)"
+                            },
+                            "workers": {
+                                "type": "integer",
+                                "description": "Crash processes to run at once (optional, defaults to what "
+                                               "fits the CPUs, available memory and session pool)"
+                            },
+                            "max_dumps": {
+                                "type": "integer",
+                                "description": "Triage at most this many of the newest dumps (optional)"
+                            }
+                        },
+                        "required": []
+                    }
+                ),
+                Tool(
+                    name="list_crash_clusters",
+                    description="List groups of crash dumps with the same signature (normalized panic "
+                                "message and top backtrace frames), largest first",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of clusters to return (optional, default 20)",
+                                "default": 20
+                            }
+                        },
+                        "required": []
+                    }
+                ),
+                Tool(
+                    name="match_crash_signature",
+                    description="Compute the signature of a crash dump and show which known cluster it "
+                                "matches and how often that crash was seen before",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "dump_name": {
+                                "type": "string",
+                                "description": "Name of the crash dump file (optional, uses the session's "
+                                               "dump or the latest if not specified)"
+                            },
+                            "timeout": {
+                                "type": "integer",
+                                "description": "Timeout of each command in seconds (optional, default 120s)",
+                                "default": 120
                             }
                         },
-                        "required": ["command"]
+                        "required": []
+                    }
+                ),
+                Tool(
+                    name="get_dump_log",
+                    description="Get the kernel log (dmesg) of a crash dump, decoded directly from the "
+                                "printk buffer in the dump in well under a second, without starting crash "
+                                "and without kernel debuginfo",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "dump_name": {
+                                "type": "string",
+                                "description": "Name of the crash dump file (optional, uses the session's "
+                                               "dump or the latest if not specified)"
+                            },
+                            "tail": {
+                                "type": "integer",
+                                "description": "Return only the last N log records (optional)"
+                            },
+                            "max_bytes": {
+                                "type": "integer",
+                                "description": "Return at most this many bytes (optional)"
+                            },
+                            "max_lines": {
+                                "type": "integer",
+                                "description": "Return at most this many lines (optional)"
+                            }
+                        },
+                        "required": []
+                    }
+                ),
+                Tool(
+                    name="get_server_metrics",
+                    description="Get server load metrics: per command verb counts, timeouts, cache hits, "
+                                "output bytes and latency percentiles, session start latency, and the "
+                                "RSS and CPU time of every crash process",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {},
+                        "required": []
                     }
                 ),
                 Tool(
@@ -165,8 +528,25 @@ class CrashMCPServer:
             name: str, arguments: Dict[str, Any]
         ) -> Sequence[TextContent]:
             """Handle tool calls."""
+            self._remember_client_session()
             if name == "crash_command":
                 return await self._handle_crash_command(arguments)
+            elif name == "crash_batch":
+                return await self._handle_crash_batch(arguments)
+            elif name == "read_crash_output":
+                return await self._handle_read_crash_output(arguments)
+            elif name == "triage_dump":
+                return await self._handle_triage_dump(arguments)
+            elif name == "triage_all_dumps":
+                return await self._handle_triage_all_dumps(arguments)
+            elif name == "list_crash_clusters":
+                return await self._handle_list_crash_clusters(arguments)
+            elif name == "match_crash_signature":
+                return await self._handle_match_crash_signature(arguments)
+            elif name == "get_dump_log":
+                return await self._handle_get_dump_log(arguments)
+            elif name == "get_server_metrics":
+                return await self._handle_get_server_metrics(arguments)
             elif name == "get_crash_info":
                 return await self._handle_get_crash_info(arguments)
             elif name == "list_crash_dumps":
@@ -178,32 +558,209 @@ class CrashMCPServer:
             else:
                 raise ValueError(f"Unknown tool: {name}")
 
+    def _remember_client_session(self):
+        """Remember the MCP session of the current request for notifications."""
+        try:
+            self._client_sessions.add(self.server.request_context.session)
+        except LookupError:
+            pass
+
+    async def _notify_new_dump(self, dump: CrashDump):
+        """Tell every connected client that a new crash dump landed."""
+        for session in list(self._client_sessions):
+            try:
+                await session.send_log_message(
+                    level="notice",
+                    data={"event": "new_crash_dump", "dump": dump.to_dict()},
+                    logger="crash-mcp"
+                )
+            except Exception as e:
+                logger.debug(f"Dropping client session from notifications: {e}")
+                self._client_sessions.discard(session)
+
+    def _on_new_dump(self, dump: CrashDump):
+        """Handle a new dump reported by the watcher thread."""
+        if self.prewarmer:
+            self.prewarmer.submit(dump)
+        if self._loop and not self._loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._notify_new_dump(dump), self._loop)
+
+    async def _start_background_services(self):
+        """Start services that run for the lifetime of the server."""
+        self._loop = asyncio.get_running_loop()
+        if self.config.watch_dumps and self.config.prewarm:
+            self.prewarmer = Prewarmer(
+                self.crash_session_manager,
+                self.kernel_detection,
+                commands=self.config.prewarm_commands or DEFAULT_PREWARM_COMMANDS,
+                max_load=self.config.prewarm_max_load,
+                min_free_mb=self.config.prewarm_min_free_mb,
+                start_timeout=self.config.session_init_timeout,
+                command_timeout=self.config.crash_timeout
+            )
+            self.prewarmer.start()
+        if self.config.watch_dumps:
+            self.dump_watcher = DumpWatcher(
+                self.crash_discovery,
+                on_new_dump=self._on_new_dump,
+                poll_interval=self.config.watch_poll_interval,
+                settle_seconds=self.config.dump_settle_seconds
+            )
+            try:
+                await self._run_blocking(self.dump_watcher.start)
+            except Exception as e:
+                logger.error(f"Cannot watch crash dump path: {e}")
+                self.dump_watcher = None
+
+    def _shutdown(self):
+        """Stop background services and close pooled crash sessions."""
+        if self.dump_watcher:
+            self.dump_watcher.stop()
+            self.dump_watcher = None
+        if self.prewarmer:
+            self.prewarmer.stop()
+            self.prewarmer = None
+        if self.bulk_triage:
+            self.bulk_triage.stop()
+        self.crash_session_manager.close_all_sessions()
+        self.result_store.close()
+        self.vmcore_readers.close()
+        self.signature_index.close()
+        self.crash_executor.shutdown(wait=False)
+
+    async def _run_crash_io(self, func, *args):
+        """Run a blocking crash session call on the crash I/O executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.crash_executor, functools.partial(func, *args))
+
+    async def _run_blocking(self, func, *args):
+        """Run a blocking filesystem call on the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
+
+    def _progress_callback(self):
+        """Build a callback reporting command output progress to the requesting client.
+
+        Returns None when the request did not ask for progress. The callback
+        runs on a crash I/O thread and hands the notification to the loop.
+        """
+        try:
+            ctx = self.server.request_context
+        except LookupError:
+            return None
+        token = ctx.meta.progressToken if ctx.meta else None
+        if token is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        session = ctx.session
+
+        def on_progress(size: int, lines: int):
+            asyncio.run_coroutine_threadsafe(
+                session.send_progress_notification(token, size, message=f"{lines} lines, {size} bytes read"),
+                loop
+            )
+
+        return on_progress
+
+    def _format_output(self, output: CommandOutput, command: str, max_bytes: Optional[int],
+                       max_lines: Optional[int], client_id: str) -> str:
+        """Format a command's output, storing it for the client when it is too large to return."""
+        limit = self.config.output_max_bytes
+        if max_bytes is None and max_lines is None and limit and output.size > limit:
+            return self._summarize_output(output, command, client_id)
+        return self._page_output(output, 0, max_bytes, max_lines, client_id, command=command)
+
+    def _summarize_output(self, output: CommandOutput, command: str, client_id: str) -> str:
+        """Store a large output and describe it with its first and last lines."""
+        handle = self.result_store.add(output, command, client_id)
+        head, next_offset = output.read_page(0, max_bytes=SUMMARY_HEAD_BYTES, max_lines=SUMMARY_HEAD_LINES)
+        tail = output.tail(SUMMARY_TAIL_LINES)
+        head_lines = head.count("\n")
+
+        parts = [
+            f"[Output of '{command}' is {output.size:,} bytes in {output.line_count:,} lines and is stored "
+            f"on the server as handle \"{handle}\". Use read_crash_output with this handle to fetch line "
+            f"ranges, the tail or regex matches, or crash_command with "
+            f"continuation=\"{make_continuation(handle, next_offset or 0)}\" to page through it.]",
+            "",
+            head.rstrip()
+        ]
+        if tail and tail[0][0] > head_lines:
+            if tail[0][0] > head_lines + 1:
+                parts.append(f"... ({tail[0][0] - head_lines - 1:,} lines omitted) ...")
+            parts.extend(text[:SUMMARY_LINE_CHARS] for _, text in tail)
+        return "\n".join(parts)
+
+    def _page_output(self, output: CommandOutput, offset: int, max_bytes: Optional[int],
+                     max_lines: Optional[int], client_id: str, handle: Optional[str] = None,
+                     command: str = "") -> str:
+        """Format one page of an output, storing the output if more pages remain."""
+        if max_bytes is None:
+            max_bytes = self.config.output_max_bytes or None
+        text, next_offset = output.read_page(offset, max_bytes, max_lines)
+        if next_offset is None:
+            if handle is None:
+                output.close()
+            if offset == 0:
+                text = text.strip()
+            return text if text.strip() else "Command executed successfully (no output)"
+
+        if handle is None:
+            handle = self.result_store.add(output, command, client_id)
+        token = make_continuation(handle, next_offset)
+        return (f"{text.rstrip()}\n[Output truncated: bytes {offset}-{next_offset} of {output.size} "
+                f"({output.lines} lines). Call crash_command with continuation=\"{token}\" for more.]")
+
     async def _handle_crash_command(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
         """Handle crash command execution."""
         try:
             params = CrashCommandParams(**arguments)
 
+            if params.continuation:
+                client_id = _client_id.get()
+                handle, offset = parse_continuation(params.continuation)
+                output = self.result_store.get(handle, client_id)
+                if output is None:
+                    return [TextContent(type="text", text="Error: Unknown or expired continuation token")]
+                try:
+                    text = await self._run_blocking(
+                        self._page_output, output, offset, params.max_bytes, params.max_lines, client_id, handle
+                    )
+                except OutputClosedError:
+                    # Evicted from the store while being read
+                    return [TextContent(type="text", text="Error: Unknown or expired continuation token")]
+                return [TextContent(type="text", text=text)]
+
+            if not params.command:
+                return [TextContent(type="text", text="Error: command or continuation is required")]
+
             logger.info(f"Executing crash command: {params.command}")
 
+            client_id = _client_id.get()
+
             # Ensure we have an active session
-            if not self.crash_session_manager.is_session_active():
-                # Try to start a session with the latest crash dump
-                await self._handle_start_crash_session({})
+            if not await self._ensure_session(client_id):
+                return [TextContent(type="text", text=self._no_session_error(client_id))]
 
-                if not self.crash_session_manager.is_session_active():
-                    return [TextContent(
-                        type="text",
-                        text="Error: No active crash session and could not start one"
-                    )]
+            if params.structured:
+                return await self._run_structured_command(params, client_id)
 
-            # Execute the command
-            output, error, return_code = self.crash_session_manager.execute_command(params.command, params.timeout)
+            # Execute the command, streaming its output into a spooled buffer
+            output, error, return_code = await self._run_crash_io(
+                self.crash_session_manager.run_command, params.command, params.timeout, client_id,
+                self._progress_callback()
+            )
 
             # Format the result
             if return_code == 0:
-                result_text = output if output else "Command executed successfully (no output)"
+                result_text = await self._run_blocking(
+                    self._format_output, output, params.command, params.max_bytes, params.max_lines, client_id
+                )
             else:
-                result_text = f"Command failed (exit code {return_code})\nOutput: {output}\nError: {error}"
+                partial, _ = output.read_page(0, max_bytes=self.config.output_max_bytes or None)
+                output.close()
+                result_text = f"Command failed (exit code {return_code})\nOutput: {partial.strip()}\nError: {error}"
 
             return [TextContent(type="text", text=result_text)]
 
@@ -211,24 +768,391 @@ class CrashMCPServer:
             logger.error(f"Error handling crash command: {e}")
             return [TextContent(type="text", text=f"Error: {str(e)}")]
 
+    async def _run_structured_command(self, params: CrashCommandParams, client_id: str) -> Sequence[TextContent]:
+        """Run a command and return its output parsed into JSON records."""
+        parsed, error, return_code = await self._run_crash_io(
+            self.crash_session_manager.run_structured, params.command, params.timeout, client_id,
+            self._progress_callback()
+        )
+        if return_code != 0:
+            return [TextContent(type="text", text=f"Error: {error}")]
+
+        # Large tables (ps on a big dump) are paged like raw output
+        output = CommandOutput.from_text(json.dumps(parsed))
+        text = await self._run_blocking(
+            self._format_output, output, params.command, params.max_bytes, params.max_lines, client_id
+        )
+        return [TextContent(type="text", text=text)]
+
+    async def _ensure_session(self, client_id: str) -> bool:
+        """Make sure the client has an active session, starting one on the latest dump if needed.
+
+        A session whose crash process is being restarted is waited for. A
+        client whose session died and could not be restarted is not moved
+        to another dump behind its back.
+        """
+        manager = self.crash_session_manager
+        if await self._run_crash_io(manager.wait_for_recovery, client_id):
+            return True
+        if manager.get_lost_session(client_id) is None:
+            # Try to start a session with the latest crash dump
+            await self._handle_start_crash_session({})
+        return manager.is_session_active(client_id)
+
+    def _no_session_error(self, client_id: str) -> str:
+        """Explain why the client has no session to run commands in."""
+        lost = self.crash_session_manager.get_lost_session(client_id)
+        if lost:
+            return (f"Error: The crash session on {lost} died and could not be restarted; "
+                    f"use start_crash_session to start a new one")
+        return "Error: No active crash session and could not start one"
+
+    async def _handle_crash_batch(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """Handle batched crash command execution."""
+        try:
+            params = CrashBatchParams(**arguments)
+
+            commands = [command for command in params.commands if command.strip()]
+            if not commands:
+                return [TextContent(type="text", text="Error: No commands given")]
+            if len(commands) > MAX_BATCH_COMMANDS:
+                return [TextContent(type="text", text=f"Error: At most {MAX_BATCH_COMMANDS} commands per batch")]
+
+            logger.info(f"Executing crash batch: {commands}")
+
+            client_id = _client_id.get()
+            if not await self._ensure_session(client_id):
+                return [TextContent(type="text", text=self._no_session_error(client_id))]
+
+            started = asyncio.get_running_loop().time()
+            results = await self._run_crash_io(
+                self.crash_session_manager.run_batch, commands, params.timeout, client_id,
+                self._progress_callback()
+            )
+            elapsed = asyncio.get_running_loop().time() - started
+
+            formatted = []
+            for result in results:
+                entry = {"command": result.command, "return_code": result.return_code}
+                if result.return_code == 0:
+                    entry["output"] = await self._run_blocking(
+                        self._format_output, result.output, result.command, None, None, client_id
+                    )
+                else:
+                    partial, _ = result.output.read_page(0, max_bytes=self.config.output_max_bytes or None)
+                    result.output.close()
+                    entry["output"] = partial.strip()
+                    entry["error"] = result.error
+                entry["elapsed_ms"] = round(result.elapsed * 1000, 1)
+                entry["cached"] = result.cached
+                formatted.append(entry)
+
+            return [TextContent(type="text", text=json.dumps(
+                {"results": formatted, "elapsed_ms": round(elapsed * 1000, 1)}, indent=2
+            ))]
+
+        except Exception as e:
+            logger.error(f"Error handling crash batch: {e}")
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    async def _handle_read_crash_output(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """Handle reading part of a stored command output."""
+        try:
+            params = ReadOutputParams(**arguments)
+
+            stored = self.result_store.lookup(params.handle, _client_id.get())
+            if stored is None:
+                return [TextContent(type="text", text=f"Error: Unknown or expired output handle '{params.handle}'")]
+            output = stored.output
+            total = output.line_count
+
+            if params.grep:
+                matches, more = await self._run_blocking(
+                    output.grep, params.grep, params.max_matches, params.ignore_case
+                )
+                header = f"{len(matches)}{'+' if more else ''} lines of {total:,} match /{params.grep}/ in '{stored.command}'"
+                lines = [f"{number}: {text}" for number, text in matches]
+            else:
+                if params.tail:
+                    selected = await self._run_blocking(output.tail, params.tail)
+                else:
+                    selected = await self._run_blocking(output.read_lines, params.start_line, params.num_lines)
+                if not selected:
+                    return [TextContent(type="text", text=f"No lines in range (output has {total:,} lines)")]
+                header = f"Lines {selected[0][0]}-{selected[-1][0]} of {total:,} of '{stored.command}'"
+                lines = [text for _, text in selected]
+
+            return [TextContent(type="text", text="\n".join([header, ""] + lines))]
+
+        except re.error as e:
+            return [TextContent(type="text", text=f"Error: Invalid regular expression: {str(e)}")]
+        except OutputClosedError:
+            # Evicted from the store while being read
+            return [TextContent(type="text", text=f"Error: Unknown or expired output handle '{params.handle}'")]
+        except Exception as e:
+            logger.error(f"Error reading crash output: {e}")
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    async def _handle_triage_dump(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """Handle triaging a crash dump."""
+        try:
+            params = TriageParams(**arguments)
+
+            crash_dump, error = await self._resolve_dump(params.dump_name, _client_id.get())
+            if not crash_dump:
+                return [TextContent(type="text", text=f"Error: {error}")]
+
+            kernel = await self._run_blocking(self.kernel_detection.find_matching_kernel, crash_dump)
+            if not kernel:
+                return [TextContent(type="text", text="Error: No matching kernel found")]
+
+            engine = TriageEngine(
+                self.crash_session_manager,
+                workers=params.workers or self.config.triage_workers,
+                command_timeout=params.timeout
+            )
+            report = await self._run_crash_io(engine.run, crash_dump, kernel, self.config.session_init_timeout)
+            signature = signature_from_report(report)
+            if signature and not report.get("error"):
+                cluster = await self._run_blocking(self.signature_index.record, crash_dump, signature)
+                report["signature"] = {"hash": signature.hash, "seen_before": cluster["count"] if cluster else 0}
+            return [TextContent(type="text", text=json.dumps(report, indent=2))]
+
+        except Exception as e:
+            logger.error(f"Error triaging crash dump: {e}")
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    async def _handle_list_crash_clusters(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """Handle listing crash signature clusters."""
+        try:
+            params = ListClustersParams(**arguments)
+
+            clusters = await self._run_blocking(self.signature_index.list_clusters, params.limit)
+            if not clusters:
+                return [TextContent(type="text", text="No crash signatures indexed yet; run triage_dump, "
+                                                      "triage_all_dumps or match_crash_signature first")]
+            info = dict(self.signature_index.get_stats(), clusters=clusters)
+            return [TextContent(type="text", text=json.dumps(info, indent=2))]
+
+        except Exception as e:
+            logger.error(f"Error listing crash clusters: {e}")
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    async def _handle_match_crash_signature(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """Handle matching a dump against the known crash signatures."""
+        try:
+            params = MatchSignatureParams(**arguments)
+
+            crash_dump, error = await self._resolve_dump(params.dump_name, _client_id.get())
+            if not crash_dump:
+                return [TextContent(type="text", text=f"Error: {error}")]
+
+            signature = await self._run_blocking(self.signature_index.get, crash_dump)
+            if not signature:
+                kernel = await self._run_blocking(self.kernel_detection.find_matching_kernel, crash_dump)
+                if not kernel:
+                    return [TextContent(type="text", text="Error: No matching kernel found")]
+
+                # Only the panic message and backtrace are needed
+                engine = TriageEngine(self.crash_session_manager, workers=1, command_timeout=params.timeout,
+                                      commands=("sys", "bt"))
+                report = await self._run_crash_io(engine.run, crash_dump, kernel, self.config.session_init_timeout)
+                if report.get("error"):
+                    return [TextContent(type="text", text=f"Error: {report['error']}")]
+                signature = signature_from_report(report)
+                if not signature:
+                    return [TextContent(type="text", text="Error: No panic message or backtrace found in the dump")]
+
+            cluster = await self._run_blocking(self.signature_index.record, crash_dump, signature)
+            if cluster:
+                summary = f"Matches cluster {signature.hash} seen {cluster['count']} times before"
+            else:
+                summary = f"New signature {signature.hash}, not seen before"
+            result = {
+                "dump": str(crash_dump.path),
+                "summary": summary,
+                "signature": signature.hash,
+                "panic": signature.panic,
+                "frames": signature.frames,
+                "cluster": cluster
+            }
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+        except Exception as e:
+            logger.error(f"Error matching crash signature: {e}")
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    async def _handle_triage_all_dumps(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """Handle starting or reporting on bulk triage."""
+        try:
+            params = BulkTriageParams(**arguments)
+
+            if self.bulk_triage and self.bulk_triage.running:
+                status = dict(self.bulk_triage.get_stats(), output=self._bulk_output, started=False)
+                return [TextContent(type="text", text=json.dumps(status, indent=2))]
+
+            output = params.output or self.config.bulk_output
+            workers = params.workers or default_pool_size(self.config.bulk_session_mb)
+            workers = max(1, min(workers, self.crash_session_manager.max_sessions))
+            results = await self._run_blocking(open_results, output)
+            crash_dumps = await self._run_blocking(
+                self.crash_discovery.find_crash_dumps, params.max_dumps or sys.maxsize
+            )
+
+            bulk = BulkTriage(
+                self.crash_session_manager,
+                self.kernel_detection,
+                results,
+                workers=workers,
+                command_timeout=self.config.crash_timeout,
+                start_timeout=self.config.session_init_timeout,
+                signatures=self.signature_index
+            )
+            # Mark it running before returning so a quick second call sees the job
+            bulk.running = True
+            self.bulk_triage = bulk
+            self._bulk_output = output
+
+            def run():
+                try:
+                    bulk.run(crash_dumps)
+                except Exception as e:
+                    logger.error(f"Bulk triage failed: {e}")
+                finally:
+                    bulk.running = False
+                    results.close()
+
+            threading.Thread(target=run, name="crash-bulk-triage", daemon=True).start()
+            status = dict(bulk.get_stats(), total=len(crash_dumps), output=output, started=True)
+            return [TextContent(type="text", text=json.dumps(status, indent=2))]
+
+        except Exception as e:
+            logger.error(f"Error starting bulk triage: {e}")
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    async def _resolve_dump(self, dump_name: Optional[str], client_id: str):
+        """Find a dump by name, else the client's session dump, else the latest.
+
+        Returns the dump, or None and an error message.
+        """
+        if dump_name:
+            crash_dump = await self._run_blocking(self.crash_discovery.get_crash_dump_by_name, dump_name)
+            return (crash_dump, None) if crash_dump else (None, f"Crash dump '{dump_name}' not found")
+
+        session = self.crash_session_manager.get_session(client_id)
+        if session and session.is_active():
+            crash_dumps = await self._run_blocking(self.crash_discovery.find_crash_dumps)
+            for crash_dump in crash_dumps:
+                if str(crash_dump.path) == session.dump_path:
+                    return crash_dump, None
+
+        crash_dump = await self._run_blocking(self.crash_discovery.get_latest_crash_dump)
+        return (crash_dump, None) if crash_dump else (None, "No crash dumps found")
+
+    def _read_dump_log(self, crash_dump: CrashDump) -> List[LogLine]:
+        """Read a dump's kernel log through its pooled reader."""
+        with self.vmcore_readers.reader(crash_dump.identity, crash_dump.path) as reader:
+            return read_dump_log(reader)
+
+    async def _handle_get_dump_log(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """Handle reading the kernel log straight from a dump."""
+        try:
+            params = DumpLogParams(**arguments)
+
+            client_id = _client_id.get()
+            crash_dump, error = await self._resolve_dump(params.dump_name, client_id)
+            if not crash_dump:
+                return [TextContent(type="text", text=f"Error: {error}")]
+
+            try:
+                lines = await self._run_blocking(self._read_dump_log, crash_dump)
+            except VmcoreError as e:
+                return [TextContent(type="text", text=f"Error: Cannot decode the kernel log of {crash_dump.name}: "
+                                                      f"{e}. Use crash_command with 'log' instead")]
+            if params.tail:
+                lines = lines[-params.tail:]
+
+            output = CommandOutput.from_text(format_log(lines))
+            text = await self._run_blocking(
+                self._format_output, output, "log", params.max_bytes, params.max_lines, client_id
+            )
+            return [TextContent(type="text", text=text)]
+
+        except Exception as e:
+            logger.error(f"Error reading dump log: {e}")
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    def _pool_gauges(self) -> dict:
+        """Get the session pool occupancy."""
+        info = self.crash_session_manager.get_session_info(None)
+        return dict(info["pool"], sessions=len(info["pooled_sessions"]))
+
+    async def _handle_get_server_metrics(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+        """Handle getting the server metrics."""
+        try:
+            metrics = self.metrics.snapshot()
+            metrics["processes"] = await self._run_blocking(self.crash_session_manager.get_process_stats)
+            metrics["pool"] = await self._run_blocking(self._pool_gauges)
+            if self.result_cache:
+                metrics["result_cache"] = self.result_cache.get_stats()
+            return [TextContent(type="text", text=json.dumps(metrics, indent=2))]
+
+        except Exception as e:
+            logger.error(f"Error getting server metrics: {e}")
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+    async def _render_metrics(self) -> str:
+        """Render the metrics in Prometheus text format.
+
+        Process and pool gauges that cannot be collected are left out
+        rather than failing the scrape.
+        """
+        try:
+            processes = await self._run_blocking(self.crash_session_manager.get_process_stats)
+        except Exception as e:
+            logger.error(f"Error collecting crash process metrics: {e}")
+            processes = []
+        try:
+            pool = await self._run_blocking(self._pool_gauges)
+        except Exception as e:
+            logger.error(f"Error collecting session pool metrics: {e}")
+            pool = None
+        return self.metrics.render_prometheus(processes, pool)
+
     async def _handle_get_crash_info(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
         """Handle getting crash information."""
         try:
             info = {}
 
             # Get session info
-            session_info = self.crash_session_manager.get_session_info()
+            session_info = await self._run_blocking(self.crash_session_manager.get_session_info, _client_id.get())
             if session_info:
                 info["session"] = session_info
             else:
                 info["session"] = {"is_active": False}
 
+            # Get result cache counters
+            if self.result_cache:
+                info["result_cache"] = self.result_cache.get_stats()
+            info["result_store"] = self.result_store.get_stats()
+
             # Get available crash dumps
-            crash_dumps = self.crash_discovery.find_crash_dumps()
-            info["available_dumps"] = [dump.to_dict() for dump in crash_dumps[:5]]
+            crash_dumps = await self._run_blocking(self.crash_discovery.find_crash_dumps)
+            info["available_dumps"] = await self._run_blocking(
+                lambda: [self.crash_discovery.get_dump_info(dump) for dump in crash_dumps[:5]]
+            )
+            if self.dump_watcher:
+                info["dump_watcher"] = {
+                    "mode": self.dump_watcher.mode,
+                    "pending_dumps": [str(dump.path) for dump in self.dump_watcher.get_pending_dumps()]
+                }
+            if self.prewarmer:
+                info["prewarm"] = self.prewarmer.get_stats()
+            if self.bulk_triage:
+                info["bulk_triage"] = dict(self.bulk_triage.get_stats(), output=self._bulk_output)
 
             # Get available kernels
-            kernels = self.kernel_detection.find_kernel_files()
+            kernels = await self._run_blocking(self.kernel_detection.find_kernel_files)
             info["available_kernels"] = [kernel.to_dict() for kernel in kernels[:5]]
 
             return [TextContent(type="text", text=json.dumps(info, indent=2))]
@@ -242,21 +1166,32 @@ class CrashMCPServer:
         try:
             params = ListDumpsParams(**arguments)
 
-            crash_dumps = self.crash_discovery.find_crash_dumps()
+            crash_dumps = await self._run_blocking(self.crash_discovery.find_crash_dumps)
 
             if not crash_dumps:
                 return [TextContent(type="text", text="No crash dumps found")]
 
             # Limit results
             crash_dumps = crash_dumps[:params.max_dumps]
+            headers = await self._run_blocking(
+                lambda: [self.crash_discovery.get_dump_header(dump) for dump in crash_dumps]
+            )
 
             # Format output
             output = f"Found {len(crash_dumps)} crash dumps:\n\n"
-            for i, dump in enumerate(crash_dumps, 1):
+            for i, (dump, header) in enumerate(zip(crash_dumps, headers), 1):
                 output += f"{i}. {dump.name}\n"
                 output += f"   Path: {dump.path}\n"
                 output += f"   Size: {dump.size:,} bytes\n"
-                output += f"   Modified: {dump.mtime}\n\n"
+                output += f"   Modified: {dump.mtime}\n"
+                if header:
+                    output += f"   Kernel: {header.release or 'unknown'}\n"
+                    output += f"   Format: {header.format}, compression {header.compression}, "
+                    output += f"dump level {header.dump_level if header.dump_level is not None else 'unknown'}, page size {header.page_size}\n"
+                    if header.timestamp_ms:
+                        crashed = datetime.fromtimestamp(header.timestamp_ms / 1000)
+                        output += f"   Crashed: {crashed.isoformat(timespec='milliseconds')}\n"
+                output += "\n"
 
             return [TextContent(type="text", text=output)]
 
@@ -271,11 +1206,11 @@ class CrashMCPServer:
 
             # Find crash dump
             if params.dump_name:
-                crash_dump = self.crash_discovery.get_crash_dump_by_name(params.dump_name)
+                crash_dump = await self._run_blocking(self.crash_discovery.get_crash_dump_by_name, params.dump_name)
                 if not crash_dump:
                     return [TextContent(type="text", text=f"Error: Crash dump '{params.dump_name}' not found")]
             else:
-                crash_dump = self.crash_discovery.get_latest_crash_dump()
+                crash_dump = await self._run_blocking(self.crash_discovery.get_latest_crash_dump)
                 if not crash_dump:
                     return [TextContent(type="text", text="Error: No crash dumps found")]
 
@@ -284,18 +1219,23 @@ class CrashMCPServer:
                 return [TextContent(type="text", text=f"Error: Invalid crash dump: {crash_dump.name}")]
 
             # Find matching kernel
-            kernel = self.kernel_detection.find_matching_kernel(crash_dump)
+            kernel = await self._run_blocking(self.kernel_detection.find_matching_kernel, crash_dump)
             if not kernel:
                 return [TextContent(type="text", text="Error: No matching kernel found")]
 
             # Start session
-            success = self.crash_session_manager.start_session(crash_dump, kernel, params.timeout)
+            success = await self._run_crash_io(
+                self.crash_session_manager.start_session, crash_dump, kernel, params.timeout, _client_id.get()
+            )
 
             if success:
                 return [TextContent(type="text", text=f"Crash session started successfully\nDump: {crash_dump.name}\nKernel: {kernel.name}")]
             else:
                 return [TextContent(type="text", text="Error: Failed to start crash session")]
 
+        except SessionAdmissionError as e:
+            logger.warning(f"Crash session admission refused: {e}")
+            return [TextContent(type="text", text=f"Error: Server busy: {str(e)}")]
         except Exception as e:
             logger.error(f"Error starting crash session: {e}")
             return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -303,8 +1243,9 @@ class CrashMCPServer:
     async def _handle_close_crash_session(self, arguments: Dict[str, Any]) -> Sequence[TextContent]:
         """Handle closing the crash session."""
         try:
-            if self.crash_session_manager.is_session_active():
-                self.crash_session_manager.close_session()
+            client_id = _client_id.get()
+            if self.crash_session_manager.is_session_active(client_id):
+                await self._run_crash_io(self.crash_session_manager.close_session, client_id)
                 return [TextContent(type="text", text="Crash session closed")]
             else:
                 return [TextContent(type="text", text="No active crash session to close")]
@@ -316,6 +1257,7 @@ class CrashMCPServer:
     async def run_stdio(self):
         """Run the MCP server with stdio transport."""
         logger.info("Starting Crash MCP Server (stdio)")
+        await self._start_background_services()
 
         async with stdio_server() as (read_stream, write_stream):
             try:
@@ -335,9 +1277,8 @@ class CrashMCPServer:
                 logger.error(f"Server error: {e}")
                 raise
             finally:
-                # Clean up crash session if active
-                if self.crash_session_manager.is_session_active():
-                    self.crash_session_manager.close_session()
+                # Clean up background services and pooled crash sessions
+                self._shutdown()
 
     def create_sse_app(self):
         """Create Starlette app for SSE transport."""
@@ -350,7 +1291,9 @@ class CrashMCPServer:
                 path = scope["path"]
 
                 if path == "/sse":
-                    # Handle SSE endpoint
+                    # Handle SSE endpoint; each connection gets its own crash session binding
+                    client_id = f"sse-{uuid.uuid4().hex[:12]}"
+                    token = _client_id.set(client_id)
                     try:
                         async with transport.connect_sse(
                             scope, receive, send
@@ -378,6 +1321,27 @@ class CrashMCPServer:
                             'type': 'http.response.body',
                             'body': f'Server Error: {str(e)}'.encode(),
                         })
+                    finally:
+                        _client_id.reset(token)
+                        await self._run_blocking(self.crash_session_manager.release_client, client_id)
+                elif path == "/metrics":
+                    # Prometheus scrape endpoint
+                    try:
+                        body = (await self._render_metrics()).encode()
+                        status = 200
+                    except Exception as e:
+                        logger.error(f"Metrics endpoint error: {e}")
+                        body = f'Server Error: {str(e)}'.encode()
+                        status = 500
+                    await send({
+                        'type': 'http.response.start',
+                        'status': status,
+                        'headers': [[b'content-type', b'text/plain; version=0.0.4; charset=utf-8']],
+                    })
+                    await send({
+                        'type': 'http.response.body',
+                        'body': body,
+                    })
                 elif path == "/message":
                     # Handle message endpoint
                     try:
@@ -420,12 +1384,12 @@ class CrashMCPServer:
             log_level="info"
         )
         server = uvicorn.Server(config)
+        await self._start_background_services()
         try:
             await server.serve()
         finally:
-            # Clean up crash session if active
-            if self.crash_session_manager.is_session_active():
-                self.crash_session_manager.close_session()
+            # Clean up background services and pooled crash sessions
+            self._shutdown()
 
 
 async def async_main():
@@ -433,11 +1397,11 @@ async def async_main():
     server = CrashMCPServer()
 
     # Check system requirements
-    requirements = check_system_requirements()
+    requirements = check_system_requirements(server.config.crash_binary)
     logger.info(f"System requirements: {requirements}")
 
     # Validate crash utility
-    crash_version = validate_crash_utility()
+    crash_version = validate_crash_utility(server.config.crash_binary)
     if not crash_version:
         logger.error("Crash utility not available - some functionality may not work")
 
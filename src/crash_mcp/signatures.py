@@ -0,0 +1,190 @@
+"""Crash signatures for grouping dumps that hit the same bug."""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence
+
+from crash_mcp.crash_discovery import CrashDump
+
+
+logger = logging.getLogger(__name__)
+
+# Backtrace frames that make up a signature
+SIGNATURE_DEPTH = 8
+
+# Frames of the crash and panic machinery itself, the same in every dump
+GENERIC_FRAMES = frozenset((
+    "machine_kexec", "__crash_kexec", "crash_kexec", "panic", "oops_end", "die", "__die",
+    "do_trap", "do_error_trap", "exc_invalid_op", "asm_exc_invalid_op", "page_fault_oops",
+    "no_context", "__bad_area_nosemaphore", "bad_area_nosemaphore", "do_user_addr_fault",
+    "exc_page_fault", "asm_exc_page_fault", "async_page_fault", "page_fault", "invalid_op",
+    "sysrq_handle_crash", "__handle_sysrq", "nmi_panic", "watchdog_overflow_callback"
+))
+
+# Example dumps listed per cluster
+CLUSTER_EXAMPLES = 5
+
+_HEX_RE = re.compile(r"\b(?:0x)?[0-9a-f]{8,}\b", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"(?<![A-Za-z_\d])\d+")
+_COMM_RE = re.compile(r"(\b(?:comm|Comm):\s*)\S+")
+_FRAME_SUFFIX_RE = re.compile(r"(?:\+0x[0-9a-f]+(?:/0x[0-9a-f]+)?|\.(?:isra|constprop|part|cold|llvm)\.?\d*)+$")
+
+
+class Signature(NamedTuple):
+    """Normalized identity of a crash."""
+    hash: str
+    panic: str
+    frames: List[str]
+
+
+def normalize_panic(panic: str) -> str:
+    """Strip addresses, numbers and task names from a panic message."""
+    text = _HEX_RE.sub("<addr>", panic.strip().strip('"'))
+    text = _COMM_RE.sub(r"\1<comm>", text)
+    text = _NUMBER_RE.sub("<n>", text)
+    return " ".join(text.split())
+
+
+def normalize_frame(function: str) -> str:
+    """Strip offsets and compiler clone suffixes from a function name."""
+    return _FRAME_SUFFIX_RE.sub("", function.split()[0]) if function.strip() else ""
+
+
+def make_signature(panic: Optional[str], functions: Sequence[str],
+                   depth: int = SIGNATURE_DEPTH) -> Optional[Signature]:
+    """Build a signature from a panic message and backtrace function names.
+
+    Returns None when there is neither a panic message nor a frame.
+    """
+    frames = []
+    for function in functions:
+        frame = normalize_frame(function)
+        if frame and frame not in GENERIC_FRAMES and (not frames or frames[-1] != frame):
+            frames.append(frame)
+        if len(frames) >= depth:
+            break
+    panic = normalize_panic(panic or "")
+    if not panic and not frames:
+        return None
+
+    digest = hashlib.sha256("\n".join([panic] + frames).encode("utf-8")).hexdigest()[:16]
+    return Signature(digest, panic, frames)
+
+
+def signature_from_report(report: dict, depth: int = SIGNATURE_DEPTH) -> Optional[Signature]:
+    """Build a signature from a triage report."""
+    return make_signature(report.get("panic"), [frame["function"] for frame in report.get("backtrace", [])],
+                          depth)
+
+
+class SignatureIndex:
+    """Persistent signature of every analyzed dump, grouped into clusters.
+
+    Dumps are keyed by their identity (path, size and mtime), so a
+    rewritten dump is indexed again. ``db_path`` None keeps the index in
+    memory only.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = self._connect(db_path)
+
+    def _connect(self, db_path: Optional[str]) -> sqlite3.Connection:
+        """Open the backing database, falling back to memory on error."""
+        schema = ("CREATE TABLE IF NOT EXISTS crash_signatures ("
+                  "dump_key TEXT PRIMARY KEY, dump_path TEXT, signature TEXT, panic TEXT, frames TEXT, "
+                  "indexed REAL)")
+        if db_path:
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(schema)
+                conn.execute("CREATE INDEX IF NOT EXISTS crash_signatures_signature "
+                             "ON crash_signatures (signature)")
+                conn.commit()
+                return conn
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Cannot open signature database {db_path}, keeping index in memory: {e}")
+
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.execute(schema)
+        return conn
+
+    def record(self, dump: CrashDump, signature: Signature) -> Optional[dict]:
+        """Record the signature of a dump and get the cluster it matched before."""
+        cluster = self.get_cluster(signature.hash, exclude=dump)
+        self.add(dump, signature)
+        return cluster
+
+    def add(self, dump: CrashDump, signature: Signature):
+        """Record the signature of a dump."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crash_signatures VALUES (?, ?, ?, ?, ?, ?)",
+                (dump.identity, str(dump.path), signature.hash, signature.panic,
+                 json.dumps(signature.frames), time.time())
+            )
+
+    def get(self, dump: CrashDump) -> Optional[Signature]:
+        """Get the recorded signature of a dump."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT signature, panic, frames FROM crash_signatures WHERE dump_key = ?", (dump.identity,)
+            ).fetchone()
+        return Signature(row[0], row[1], json.loads(row[2])) if row else None
+
+    def get_cluster(self, signature_hash: str, exclude: Optional[CrashDump] = None) -> Optional[dict]:
+        """Describe the cluster of a signature, optionally leaving one dump out."""
+        excluded = exclude.identity if exclude else None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dump_path, panic, frames, indexed FROM crash_signatures "
+                "WHERE signature = ? AND dump_key IS NOT ? ORDER BY indexed DESC",
+                (signature_hash, excluded)
+            ).fetchall()
+        if not rows:
+            return None
+        return self._describe(signature_hash, rows)
+
+    def list_clusters(self, limit: int = 20) -> List[dict]:
+        """Get the largest clusters, most dumps first."""
+        with self._lock:
+            hashes = [row[0] for row in self._conn.execute(
+                "SELECT signature FROM crash_signatures GROUP BY signature "
+                "ORDER BY COUNT(*) DESC, MAX(indexed) DESC LIMIT ?", (limit,)
+            )]
+        return [self.get_cluster(signature_hash) for signature_hash in hashes]
+
+    def get_stats(self) -> dict:
+        """Get the number of indexed dumps and clusters."""
+        with self._lock:
+            dumps, clusters = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT signature) FROM crash_signatures"
+            ).fetchone()
+        return {"dumps": dumps, "clusters": clusters}
+
+    def _describe(self, signature_hash: str, rows: list) -> dict:
+        """Describe a cluster from its rows, newest first."""
+        return {
+            "signature": signature_hash,
+            "count": len(rows),
+            "panic": rows[0][1],
+            "frames": json.loads(rows[0][2]),
+            "first_seen": datetime.fromtimestamp(min(row[3] for row in rows)).isoformat(),
+            "last_seen": datetime.fromtimestamp(rows[0][3]).isoformat(),
+            "dumps": [row[0] for row in rows[:CLUSTER_EXAMPLES]]
+        }
+
+    def close(self):
+        """Close the backing database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,202 @@
+"""First-look triage reports for crash dumps."""
+
+import logging
+import queue
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from crash_mcp.crash_session import CrashSessionManager, SessionAdmissionError
+from crash_mcp.parsers import parse_bt, parse_kmem_info, parse_mod, parse_sys
+
+
+logger = logging.getLogger(__name__)
+
+# Commands behind each part of the report, heaviest first
+TRIAGE_COMMANDS = ("ps -m", "kmem -i", "mod", "bt", "sys", "sys -t")
+
+# Most hung tasks listed in a report
+MAX_HUNG_TASKS = 50
+
+_TASK_RE = re.compile(r'PID:\s*(\d+)\s+TASK:\s*([0-9a-fx]+)\s+CPU:\s*(\d+)\s+COMMAND:\s*"([^"]*)"')
+_TAINT_RE = re.compile(r"TAINTED_MASK:\s*(\S+)(?:\s+(\S+))?")
+_PS_M_RE = re.compile(r"^\[\s*(\d+)\s+([\d:.]+)\]\s+\[(\w+)\]\s+" + _TASK_RE.pattern)
+
+
+class CommandResult(NamedTuple):
+    """Output of one triage command."""
+    output: str
+    error: str
+    elapsed: float
+    cached: bool
+
+
+def parse_taint(text: str) -> Optional[dict]:
+    """Get the taint mask and flags from ``sys -t`` output."""
+    match = _TAINT_RE.search(text)
+    if not match:
+        return None
+    return {"mask": match.group(1), "flags": match.group(2) or ""}
+
+
+def parse_memory(text: str) -> Dict[str, dict]:
+    """Get the rows of ``kmem -i`` output keyed by lower-case label."""
+    return {row.label.lower().replace(" ", "_"): {"pages": row.pages, "size": row.size, "percent": row.percent}
+            for row in parse_kmem_info(text)}
+
+
+def parse_hung_tasks(text: str) -> List[dict]:
+    """Get uninterruptible tasks from ``ps -m`` output, longest blocked first."""
+    tasks = []
+    for line in text.splitlines():
+        match = _PS_M_RE.match(line)
+        if match and match.group(3) == "UN":
+            days, clock = int(match.group(1)), match.group(2)
+            hours, minutes, seconds = clock.split(":")
+            tasks.append({
+                "pid": int(match.group(4)),
+                "command": match.group(7),
+                "cpu": int(match.group(6)),
+                "blocked": f"{days} {clock}",
+                "blocked_seconds": days * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+            })
+    tasks.sort(key=lambda task: -task["blocked_seconds"])
+    return tasks
+
+
+def build_report(results: Dict[str, CommandResult]) -> dict:
+    """Merge the triage command outputs into a report."""
+    def output(command: str) -> str:
+        result = results.get(command)
+        return result.output if result and not result.error else ""
+
+    sys_fields = parse_sys(output("sys"))
+    traces = parse_bt(output("bt"))
+    trace = traces[0] if traces else None
+    modules = [module.name for module in parse_mod(output("mod"))]
+    hung = parse_hung_tasks(output("ps -m"))
+    return {
+        "panic": sys_fields.get("PANIC", "").strip('"') or None,
+        "release": sys_fields.get("RELEASE"),
+        "uptime": sys_fields.get("UPTIME"),
+        "task": ({"pid": trace.pid, "task": trace.task, "cpu": trace.cpu, "command": trace.command}
+                 if trace and trace.pid is not None else None),
+        "backtrace": [frame.to_dict() for frame in trace.frames] if trace else [],
+        "exception_rip": trace.exception_rip if trace else None,
+        "taint": parse_taint(output("sys -t")),
+        "modules": {"count": len(modules), "names": modules},
+        "memory": parse_memory(output("kmem -i")),
+        "hung_tasks": {"count": len(hung), "tasks": hung[:MAX_HUNG_TASKS]}
+    }
+
+
+class TriageEngine:
+    """Runs the triage commands of a dump across several crash processes.
+
+    Commands are independent, so each worker starts its own session on the
+    dump (through the session manager, so the pool bounds still apply) and
+    takes the heaviest remaining command from a shared queue until none
+    are left. Results already in the result cache are used without
+    starting a worker, and a worker that finds the queue empty does not
+    start its session at all. Afterwards one worker's session is parked
+    as a spare (unless ``keep_session`` is False) and the others are closed.
+    """
+
+    def __init__(self, manager: CrashSessionManager, workers: int = 3, command_timeout: int = 120,
+                 keep_session: bool = True, commands: Sequence[str] = TRIAGE_COMMANDS):
+        self.manager = manager
+        self.commands = list(commands)
+        self.workers = max(1, workers)
+        self.command_timeout = command_timeout
+        self.keep_session = keep_session
+
+    def run(self, crash_dump, kernel_file, start_timeout: int = 180) -> dict:
+        """Triage a dump and return the report."""
+        started = time.monotonic()
+        results: Dict[str, CommandResult] = {}
+        pending = queue.Queue()
+        for command in self.commands:
+            cached = self._get_cached(crash_dump, kernel_file, command)
+            if cached is not None:
+                results[command] = CommandResult(cached, "", 0.0, True)
+            else:
+                pending.put(command)
+
+        # Never queue behind interactive sessions for more than one worker
+        workers = min(self.workers, pending.qsize(), max(1, self.manager.idle_slots()))
+        prefix = f"triage-{uuid.uuid4().hex[:8]}"
+        clients = [f"{prefix}-{index}" for index in range(workers)]
+        lock = threading.Lock()
+        failures = []
+
+        def work(client_id: str):
+            if pending.empty():
+                return
+            try:
+                started = self.manager.start_session(crash_dump, kernel_file, start_timeout, client_id,
+                                                     spare=False, private=True)
+            except SessionAdmissionError as e:
+                logger.warning(f"Triage worker {client_id} not admitted: {e}")
+                started = False
+            if not started:
+                failures.append(client_id)
+                return
+            while True:
+                try:
+                    command = pending.get_nowait()
+                except queue.Empty:
+                    return
+                result = self._run_command(command, client_id)
+                with lock:
+                    results[command] = result
+
+        try:
+            if workers:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crash-triage") as pool:
+                    list(pool.map(work, clients))
+        finally:
+            parked = not self.keep_session
+            for client_id in clients:
+                if not parked and self.manager.get_session(client_id):
+                    parked = self.manager.park_session(client_id)
+                else:
+                    self.manager.close_session(client_id)
+
+        unstarted = not pending.empty()
+        while not pending.empty():
+            command = pending.get_nowait()
+            results[command] = CommandResult("", "No crash session could be started", 0.0, False)
+
+        report = build_report(results)
+        if unstarted:
+            report["error"] = "No crash session could be started"
+        report["dump"] = str(crash_dump.path)
+        report["kernel"] = str(kernel_file.path)
+        report["commands"] = {
+            command: dict({"elapsed_ms": round(result.elapsed * 1000), "cached": result.cached},
+                          **({"error": result.error} if result.error else {}))
+            for command, result in results.items()
+        }
+        report["workers"] = workers - len(failures)
+        report["elapsed_ms"] = round((time.monotonic() - started) * 1000)
+        return report
+
+    def _get_cached(self, crash_dump, kernel_file, command: str) -> Optional[str]:
+        """Get a command's cached output for a fresh session on the dump."""
+        cache = self.manager.result_cache
+        if not cache:
+            return None
+        key = cache.make_key(str(crash_dump.path), str(kernel_file.path), command)
+        return cache.get(key) if key else None
+
+    def _run_command(self, command: str, client_id: str) -> CommandResult:
+        """Run one triage command in a worker's session."""
+        started = time.monotonic()
+        output, error, _ = self.manager.run_command(command, self.command_timeout, client_id)
+        try:
+            return CommandResult("" if error else output.text(), error, time.monotonic() - started, False)
+        finally:
+            output.close()
@@ -0,0 +1,315 @@
+"""Crash dump and kernel image header parsing."""
+
+import logging
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+ELF_MAGIC = b"\x7fELF"
+KDUMP_SIGNATURES = (b"KDUMP   ", b"DISKDUMP")
+
+PT_LOAD = 1
+PT_NOTE = 4
+SHT_NOTE = 7
+NT_GNU_BUILD_ID = 3
+
+# new_utsname: six fields of 65 bytes following the signature and header_version
+UTS_FIELD_LEN = 65
+UTS_OFFSET = 12
+UTS_FIELDS = ("sysname", "nodename", "release", "version", "machine", "domainname")
+
+# ELF e_machine values of the architectures kdump supports
+ELF_MACHINES = {3: "i386", 8: "mips", 20: "ppc", 21: "ppc64", 22: "s390x", 40: "arm", 62: "x86_64",
+                183: "aarch64", 243: "riscv64"}
+
+# disk_dump_header fields after the utsname: timestamp, status and block_size
+KDUMP_TIMESTAMP_OFFSET = 408
+KDUMP_STATUS_OFFSET = 424
+KDUMP_BLOCK_SIZE_OFFSET = 428
+
+# kdump_sub_header fields: dump_level, and the VMCOREINFO offset and size
+SUB_DUMP_LEVEL_OFFSET = 8
+SUB_VMCOREINFO_OFFSET = 32
+
+# makedumpfile compression flags, set in disk_dump_header.status and in
+# each page_desc_t (0x8 is the INCOMPLETE status bit, not a codec)
+KDUMP_COMPRESSION_FLAGS = ((0x1, "zlib"), (0x2, "lzo"), (0x4, "snappy"), (0x20, "zstd"))
+
+
+class DumpHeader(NamedTuple):
+    """Metadata read from a crash dump header."""
+    format: str
+    release: Optional[str]
+    build_id: Optional[str]
+    vmcoreinfo: Dict[str, str]
+    page_size: Optional[int] = None
+    dump_level: Optional[int] = None
+    compression: Optional[str] = None
+    timestamp_ms: Optional[int] = None
+    machine: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert the header summary to a dictionary, without the full VMCOREINFO."""
+        return {
+            "format": self.format,
+            "machine": self.machine,
+            "release": self.release,
+            "build_id": self.build_id,
+            "page_size": self.page_size,
+            "dump_level": self.dump_level,
+            "compression": self.compression,
+            "timestamp_ms": self.timestamp_ms
+        }
+
+
+class ElfImage:
+    """Read-only view of the ELF structures of a memory-mapped file.
+
+    Only the pages holding the headers, notes and sections that are
+    actually accessed are faulted in, so this is cheap even on multi-GB
+    vmcores.
+    """
+
+    def __init__(self, data: Union[mmap.mmap, bytes]):
+        self.data = data
+        if data[:4] != ELF_MAGIC:
+            raise ValueError("not an ELF file")
+
+        ei_class, ei_data = data[4], data[5]
+        if ei_class not in (1, 2) or ei_data not in (1, 2):
+            raise ValueError("unsupported ELF class or byte order")
+        self.is64 = ei_class == 2
+        self.endian = "<" if ei_data == 1 else ">"
+
+        if self.is64:
+            (self.e_type, self.e_machine, _, _, self.e_phoff, self.e_shoff, _, _,
+             self.e_phentsize, self.e_phnum, self.e_shentsize, self.e_shnum,
+             self.e_shstrndx) = struct.unpack_from(self.endian + "HHIQQQIHHHHHH", data, 16)
+        else:
+            (self.e_type, self.e_machine, _, _, self.e_phoff, self.e_shoff, _, _,
+             self.e_phentsize, self.e_phnum, self.e_shentsize, self.e_shnum,
+             self.e_shstrndx) = struct.unpack_from(self.endian + "HHIIIIIHHHHHH", data, 16)
+
+    def program_headers(self) -> List[Tuple[int, int, int, int, int, int]]:
+        """Get (type, offset, vaddr, paddr, filesz, memsz) for each program header."""
+        headers = []
+        for i in range(self.e_phnum):
+            offset = self.e_phoff + i * self.e_phentsize
+            if self.is64:
+                p_type, _, p_offset, p_vaddr, p_paddr, p_filesz, p_memsz, _ = struct.unpack_from(
+                    self.endian + "IIQQQQQQ", self.data, offset)
+            else:
+                p_type, p_offset, p_vaddr, p_paddr, p_filesz, p_memsz, _, _ = struct.unpack_from(
+                    self.endian + "IIIIIIII", self.data, offset)
+            headers.append((p_type, p_offset, p_vaddr, p_paddr, p_filesz, p_memsz))
+        return headers
+
+    def section_headers(self) -> List[Tuple[str, int, int, int]]:
+        """Get (name, type, offset, size) for each section header."""
+        raw = []
+        for i in range(self.e_shnum):
+            offset = self.e_shoff + i * self.e_shentsize
+            if self.is64:
+                sh_name, sh_type, _, _, sh_offset, sh_size = struct.unpack_from(
+                    self.endian + "IIQQQQ", self.data, offset)
+            else:
+                sh_name, sh_type, _, _, sh_offset, sh_size = struct.unpack_from(
+                    self.endian + "IIIIII", self.data, offset)
+            raw.append((sh_name, sh_type, sh_offset, sh_size))
+
+        if not raw or self.e_shstrndx >= len(raw):
+            return []
+
+        strtab_offset = raw[self.e_shstrndx][2]
+        sections = []
+        for sh_name, sh_type, sh_offset, sh_size in raw:
+            start = strtab_offset + sh_name
+            end = self.data.find(b"\0", start)
+            name = bytes(self.data[start:end]).decode("ascii", errors="replace")
+            sections.append((name, sh_type, sh_offset, sh_size))
+        return sections
+
+    def notes(self, offset: int, size: int) -> Iterator[Tuple[str, int, bytes]]:
+        """Iterate over (name, type, desc) of the notes in a note segment or section."""
+        end = min(offset + size, len(self.data))
+        while offset + 12 <= end:
+            namesz, descsz, n_type = struct.unpack_from(self.endian + "III", self.data, offset)
+            offset += 12
+            name = bytes(self.data[offset:offset + namesz]).rstrip(b"\0").decode("ascii", errors="replace")
+            offset += (namesz + 3) & ~3
+            desc = bytes(self.data[offset:offset + descsz])
+            offset += (descsz + 3) & ~3
+            yield name, n_type, desc
+
+
+def parse_vmcoreinfo(data: bytes) -> Dict[str, str]:
+    """Parse VMCOREINFO ``KEY=value`` lines."""
+    info = {}
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            info[key.strip()] = value.strip()
+    return info
+
+
+def _map_file(path: Union[str, Path]) -> mmap.mmap:
+    """Memory-map a file read-only."""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _read_elf_dump(data: mmap.mmap) -> DumpHeader:
+    """Read the VMCOREINFO note of an ELF vmcore."""
+    elf = ElfImage(data)
+    vmcoreinfo = {}
+    for p_type, p_offset, _, _, p_filesz, _ in elf.program_headers():
+        if p_type != PT_NOTE:
+            continue
+        for name, _, desc in elf.notes(p_offset, p_filesz):
+            if name == "VMCOREINFO":
+                vmcoreinfo = parse_vmcoreinfo(desc)
+                break
+
+    crash_time = _int_field(vmcoreinfo, "CRASHTIME")
+    return DumpHeader(
+        format="elf",
+        release=vmcoreinfo.get("OSRELEASE"),
+        build_id=_normalize_build_id(vmcoreinfo.get("BUILD-ID")),
+        vmcoreinfo=vmcoreinfo,
+        page_size=_int_field(vmcoreinfo, "PAGESIZE"),
+        # ELF dumps are never page-compressed, but the ELF headers do not
+        # record whether makedumpfile -E filtered pages out
+        dump_level=None,
+        compression="none",
+        timestamp_ms=crash_time * 1000 if crash_time is not None else None,
+        machine=ELF_MACHINES.get(elf.e_machine)
+    )
+
+
+def _read_kdump_dump(data: mmap.mmap) -> DumpHeader:
+    """Read the disk_dump_header and VMCOREINFO of a kdump-compressed dump."""
+    endian = "<"
+    header_version, = struct.unpack_from(endian + "i", data, 8)
+    if not 0 < header_version < 64:
+        endian = ">"
+        header_version, = struct.unpack_from(endian + "i", data, 8)
+
+    release = _uts_field(data, "release")
+
+    # struct timeval (two longs) is 8-byte aligned after the utsname,
+    # followed by status and block_size
+    seconds, microseconds = struct.unpack_from(endian + "qq", data, KDUMP_TIMESTAMP_OFFSET)
+    status, block_size = struct.unpack_from(endian + "Ii", data, KDUMP_STATUS_OFFSET)
+
+    vmcoreinfo = {}
+    dump_level = None
+    if 0 < block_size <= len(data):
+        # kdump_sub_header starts at the second block: phys_base, dump_level,
+        # split, start_pfn, end_pfn, then offset_vmcoreinfo and size_vmcoreinfo
+        dump_level, = struct.unpack_from(endian + "i", data, block_size + SUB_DUMP_LEVEL_OFFSET)
+        if header_version >= 3:
+            offset, size = struct.unpack_from(endian + "qQ", data, block_size + SUB_VMCOREINFO_OFFSET)
+            if 0 < offset and 0 < size < 1024 * 1024 and offset + size <= len(data):
+                vmcoreinfo = parse_vmcoreinfo(bytes(data[offset:offset + size]))
+
+    compression = next((name for flag, name in KDUMP_COMPRESSION_FLAGS if status & flag), "none")
+    return DumpHeader(
+        format="kdump",
+        release=vmcoreinfo.get("OSRELEASE") or release,
+        build_id=_normalize_build_id(vmcoreinfo.get("BUILD-ID")),
+        vmcoreinfo=vmcoreinfo,
+        page_size=block_size if block_size > 0 else _int_field(vmcoreinfo, "PAGESIZE"),
+        dump_level=dump_level,
+        compression=compression,
+        timestamp_ms=seconds * 1000 + microseconds // 1000 if seconds > 0 else None,
+        machine=_uts_field(data, "machine")
+    )
+
+
+def _uts_field(data: mmap.mmap, field: str) -> Optional[str]:
+    """Read one new_utsname field from a kdump-compressed header."""
+    start = UTS_OFFSET + UTS_FIELDS.index(field) * UTS_FIELD_LEN
+    value = bytes(data[start:start + UTS_FIELD_LEN]).split(b"\0", 1)[0]
+    return value.decode("utf-8", errors="replace") or None
+
+
+def _int_field(vmcoreinfo: Dict[str, str], key: str) -> Optional[int]:
+    """Get a decimal VMCOREINFO field, or None if missing or malformed."""
+    try:
+        return int(vmcoreinfo[key])
+    except (KeyError, ValueError):
+        return None
+
+
+def _normalize_build_id(build_id: Optional[str]) -> Optional[str]:
+    """Normalize a hex build-id string."""
+    if not build_id:
+        return None
+    return build_id.strip().lower() or None
+
+
+def read_dump_header(path: Union[str, Path]) -> Optional[DumpHeader]:
+    """Read release, build-id and dump metadata from an ELF or kdump-compressed crash dump.
+
+    Returns None when the file is not in a recognized format or cannot be read.
+    """
+    try:
+        data = _map_file(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cannot map crash dump {path}: {e}")
+        return None
+
+    try:
+        if data[:4] == ELF_MAGIC:
+            return _read_elf_dump(data)
+        if data[:8] in KDUMP_SIGNATURES:
+            return _read_kdump_dump(data)
+        return None
+    except (ValueError, struct.error, IndexError) as e:
+        logger.warning(f"Cannot parse crash dump header {path}: {e}")
+        return None
+    finally:
+        data.close()
+
+
+def read_elf_build_info(path: Union[str, Path]) -> Tuple[Optional[str], Optional[str]]:
+    """Read the GNU build-id and the first .comment string of an ELF image (vmlinux).
+
+    Only the ELF header, the section header table and the two sections
+    are touched.
+    """
+    try:
+        data = _map_file(path)
+    except (OSError, ValueError):
+        return None, None
+
+    try:
+        if data[:4] != ELF_MAGIC:
+            return None, None
+
+        build_id = None
+        comment = None
+        elf = ElfImage(data)
+        for name, sh_type, sh_offset, sh_size in elf.section_headers():
+            if name == ".note.gnu.build-id" and sh_type == SHT_NOTE:
+                for note_name, n_type, desc in elf.notes(sh_offset, sh_size):
+                    if note_name == "GNU" and n_type == NT_GNU_BUILD_ID:
+                        build_id = desc.hex()
+            elif name == ".comment":
+                raw = bytes(data[sh_offset:sh_offset + min(sh_size, 4096)])
+                comment = raw.split(b"\0", 1)[0].decode("utf-8", errors="replace") or None
+        return build_id, comment
+    except (ValueError, struct.error, IndexError) as e:
+        logger.warning(f"Cannot parse ELF image {path}: {e}")
+        return None, None
+    finally:
+        data.close()
+
+
+def read_elf_build_id(path: Union[str, Path]) -> Optional[str]:
+    """Read the GNU build-id of an ELF image (vmlinux) from its section headers."""
+    return read_elf_build_info(path)[0]
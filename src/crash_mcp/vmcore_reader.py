@@ -0,0 +1,517 @@
+"""Direct reads of kernel memory from crash dumps, without the crash utility."""
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from crash_mcp.vmcore_header import ElfImage, KDUMP_COMPRESSION_FLAGS, PT_LOAD, read_dump_header
+
+# Decompressors of the optional page compression formats
+try:
+    import lzo
+except ImportError:
+    lzo = None
+try:
+    import snappy
+except ImportError:
+    snappy = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the decoded page cache, readahead window and decoding threads
+CACHE_BYTES = 64 * 1024 * 1024
+READAHEAD_PAGES = 16
+READ_WORKERS = min(4, os.cpu_count() or 1)
+
+# Translated virtual pages kept per reader
+TRANSLATION_CACHE_SIZE = 4096
+
+# x86_64 kernel image mapping and page table entry bits
+START_KERNEL_MAP = 0xffffffff80000000
+PTE_PRESENT = 0x1
+PTE_LARGE = 0x80
+PTE_ADDR_MASK = 0x000ffffffffff000
+
+# kdump_sub_header fields: phys_base, and max_mapnr_64 from header version 6
+SUB_PHYS_BASE_OFFSET = 0
+SUB_MAX_MAPNR_64_OFFSET = 96
+
+# page_desc_t: offset, size, flags, page_flags
+PAGE_DESC = struct.Struct("qIIQ")
+
+# Decompressor of each page compression: (optional package, module)
+_DECOMPRESSORS = {
+    "zlib": (None, zlib),
+    "lzo": ("python-lzo", lzo),
+    "snappy": ("python-snappy", snappy),
+    "zstd": ("zstandard", zstandard),
+}
+
+# page_desc_t compression flags: (flag, name, optional package, module)
+PAGE_CODECS = tuple((flag, name) + _DECOMPRESSORS[name] for flag, name in KDUMP_COMPRESSION_FLAGS)
+
+# Bitmap bytes whose set bits are counted at once when locating page descriptors
+BITMAP_CHUNK = 4096
+
+
+class VmcoreError(Exception):
+    """Raised when a crash dump cannot be read or lacks the data asked for."""
+
+
+def _popcount(value: int) -> int:
+    """Count the set bits of an integer."""
+    return bin(value).count("1")
+
+
+def _decompress(name: str, raw: bytes, page_size: int) -> bytes:
+    """Decompress one page with the named codec."""
+    if name == "zlib":
+        return zlib.decompress(raw)
+    if name == "lzo":
+        return lzo.decompress(raw, False, page_size)
+    if name == "snappy":
+        return snappy.decompress(raw)
+    return zstandard.ZstdDecompressor().decompress(raw, max_output_size=page_size)
+
+
+def supported_compressions() -> List[str]:
+    """Get the page compression formats that can be decoded here."""
+    return [name for _, name, _, module in PAGE_CODECS if module is not None]
+
+
+class VmcoreReader:
+    """Reads kernel memory from an ELF or kdump-compressed crash dump.
+
+    Physical pages come from the PT_LOAD segments of an ELF vmcore or the
+    page descriptors of a kdump-compressed dump. Kernel virtual addresses
+    are translated through the kernel image mapping or a walk of the
+    kernel page tables (x86_64 only). Symbols, struct sizes and member
+    offsets come from VMCOREINFO, so no debuginfo is needed.
+
+    Decoded pages are kept in an LRU cache bounded by ``cache_bytes``.
+    Reads spanning several pages decode the missing ones in parallel on
+    ``workers`` threads (zlib, lzo and zstd release the GIL), and a miss
+    right after the previous one reads ``readahead`` further pages ahead in
+    the background. The reader is thread-safe.
+    """
+
+    def __init__(self, path: Union[str, Path], cache_bytes: int = CACHE_BYTES,
+                 readahead: int = READAHEAD_PAGES, workers: int = READ_WORKERS):
+        self.path = Path(path)
+        header = read_dump_header(path)
+        if header is None:
+            raise VmcoreError(f"{path} is not a readable ELF or kdump-compressed crash dump")
+        self.header = header
+        self.vmcoreinfo = header.vmcoreinfo
+        self.machine = header.machine
+        self.page_size = header.page_size or 4096
+        self.phys_base = 0
+        self.endian = "<"
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._cache_bytes = max(0, cache_bytes)
+        self._cached_bytes = 0
+        self._translations: Dict[int, int] = {}
+        self._readahead = max(0, readahead)
+        self._last_miss = -2
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vmcore-read") \
+            if workers > 1 else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+
+        try:
+            with open(path, "rb") as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise VmcoreError(f"Cannot map crash dump {path}: {e}")
+
+        try:
+            if header.format == "elf":
+                self._init_elf()
+            else:
+                self._init_kdump()
+        except (ValueError, struct.error, IndexError) as e:
+            self.close()
+            raise VmcoreError(f"Cannot parse crash dump {path}: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop readahead and unmap the dump."""
+        if self._pool:
+            self._pool.shutdown(wait=True)
+        self._data.close()
+
+    def _init_elf(self):
+        """Index the PT_LOAD segments of an ELF vmcore by physical address."""
+        elf = ElfImage(self._data)
+        self.endian = elf.endian
+        self._segments = sorted(
+            (paddr, offset, filesz, memsz, vaddr)
+            for p_type, offset, vaddr, paddr, filesz, memsz in elf.program_headers() if p_type == PT_LOAD
+        )
+        self._segment_starts = [segment[0] for segment in self._segments]
+
+        phys_base = self._number("phys_base")
+        if phys_base is None:
+            # The kernel text segment maps __START_KERNEL_map + offset to phys_base + offset
+            phys_base = next((paddr - (vaddr - START_KERNEL_MAP)
+                              for paddr, _, _, _, vaddr in self._segments if vaddr >= START_KERNEL_MAP), 0)
+        self.phys_base = phys_base
+
+    def _init_kdump(self):
+        """Locate the bitmaps and page descriptors of a kdump-compressed dump."""
+        data = self._data
+        header_version, = struct.unpack_from("<i", data, 8)
+        if not 0 < header_version < 64:
+            self.endian = ">"
+            header_version, = struct.unpack_from(">i", data, 8)
+
+        _, block_size, sub_hdr_size, bitmap_blocks, max_mapnr = struct.unpack_from(
+            self.endian + "IiiII", data, 424)
+        if block_size <= 0 or sub_hdr_size < 0:
+            raise ValueError("bad kdump block layout")
+        self.page_size = block_size
+        self.phys_base, = struct.unpack_from(self.endian + "q", data, block_size + SUB_PHYS_BASE_OFFSET)
+        if header_version >= 6:
+            max_mapnr, = struct.unpack_from(self.endian + "Q", data, block_size + SUB_MAX_MAPNR_64_OFFSET)
+
+        # The second half of the bitmap area marks the pages present in the dump
+        bitmap_size = bitmap_blocks * block_size // 2
+        self._max_pfn = min(max_mapnr, bitmap_size * 8)
+        self._bitmap_offset = (1 + sub_hdr_size) * block_size + bitmap_size
+        self._desc_offset = (1 + sub_hdr_size + bitmap_blocks) * block_size
+        self._chunk_counts = [0]
+
+    def _number(self, name: str) -> Optional[int]:
+        """Get a ``NUMBER(name)`` VMCOREINFO entry."""
+        try:
+            return int(self.vmcoreinfo[f"NUMBER({name})"])
+        except (KeyError, ValueError):
+            return None
+
+    def has_symbol(self, name: str) -> bool:
+        """Check whether VMCOREINFO has the address of a symbol."""
+        return f"SYMBOL({name})" in self.vmcoreinfo
+
+    def symbol(self, name: str) -> int:
+        """Get the address of a symbol from VMCOREINFO."""
+        return self._info_int(f"SYMBOL({name})", 16)
+
+    def offset(self, member: str) -> int:
+        """Get the offset of a ``struct.member`` from VMCOREINFO."""
+        return self._info_int(f"OFFSET({member})", 10)
+
+    def size(self, name: str) -> int:
+        """Get the size of a type from VMCOREINFO."""
+        return self._info_int(f"SIZE({name})", 10)
+
+    def _info_int(self, key: str, base: int) -> int:
+        """Get an integer VMCOREINFO entry, raising if it is missing."""
+        try:
+            return int(self.vmcoreinfo[key], base)
+        except KeyError:
+            raise VmcoreError(f"VMCOREINFO has no {key}")
+        except ValueError:
+            raise VmcoreError(f"VMCOREINFO has a malformed {key}")
+
+    def read_page(self, pfn: int) -> bytes:
+        """Get one physical page, decoded."""
+        return self.read_pages([pfn])[pfn]
+
+    def read_pages(self, pfns: Iterable[int]) -> Dict[int, bytes]:
+        """Get several physical pages, decoding the missing ones in parallel."""
+        pages = {}
+        missing = []
+        with self._lock:
+            for pfn in dict.fromkeys(pfns):
+                page = self._cache.get(pfn)
+                if page is None:
+                    missing.append(pfn)
+                else:
+                    self._cache.move_to_end(pfn)
+                    pages[pfn] = page
+            self.hits += len(pages)
+            self.misses += len(missing)
+            sequential = bool(missing) and missing[0] == self._last_miss + 1
+            if missing:
+                self._last_miss = missing[-1]
+
+        if len(missing) > 1 and self._pool:
+            decoded = zip(missing, self._pool.map(self._decode_page, missing))
+        else:
+            decoded = ((pfn, self._decode_page(pfn)) for pfn in missing)
+        for pfn, page in decoded:
+            pages[pfn] = page
+            self._store(pfn, page)
+
+        if sequential and self._readahead and self._pool:
+            ahead = range(missing[-1] + 1, missing[-1] + 1 + self._readahead)
+            self._pool.submit(self._prefetch, ahead)
+        return pages
+
+    def _prefetch(self, pfns: Iterable[int]):
+        """Decode pages ahead of a sequential reader, ignoring ones that cannot be read."""
+        for pfn in pfns:
+            with self._lock:
+                if pfn in self._cache:
+                    continue
+            try:
+                self._store(pfn, self._decode_page(pfn))
+            except (VmcoreError, ValueError):
+                return
+            with self._lock:
+                self.prefetched += 1
+
+    def _store(self, pfn: int, page: bytes):
+        """Add a page to the cache, evicting the least recently used beyond the budget."""
+        with self._lock:
+            if pfn in self._cache:
+                return
+            self._cache[pfn] = page
+            self._cached_bytes += len(page)
+            while self._cached_bytes > self._cache_bytes and self._cache:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+
+    def _decode_page(self, pfn: int) -> bytes:
+        """Read and decode one page from the dump file."""
+        if self.header.format == "elf":
+            return self._read_elf_page(pfn)
+        return self._read_kdump_page(pfn)
+
+    def _read_elf_page(self, pfn: int) -> bytes:
+        """Read a physical page from the PT_LOAD segment holding it."""
+        paddr = pfn * self.page_size
+        index = bisect.bisect_right(self._segment_starts, paddr) - 1
+        if index >= 0:
+            start, offset, filesz, memsz, _ = self._segments[index]
+            relative = paddr - start
+            if relative < memsz:
+                # Memory past the file size of a segment reads as zeros
+                available = max(0, min(self.page_size, filesz - relative))
+                page = bytes(self._data[offset + relative:offset + relative + available])
+                return page.ljust(self.page_size, b"\0")
+        raise VmcoreError(f"Physical address {paddr:#x} is not in the dump")
+
+    def _read_kdump_page(self, pfn: int) -> bytes:
+        """Read and decompress a physical page through its page descriptor."""
+        index = self._descriptor_index(pfn)
+        offset, size, flags, _ = struct.unpack_from(
+            self.endian + PAGE_DESC.format, self._data, self._desc_offset + index * PAGE_DESC.size)
+        raw = bytes(self._data[offset:offset + size])
+        page = raw if not flags else self._decompress(pfn, raw, flags)
+        if len(page) != self.page_size:
+            raise VmcoreError(f"Page {pfn:#x} decodes to {len(page)} bytes instead of {self.page_size}")
+        return page
+
+    def _decompress(self, pfn: int, raw: bytes, flags: int) -> bytes:
+        """Decompress a kdump page with the codec its flags name."""
+        for flag, name, package, module in PAGE_CODECS:
+            if not flags & flag:
+                continue
+            if module is None:
+                raise VmcoreError(f"Pages compressed with {name} need the {package} package")
+            try:
+                return _decompress(name, raw, self.page_size)
+            except Exception as e:
+                raise VmcoreError(f"Corrupt {name} page {pfn:#x}: {e}")
+        raise VmcoreError(f"Page {pfn:#x} has unknown compression flags {flags:#x}")
+
+    def _descriptor_index(self, pfn: int) -> int:
+        """Get the index of a page's descriptor: the dumped pages below it."""
+        if not 0 <= pfn < self._max_pfn:
+            raise VmcoreError(f"Page {pfn:#x} is beyond the end of the dump")
+        byte, bit = divmod(pfn, 8)
+        bitmap = self._data
+        value = bitmap[self._bitmap_offset + byte]
+        if not value >> bit & 1:
+            raise VmcoreError(f"Page {pfn:#x} was excluded from the dump")
+
+        chunk = byte // BITMAP_CHUNK
+        start = self._bitmap_offset + chunk * BITMAP_CHUNK
+        below = int.from_bytes(bitmap[start:self._bitmap_offset + byte], "little")
+        return self._chunk_count(chunk) + _popcount(below) + _popcount(value & ((1 << bit) - 1))
+
+    def _chunk_count(self, chunk: int) -> int:
+        """Get the dumped pages in the bitmap chunks before a chunk, counting them once."""
+        with self._lock:
+            counts = self._chunk_counts
+            while len(counts) <= chunk:
+                start = self._bitmap_offset + (len(counts) - 1) * BITMAP_CHUNK
+                counts.append(counts[-1] + _popcount(int.from_bytes(self._data[start:start + BITMAP_CHUNK], "little")))
+            return counts[chunk]
+
+    def read_physical(self, paddr: int, size: int) -> bytes:
+        """Read physical memory."""
+        spans = []
+        while size > 0:
+            pfn, offset = divmod(paddr, self.page_size)
+            chunk = min(size, self.page_size - offset)
+            spans.append((pfn, offset, chunk))
+            paddr += chunk
+            size -= chunk
+        return self._gather(spans)
+
+    def _gather(self, spans: List[Tuple[int, int, int]]) -> bytes:
+        """Join (pfn, offset, length) spans of pages, fetching the pages in one batch."""
+        pages = self.read_pages(pfn for pfn, _, _ in spans)
+        return b"".join(pages[pfn][offset:offset + length] for pfn, offset, length in spans)
+
+    def virt_to_phys(self, vaddr: int) -> int:
+        """Translate a kernel virtual address to a physical address."""
+        if self.machine != "x86_64":
+            raise VmcoreError(f"Address translation is not supported on {self.machine or 'this architecture'}")
+        if vaddr >= START_KERNEL_MAP:
+            return vaddr - START_KERNEL_MAP + self.phys_base
+
+        page = vaddr - vaddr % self.page_size
+        with self._lock:
+            base = self._translations.get(page)
+        if base is None:
+            base = self._walk_page_tables(page)
+            with self._lock:
+                if len(self._translations) >= TRANSLATION_CACHE_SIZE:
+                    self._translations.clear()
+                self._translations[page] = base
+        return base + vaddr % self.page_size
+
+    def _walk_page_tables(self, vaddr: int) -> int:
+        """Translate an address through the kernel page tables."""
+        name = "init_top_pgt" if self.has_symbol("init_top_pgt") else "init_level4_pgt"
+        table = self.symbol(name) - START_KERNEL_MAP + self.phys_base
+        shifts = (48, 39, 30, 21, 12) if self._number("pgtable_l5_enabled") == 1 else (39, 30, 21, 12)
+        for shift in shifts:
+            entry, = struct.unpack("<Q", self.read_physical(table + ((vaddr >> shift) & 0x1ff) * 8, 8))
+            if not entry & PTE_PRESENT:
+                raise VmcoreError(f"Virtual address {vaddr:#x} is not mapped")
+            table = entry & PTE_ADDR_MASK
+            if shift in (30, 21) and entry & PTE_LARGE:
+                mask = (1 << shift) - 1
+                return (table & ~mask) | (vaddr & mask)
+        return table | (vaddr & 0xfff)
+
+    def read(self, vaddr: int, size: int) -> bytes:
+        """Read kernel virtual memory."""
+        spans = []
+        while size > 0:
+            chunk = min(size, self.page_size - vaddr % self.page_size)
+            pfn, offset = divmod(self.virt_to_phys(vaddr), self.page_size)
+            spans.append((pfn, offset, chunk))
+            vaddr += chunk
+            size -= chunk
+        return self._gather(spans)
+
+    def read_u32(self, vaddr: int) -> int:
+        """Read a 32-bit unsigned integer."""
+        return struct.unpack(self.endian + "I", self.read(vaddr, 4))[0]
+
+    def read_u64(self, vaddr: int) -> int:
+        """Read a 64-bit unsigned integer (also a pointer or unsigned long)."""
+        return struct.unpack(self.endian + "Q", self.read(vaddr, 8))[0]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get page cache counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "prefetched": self.prefetched,
+                "cached_pages": len(self._cache),
+                "cached_bytes": self._cached_bytes
+            }
+
+
+class VmcoreReaderPool:
+    """Open VmcoreReaders kept across requests so their page caches are reused.
+
+    Readers are keyed by dump version (``CrashDump.identity``) and the
+    least recently used one is closed once more than ``max_readers`` are
+    open; a reader still in use when evicted is closed when released.
+    ``reader_options`` are passed to every VmcoreReader.
+    """
+
+    def __init__(self, max_readers: int = 2, **reader_options):
+        self.max_readers = max(1, max_readers)
+        self.reader_options = reader_options
+        self._readers: "OrderedDict[str, VmcoreReader]" = OrderedDict()
+        self._users: Dict[int, int] = {}
+        self._retired: List[VmcoreReader] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def reader(self, key: str, path: Union[str, Path]) -> Iterator[VmcoreReader]:
+        """Borrow the reader of a dump version, opening it if needed."""
+        with self._lock:
+            reader = self._readers.get(key)
+            if reader is not None:
+                self._readers.move_to_end(key)
+                self._users[id(reader)] += 1
+        if reader is None:
+            reader = VmcoreReader(path, **self.reader_options)
+            with self._lock:
+                existing = self._readers.get(key)
+                if existing is not None:
+                    # Opened concurrently by another request
+                    self._users[id(existing)] += 1
+                    extra, reader = reader, existing
+                else:
+                    extra = None
+                    self._readers[key] = reader
+                    self._users[id(reader)] = 1
+                    while len(self._readers) > self.max_readers:
+                        _, evicted = self._readers.popitem(last=False)
+                        self._retired.append(evicted)
+            if extra is not None:
+                extra.close()
+        try:
+            yield reader
+        finally:
+            self._release(reader)
+
+    def _release(self, reader: VmcoreReader):
+        """Return a borrowed reader and close the retired ones nobody uses."""
+        closing = []
+        with self._lock:
+            self._users[id(reader)] -= 1
+            for retired in list(self._retired):
+                if not self._users[id(retired)]:
+                    self._retired.remove(retired)
+                    del self._users[id(retired)]
+                    closing.append(retired)
+        for retired in closing:
+            retired.close()
+
+    def get_stats(self) -> dict:
+        """Get the open readers and their page cache counters."""
+        with self._lock:
+            return {key: reader.get_stats() for key, reader in self._readers.items()}
+
+    def close(self):
+        """Close every reader."""
+        with self._lock:
+            readers = list(self._readers.values()) + self._retired
+            self._readers.clear()
+            self._retired.clear()
+            self._users.clear()
+        for reader in readers:
+            reader.close()
@@ -0,0 +1,36 @@
+"""
+Shared fixtures for the crash tests
+"""
+
+import os
+import sys
+
+import pexpect
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp import crash_session
+from crash_mcp.crash_session import CrashSession
+
+FAKE_CRASH = os.path.join(os.path.dirname(__file__), "fake_crash.py")
+
+
+@pytest.fixture
+def fake_crash(monkeypatch):
+    """Spawn fake_crash.py instead of crash."""
+    real_spawn = pexpect.spawn
+
+    def spawn(cmd, **kwargs):
+        return real_spawn(cmd.replace("crash", f"{sys.executable} {FAKE_CRASH}", 1), **kwargs)
+
+    monkeypatch.setattr(crash_session.pexpect, "spawn", spawn)
+
+
+@pytest.fixture
+def session(fake_crash):
+    """A started CrashSession running fake_crash.py."""
+    session = CrashSession("/var/crash/vmcore", "/usr/lib/debug/vmlinux")
+    assert session.start(timeout=30)
+    yield session
+    session.close()
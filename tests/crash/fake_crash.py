@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the crash utility used by the session tests.
+
+Prints a banner and a ``crash> `` prompt (or fails to start when the dump
+path ends in ``mismatch``; a dump path ending in ``noisy`` adds banner text
+that looks like a prompt), then answers a few commands:
+``sys``, ``sys -t``, ``bt``, ``mod``, ``kmem -i``, ``ps``, ``ps -m``, ``runq``, ``lines N`` (N numbered lines), ``log`` (text that looks like
+prompts and errors), ``sleep S``, ``die`` (exits without a prompt),
+``echo ...``, ``!cmd`` (shell escape, failing as if crash could not fork
+when FAKE_CRASH_NO_FORK is set), ``set ...`` and ``quit``. Anything else
+is reported as ``crash: command not found``. With FAKE_CRASH_ECHO_INPUT
+set, each input line is echoed after the prompt.
+"""
+
+import os
+import sys
+import time
+
+
+def main():
+    print("crash 8.0.4 (fake)")
+    print("")
+    if sys.argv[-1].endswith("mismatch"):
+        print("crash: vmlinux and " + sys.argv[-1] + " do not match!")
+        sys.exit(1)
+    if sys.argv[-1].endswith("noisy"):
+        # Banner text that looks like a prompt
+        sys.stdout.write("please wait... crash> ")
+        sys.stdout.flush()
+        time.sleep(0.2)
+        print("done")
+    print("      KERNEL: " + (sys.argv[-2] if len(sys.argv) > 2 else "vmlinux"))
+    print("    DUMPFILE: " + (sys.argv[-1] if len(sys.argv) > 1 else "vmcore"))
+    print("")
+    while True:
+        sys.stdout.write("crash> ")
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            return
+        if os.getenv("FAKE_CRASH_ECHO_INPUT"):
+            sys.stdout.write(line)
+        words = line.split()
+        if not words:
+            continue
+        verb = words[0]
+        if verb in ("quit", "exit", "q"):
+            return
+        elif verb == "die":
+            sys.stdout.flush()
+            os._exit(1)
+        elif verb == "echo":
+            print(line.strip()[len("echo"):].strip())
+        elif verb.startswith("!") and os.getenv("FAKE_CRASH_NO_FORK"):
+            print("crash: fork: Cannot allocate memory")
+        elif verb.startswith("!"):
+            sys.stdout.flush()
+            os.system(line.strip()[1:])
+        elif verb == "sys" and words[1:] == ["-t"]:
+            print("TAINTED_MASK: 1001  PO")
+        elif verb == "sys":
+            print("      KERNEL: vmlinux")
+            print("     RELEASE: 5.14.0-1.el9.x86_64")
+            print("      UPTIME: 2 days, 03:04:05")
+            print("       PANIC: \"Kernel panic - not syncing: sysrq triggered crash\"")
+        elif verb == "bt":
+            print("PID: 1234     TASK: ffff8881002a8000  CPU: 2    COMMAND: \"bash\"")
+            print(" #0 [ffffc90000a3bd58] machine_kexec at ffffffff8105c9fb")
+            print(" #1 [ffffc90000a3bdb0] __crash_kexec at ffffffff8113d3a2")
+            print(" #2 [ffffc90000a3be70] panic at ffffffff81a0b1e5")
+            print(" #3 [ffffc90000a3bef0] sysrq_handle_crash at ffffffff8159e1a1")
+        elif verb == "mod":
+            print("     MODULE       NAME      TEXT_BASE         SIZE  OBJECT FILE")
+            print("ffffffffc0602040  xfs     ffffffffc0550000  2019328  (not loaded)  [CONFIG_KALLSYMS]")
+            print("ffffffffc06a5000  e1000e  ffffffffc0680000   315392  (not loaded)  [CONFIG_KALLSYMS]")
+        elif verb == "kmem":
+            print("                 PAGES        TOTAL      PERCENTAGE")
+            print("    TOTAL MEM  4046179      15.4 GB         ----")
+            print("         FREE    61238     239.2 MB    1% of TOTAL MEM")
+            print("         USED  3984941      15.2 GB   98% of TOTAL MEM")
+        elif verb == "ps" and "-m" not in words:
+            print("   PID    PPID  CPU       TASK        ST  %MEM     VSZ    RSS  COMM")
+            print(">     0      0   0  ffffffff81a13480  RU   0.0       0      0  [swapper/0]")
+            print("      1      0   1  ffff88003e2c8000  IN   0.1  193860   4436  systemd")
+            print("   1234      1   2  ffff8881002a8000  RU   0.0   25904   3512  bash")
+        elif verb == "runq":
+            print("CPU 0 RUNQUEUE: ffff88003fc16cc0")
+            print("  CURRENT: PID: 0      TASK: ffffffff81a13480  COMMAND: \"swapper/0\"")
+            print("  CFS RB_ROOT: ffff88003fc16d68")
+            print("     [120] PID: 1234   TASK: ffff8881002a8000  COMMAND: \"bash\"")
+        elif verb == "ps":
+            print("[0 00:00:00.002] [RU]  PID: 1234     TASK: ffff8881002a8000  CPU: 2    COMMAND: \"bash\"")
+            print("[0 00:02:10.500] [UN]  PID: 812      TASK: ffff888100bc0000  CPU: 0    COMMAND: \"kworker/0:1\"")
+            print("[1 02:00:00.000] [UN]  PID: 77       TASK: ffff888100bd0000  CPU: 1    COMMAND: \"jbd2/sda1-8\"")
+        elif verb == "lines":
+            for index in range(int(words[1])):
+                print(f"line {index} " + "x" * 60)
+        elif verb == "log":
+            print("[    0.000000] Linux version 5.14.0")
+            print("[   10.000000] crash: something a driver logged")
+            print("[   11.000000] crash> looks like a prompt")
+            print("[   12.000000] sysrq: Trigger a crash")
+        elif verb == "sleep":
+            time.sleep(float(words[1]))
+            print("slept")
+        elif verb == "set":
+            pass
+        else:
+            print(f"crash: command not found: {verb}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk triage with resumable results (uses fake_crash.py, no crash utility required)
+"""
+
+import json
+import os
+import sys
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp import bulk_triage
+from crash_mcp.bulk_triage import BulkTriage, default_pool_size, open_results
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSessionManager
+from crash_mcp.kernel_detection import KernelFile
+from crash_mcp.signatures import SignatureIndex
+
+
+class StubDetection:
+    def __init__(self, kernel):
+        self.kernel = kernel
+
+    def find_matching_kernel(self, dump):
+        return self.kernel
+
+
+def make_dumps(tmp_path, names):
+    dumps = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(b"dump")
+        dumps.append(CrashDump(name, path, 4, datetime(2026, 1, 1)))
+    return dumps
+
+
+@pytest.mark.parametrize("output", ["results.jsonl", "results.db"])
+def test_bulk_triage_resumes(fake_crash, tmp_path, output):
+    kernel = KernelFile("vmlinux", tmp_path / "vmlinux", "5.14.0", 6)
+    dumps = make_dumps(tmp_path, ["vmcore-a", "vmcore-b", "vmcore-mismatch"])
+    manager = CrashSessionManager(max_sessions=2)
+    results = open_results(str(tmp_path / output))
+    try:
+        stats = BulkTriage(manager, StubDetection(kernel), results, workers=2,
+                           command_timeout=20, start_timeout=30).run(dumps)
+        assert (stats["total"], stats["skipped"], stats["triaged"], stats["failed"]) == (3, 0, 2, 1)
+        assert not manager.sessions and not manager.spares
+        assert len(results.completed()) == 2
+
+        # Only the failed dump is retried
+        stats = BulkTriage(manager, StubDetection(kernel), results, workers=2,
+                           command_timeout=20, start_timeout=30).run(dumps)
+        assert (stats["skipped"], stats["triaged"], stats["failed"]) == (2, 0, 1)
+    finally:
+        manager.close_all_sessions()
+        results.close()
+
+
+def test_jsonl_records_and_truncated_line(fake_crash, tmp_path):
+    kernel = KernelFile("vmlinux", tmp_path / "vmlinux", "5.14.0", 6)
+    dumps = make_dumps(tmp_path, ["vmcore-a"])
+    path = tmp_path / "results.jsonl"
+    path.write_text('{"key": "cut short')
+    results = open_results(str(path))
+    manager = CrashSessionManager()
+    signatures = SignatureIndex()
+    try:
+        BulkTriage(manager, StubDetection(kernel), results, command_timeout=20, start_timeout=30,
+                   signatures=signatures).run(dumps)
+    finally:
+        manager.close_all_sessions()
+        results.close()
+
+    record = json.loads(path.read_text().splitlines()[-1])
+    assert record["status"] == "ok" and record["dump"] == str(dumps[0].path)
+    assert record["report"]["panic"] == "Kernel panic - not syncing: sysrq triggered crash"
+    assert signatures.get(dumps[0]).hash == record["signature"]
+
+
+def test_pool_size_fits_cpus_and_memory(monkeypatch):
+    memory = namedtuple("memory", "available")
+    monkeypatch.setattr(bulk_triage.os, "cpu_count", lambda: 16)
+    monkeypatch.setattr(bulk_triage.psutil, "virtual_memory", lambda: memory(6 * 1024 ** 3))
+    assert default_pool_size(2048) == 3
+    monkeypatch.setattr(bulk_triage.psutil, "virtual_memory", lambda: memory(0))
+    assert default_pool_size(2048) == 1
+    assert default_pool_size(0) == 16
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent dump/kernel catalog (no crash utility required)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.catalog import FileCatalog, match_patterns
+from crash_mcp.crash_discovery import CrashDumpDiscovery
+
+MATCH = match_patterns(["vmcore*"])
+
+
+def make_tree(root):
+    for host in ("127.0.0.1-2025-09-19-15:54:12", "10.0.0.2-2025-09-20-08:00:00"):
+        (root / host).mkdir(parents=True)
+        (root / host / "vmcore").write_bytes(b"x" * 100)
+        (root / host / "vmcore-dmesg.txt").write_text("log")
+        (root / host / "kexec-dmesg.log").write_text("log")
+        age(root / host)
+    age(root)
+
+
+def age(path, seconds=3600):
+    """Backdate a directory so its mtime counts as settled."""
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def count_scandir(monkeypatch):
+    calls = []
+    real = os.scandir
+
+    def scandir(path):
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    return calls
+
+
+def test_unchanged_tree_is_not_relisted(tmp_path, monkeypatch):
+    make_tree(tmp_path)
+    catalog = FileCatalog()
+    assert len(catalog.scan(tmp_path, MATCH)) == 4
+
+    calls = count_scandir(monkeypatch)
+    assert len(catalog.scan(tmp_path, MATCH)) == 4
+    assert calls == []
+
+
+def test_new_and_removed_dumps_are_noticed(tmp_path):
+    make_tree(tmp_path)
+    catalog = FileCatalog()
+    catalog.scan(tmp_path, MATCH)
+
+    new_dir = tmp_path / "10.0.0.3-2025-09-21-09:00:00"
+    new_dir.mkdir()
+    (new_dir / "vmcore").write_bytes(b"y")
+    (tmp_path / "127.0.0.1-2025-09-19-15:54:12" / "vmcore").unlink()
+
+    paths = {entry.path.relative_to(tmp_path).as_posix() for entry in catalog.scan(tmp_path, MATCH)}
+    assert "10.0.0.3-2025-09-21-09:00:00/vmcore" in paths
+    assert "127.0.0.1-2025-09-19-15:54:12/vmcore" not in paths
+
+
+def test_growing_dump_size_is_refreshed(tmp_path):
+    make_tree(tmp_path)
+    catalog = FileCatalog()
+    catalog.scan(tmp_path, MATCH)
+
+    dump = tmp_path / "10.0.0.2-2025-09-20-08:00:00" / "vmcore"
+    with open(dump, "ab") as f:
+        f.write(b"z" * 50)
+
+    sizes = {entry.path: entry.size for entry in catalog.scan(tmp_path, MATCH)}
+    assert sizes[dump] == 150
+
+
+def test_catalog_persists_across_instances(tmp_path, monkeypatch):
+    dumps = tmp_path / "crash"
+    make_tree(dumps)
+    db = str(tmp_path / "catalog.db")
+    FileCatalog(db, namespace="dumps").scan(dumps, MATCH)
+
+    calls = count_scandir(monkeypatch)
+    assert len(FileCatalog(db, namespace="dumps").scan(dumps, MATCH)) == 4
+    assert calls == []
+
+
+def test_discovery_respects_depth_limit(tmp_path):
+    deep = tmp_path / "a" / "b" / "c" / "d"
+    deep.mkdir(parents=True)
+    (deep / "vmcore").write_bytes(b"x")
+    (deep.parent / "vmcore").write_bytes(b"x")
+
+    dumps = CrashDumpDiscovery(str(tmp_path)).find_crash_dumps()
+    assert [dump.path for dump in dumps] == [deep.parent / "vmcore"]
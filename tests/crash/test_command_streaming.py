@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental command output reading and paging (uses fake_crash.py, no crash utility required)
+"""
+
+import mmap
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp import crash_session
+from crash_mcp.crash_session import CrashSession
+from crash_mcp.result_store import CommandOutput
+
+
+def test_command_output_drops_echo_and_prompt(session):
+    assert session.execute_command("sys", timeout=10) == (
+        "KERNEL: vmlinux\n"
+        "     RELEASE: 5.14.0-1.el9.x86_64\n"
+        "      UPTIME: 2 days, 03:04:05\n"
+        "       PANIC: \"Kernel panic - not syncing: sysrq triggered crash\"",
+        "", 0
+    )
+    assert session.execute_command("set scroll off", timeout=10) == ("", "", 0)
+
+
+def test_framing_uses_no_shell_and_skips_echoed_input(fake_crash, monkeypatch):
+    monkeypatch.setenv("FAKE_CRASH_NO_FORK", "1")
+    monkeypatch.setenv("FAKE_CRASH_ECHO_INPUT", "1")
+    session = CrashSession("/var/crash/vmcore", "/usr/lib/debug/vmlinux")
+    try:
+        assert session.start(timeout=30)
+        assert session.execute_command("bt", timeout=10)[0].startswith("PID: 1234")
+        results = session.run_batch(["lines 2", "set scope 1", "lines 1"], timeout=10)
+        assert [result.output.read_page(0)[0] for result in results] == [
+            f"line 0 {'x' * 60}\nline 1 {'x' * 60}\n", "", f"line 0 {'x' * 60}\n"
+        ]
+        for result in results:
+            result.output.close()
+    finally:
+        session.close()
+
+
+def test_command_round_trip_is_not_throttled(session):
+    started = time.monotonic()
+    for _ in range(20):
+        assert session.execute_command("bt", timeout=10)[2] == 0
+    # Each command and its marker used to wait out pexpect's 50 ms send delay
+    assert (time.monotonic() - started) / 20 < 0.02
+
+
+def test_large_output_is_streamed_with_progress(session, monkeypatch):
+    monkeypatch.setattr(crash_session, "PROGRESS_INTERVAL", 0)
+    progress = []
+
+    output, error, code = session.run_command("lines 50000", timeout=30,
+                                              on_progress=lambda size, lines: progress.append((size, lines)))
+    try:
+        assert (error, code) == ("", 0)
+        assert output.lines == 50000
+        assert output.size > 3 * 1024 * 1024
+        # Spilled out of memory and mapped once sealed
+        output.seal()
+        assert isinstance(output._view, mmap.mmap)
+        assert progress and progress == sorted(progress)
+        first, next_offset = output.read_page(0, max_lines=2)
+        assert first == f"line 0 {'x' * 60}\nline 1 {'x' * 60}\n"
+        assert next_offset == len(first)
+    finally:
+        output.close()
+
+
+def test_unknown_command_is_an_error(session):
+    output, error, code = session.execute_command("bogus", timeout=10)
+    assert code == 1
+    assert error == "Crash error: crash: command not found: bogus"
+
+
+def test_timeout_does_not_desynchronize_session(session):
+    assert session.execute_command("sleep 2", timeout=1)[1] == "Command 'sleep 2' timed out after 1 seconds"
+    # The late output of the abandoned command is skipped
+    assert session.execute_command("lines 1", timeout=10) == (f"line 0 {'x' * 60}", "", 0)
+
+
+def test_prompt_and_error_text_in_output(session):
+    output, error, code = session.execute_command("log", timeout=10)
+    assert (error, code) == ("", 0)
+    assert output.splitlines()[-2:] == ["[   11.000000] crash> looks like a prompt",
+                                        "[   12.000000] sysrq: Trigger a crash"]
+
+
+def test_startup_failure_is_reported(fake_crash, caplog):
+    session = CrashSession("/var/crash/mismatch", "/usr/lib/debug/vmlinux")
+    assert not session.start(timeout=30)
+    assert "crash: vmlinux and /var/crash/mismatch do not match!" in caplog.text
+    assert session.process is None
+
+
+def test_prompt_like_banner_text(fake_crash):
+    session = CrashSession("/var/crash/noisy", "/usr/lib/debug/vmlinux")
+    try:
+        assert session.start(timeout=30)
+        assert session.execute_command("lines 1", timeout=10) == (f"line 0 {'x' * 60}", "", 0)
+    finally:
+        session.close()
+
+
+def test_process_death(session):
+    output, error, code = session.execute_command("die", timeout=10)
+    assert (error, code) == ("Crash process terminated unexpectedly", 1)
+    assert not session.is_active()
+
+
+def test_read_page_limits_bytes_and_lines():
+    output = CommandOutput.from_text("".join(f"row {index}\n" for index in range(100)))
+
+    text, next_offset = output.read_page(0, max_bytes=20)
+    assert text == "row 0\nrow 1\nrow 2\n"
+    text, next_offset = output.read_page(next_offset, max_lines=2)
+    assert text == "row 3\nrow 4\n"
+    text, next_offset = output.read_page(next_offset)
+    assert text.endswith("row 99\n") and next_offset is None
+
+
+def test_crlf_split_across_writes_is_normalized():
+    output = CommandOutput()
+    for chunk in (b"\r\n  first\r", b"\nsecond\r", b"\n"):
+        output.write(chunk)
+    output.finish()
+    assert output.text() == "first\nsecond"
+    assert output.lines == 2
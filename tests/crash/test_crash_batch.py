@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for batched crash command execution (uses fake_crash.py, no crash utility required)
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSessionManager
+from crash_mcp.kernel_detection import KernelFile
+from crash_mcp.result_cache import ResultCache
+
+
+def texts(results):
+    return [(result.command, result.output.text(), result.return_code) for result in results]
+
+
+def test_batch_splits_output_per_command(session):
+    results = session.run_batch(["sys", "set scroll off", "lines 3", "bogus", "log"], timeout=20)
+
+    assert texts(results) == [
+        ("sys", "KERNEL: vmlinux\n     RELEASE: 5.14.0-1.el9.x86_64\n"
+                "      UPTIME: 2 days, 03:04:05\n"
+                "       PANIC: \"Kernel panic - not syncing: sysrq triggered crash\"", 0),
+        ("set scroll off", "", 0),
+        ("lines 3", "\n".join(f"line {index} {'x' * 60}" for index in range(3)), 0),
+        ("bogus", "crash: command not found: bogus", 1),
+        ("log", "[    0.000000] Linux version 5.14.0\n[   10.000000] crash: something a driver logged\n"
+                "[   11.000000] crash> looks like a prompt\n[   12.000000] sysrq: Trigger a crash", 0),
+    ]
+    assert results[3].error == "Crash error: crash: command not found: bogus"
+    assert all(result.elapsed >= 0 for result in results)
+    assert session.state_commands == ["set scroll off"]
+
+    # The channel is clean for the next command
+    assert session.execute_command("sys", timeout=10)[0].startswith("KERNEL: vmlinux")
+
+
+def test_batch_larger_than_pipeline_window(session):
+    commands = [f"lines {index % 3}" for index in range(200)]
+    results = session.run_batch(commands, timeout=60)
+    assert [len(result.output.text().splitlines()) for result in results] == [index % 3 for index in range(200)]
+
+
+def best_time(func, runs=3):
+    elapsed = []
+    for _ in range(runs):
+        started = time.monotonic()
+        func()
+        elapsed.append(time.monotonic() - started)
+    return min(elapsed)
+
+
+def test_batch_is_faster_than_sequential_commands(session):
+    def batch():
+        for result in session.run_batch(["bt"] * 20, timeout=20):
+            result.output.close()
+
+    sequential = best_time(lambda: [session.execute_command("bt", timeout=10) for _ in range(20)])
+    pipelined = best_time(batch)
+    # A 50 ms delay before each send would make the batch take a second
+    assert pipelined < 0.25
+    assert pipelined < sequential
+
+
+def test_batch_skips_output_abandoned_by_timeout(session):
+    results = session.run_batch(["sleep 2", "sys"], timeout=1)
+    assert [result.return_code for result in results] == [1, 1]
+    assert "timed out" in results[0].error
+
+    results = session.run_batch(["lines 1"], timeout=10)
+    assert texts(results) == [("lines 1", f"line 0 {'x' * 60}", 0)]
+
+
+def test_manager_batch_serves_cached_results(fake_crash, tmp_path):
+    dump_file = tmp_path / "vmcore"
+    kernel_file = tmp_path / "vmlinux"
+    dump_file.write_bytes(b"dump")
+    kernel_file.write_bytes(b"kernel")
+    manager = CrashSessionManager(result_cache=ResultCache())
+    assert manager.start_session(CrashDump("vmcore", dump_file, 4, None),
+                                 KernelFile("vmlinux", kernel_file, "5.14.0", 6), timeout=30)
+    try:
+        first = manager.run_batch(["sys", "log"])
+        second = manager.run_batch(["sys", "set scroll off", "log"])
+
+        assert [result.cached for result in first] == [False, False]
+        assert [result.cached for result in second] == [True, False, False]
+        assert texts(second)[0] == texts(first)[0]
+    finally:
+        manager.close_all_sessions()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the live crash dump index (no crash utility required)
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.crash_discovery import CrashDumpDiscovery
+from crash_mcp.dump_watcher import DumpWatcher
+
+
+def write_dump(path, age=3600):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * 64)
+    old = time.time() - age
+    os.utime(path, (old, old))
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watched(request, tmp_path):
+    write_dump(tmp_path / "127.0.0.1-2025-09-19-15:54:12" / "vmcore")
+    discovery = CrashDumpDiscovery(str(tmp_path))
+    landed = []
+    event = threading.Event()
+
+    def on_new_dump(dump):
+        landed.append(dump)
+        event.set()
+
+    watcher = DumpWatcher(discovery, on_new_dump, poll_interval=0.2, settle_seconds=0.5,
+                          use_inotify=request.param)
+    watcher.start()
+    yield tmp_path, discovery, watcher, landed, event
+    watcher.stop()
+
+
+def test_initial_index_serves_latest_dump(watched):
+    tmp_path, discovery, watcher, landed, _ = watched
+
+    latest = discovery.get_latest_crash_dump()
+    assert latest.path == tmp_path / "127.0.0.1-2025-09-19-15:54:12" / "vmcore"
+    assert landed == []
+
+
+def test_new_dump_is_indexed_after_it_settles(watched):
+    tmp_path, discovery, watcher, landed, event = watched
+    new_dump = tmp_path / "10.0.0.2-2025-09-20-08:00:00" / "vmcore"
+    new_dump.parent.mkdir()
+    new_dump.write_bytes(b"partial")
+
+    time.sleep(0.3)
+    assert discovery.get_crash_dump_by_name("vmcore").path != new_dump
+
+    assert event.wait(5)
+    assert [dump.path for dump in landed] == [new_dump]
+    assert discovery.get_latest_crash_dump().path == new_dump
+
+
+def test_incomplete_dump_is_never_indexed(watched):
+    tmp_path, discovery, watcher, landed, event = watched
+    write_dump(tmp_path / "10.0.0.3-2025-09-21-09:00:00" / "vmcore-incomplete")
+
+    assert not event.wait(1)
+    assert all(not dump.name.endswith("-incomplete") for dump in discovery.find_crash_dumps())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for vmcore header parsing and dump-to-kernel matching (no crash utility required)
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from crash_mcp import crash_discovery
+from crash_mcp.crash_discovery import CrashDump, CrashDumpDiscovery
+from crash_mcp import kernel_index
+from crash_mcp.kernel_detection import KernelDetection
+from crash_mcp.kernel_index import KernelIndex
+from crash_mcp.vmcore_header import read_dump_header, read_elf_build_id, read_elf_build_info
+from vmcore_fixtures import make_elf_vmcore, make_kdump, make_vmlinux
+
+BUILD_A = "aa" * 20
+BUILD_B = "bb" * 20
+
+
+@pytest.fixture
+def detection(tmp_path):
+    debug = tmp_path / "debug"
+    for version, build_id in (("5.14.0-1.el9.x86_64", BUILD_A), ("5.14.0-2.el9.x86_64", BUILD_B)):
+        (debug / version).mkdir(parents=True)
+        make_vmlinux(debug / version / "vmlinux", build_id)
+    detection = KernelDetection(str(tmp_path / "boot"))
+    detection.debug_paths = [debug]
+    return detection
+
+
+def dump_at(path):
+    return CrashDump(path.name, path, path.stat().st_size, datetime.now())
+
+
+def test_elf_vmcore_header(tmp_path):
+    make_elf_vmcore(tmp_path / "vmcore", "5.14.0-2.el9.x86_64", BUILD_B.upper())
+    header = read_dump_header(tmp_path / "vmcore")
+
+    assert header.format == "elf"
+    assert header.release == "5.14.0-2.el9.x86_64"
+    assert header.build_id == BUILD_B
+    assert (header.page_size, header.dump_level, header.compression) == (4096, None, "none")
+    assert header.timestamp_ms is None
+
+    make_elf_vmcore(tmp_path / "vmcore", "5.14.0-2.el9.x86_64", extra={"CRASHTIME": "1700000000"})
+    assert read_dump_header(tmp_path / "vmcore").timestamp_ms == 1700000000000
+
+
+def test_kdump_compressed_header(tmp_path):
+    make_kdump(tmp_path / "vmcore", "5.14.0-1.el9.x86_64")
+    header = read_dump_header(tmp_path / "vmcore")
+
+    assert header.format == "kdump"
+    assert header.release == "5.14.0-1.el9.x86_64"
+    assert header.vmcoreinfo["PAGESIZE"] == "4096"
+    assert header.to_dict() == {
+        "format": "kdump", "machine": "x86_64", "release": "5.14.0-1.el9.x86_64", "build_id": None, "page_size": 4096,
+        "dump_level": 31, "compression": "none", "timestamp_ms": 1700000000250
+    }
+
+
+@pytest.mark.parametrize("status, compression", [
+    (0x1, "zlib"), (0x2, "lzo"), (0x4, "snappy"), (0x20, "zstd"), (0x8, "none"), (0x8 | 0x2, "lzo")
+])
+def test_kdump_compression_flags(tmp_path, status, compression):
+    make_kdump(tmp_path / "vmcore", "5.14.0-1.el9.x86_64", status=status)
+    assert read_dump_header(tmp_path / "vmcore").compression == compression
+
+
+def test_dump_info_caches_header(tmp_path, monkeypatch):
+    make_kdump(tmp_path / "vmcore", "5.14.0-1.el9.x86_64", status=0x1)
+    discovery = CrashDumpDiscovery(str(tmp_path))
+    dump = dump_at(tmp_path / "vmcore")
+    assert discovery.get_dump_info(dump)["header"]["compression"] == "zlib"
+
+    monkeypatch.setattr(crash_discovery, "read_dump_header", lambda path: pytest.fail("header read twice"))
+    assert discovery.get_dump_header(dump).release == "5.14.0-1.el9.x86_64"
+
+
+def test_vmlinux_build_id(tmp_path):
+    make_vmlinux(tmp_path / "vmlinux", BUILD_A)
+    assert read_elf_build_id(tmp_path / "vmlinux") == BUILD_A
+    assert read_elf_build_info(tmp_path / "vmlinux") == (BUILD_A, "GCC: (GNU) 11.4.1")
+
+
+def test_match_by_build_id(tmp_path, detection):
+    make_elf_vmcore(tmp_path / "vmcore", "5.14.0-1.el9.x86_64", BUILD_B)
+    kernel = detection.find_matching_kernel(dump_at(tmp_path / "vmcore"))
+    assert kernel.version == "5.14.0-2.el9.x86_64"
+
+
+def test_match_by_release(tmp_path, detection):
+    make_kdump(tmp_path / "vmcore", "5.14.0-2.el9.x86_64")
+    kernel = detection.find_matching_kernel(dump_at(tmp_path / "vmcore"))
+    assert kernel.version == "5.14.0-2.el9.x86_64"
+
+
+def test_no_match_returns_none(tmp_path, detection):
+    make_kdump(tmp_path / "vmcore", "6.1.0")
+    assert detection.find_matching_kernel(dump_at(tmp_path / "vmcore")) is None
+
+
+def test_unreadable_header_falls_back_to_first_kernel(tmp_path, detection):
+    (tmp_path / "vmcore").write_bytes(b"garbage" * 100)
+    kernel = detection.find_matching_kernel(dump_at(tmp_path / "vmcore"))
+    assert kernel.version == "5.14.0-1.el9.x86_64"
+
+
+def test_distinct_builds_of_one_version_are_kept(tmp_path):
+    debug = tmp_path / "debug"
+    for index, build_id in enumerate((BUILD_A, BUILD_B, BUILD_A)):
+        (debug / "5.14.0-1.el9.x86_64" / str(index)).mkdir(parents=True)
+        make_vmlinux(debug / "5.14.0-1.el9.x86_64" / str(index) / "vmlinux", build_id)
+    detection = KernelDetection(str(tmp_path / "boot"))
+    detection.debug_paths = [debug]
+
+    kernels = detection.find_kernel_files()
+    assert sorted(kernel.build_id for kernel in kernels) == [BUILD_A, BUILD_B]
+    assert all(kernel.version == "5.14.0-1.el9.x86_64" for kernel in kernels)
+
+
+def test_index_persists_and_reparses_changed_files(tmp_path, monkeypatch):
+    db = str(tmp_path / "catalog.db")
+    images = []
+    for index in range(6):
+        make_vmlinux(tmp_path / f"vmlinux-{index}", BUILD_A)
+        images.append(tmp_path / f"vmlinux-{index}")
+
+    def stats():
+        return [(path, path.stat().st_size, path.stat().st_mtime_ns) for path in images]
+
+    index = KernelIndex(db, workers=4)
+    assert {build.build_id for build in index.lookup(stats()).values()} == {BUILD_A}
+    index.close()
+
+    parsed = []
+    real_read = kernel_index.read_elf_build_info
+    monkeypatch.setattr(kernel_index, "read_elf_build_info", lambda path: parsed.append(path) or real_read(path))
+
+    make_vmlinux(images[0], BUILD_B, comment=b"GCC: (GNU) 12.2.0\0")
+    os.utime(images[0], ns=(0, 10**9))
+    index = KernelIndex(db, workers=4)
+    builds = index.lookup(stats())
+
+    assert parsed == [images[0]]
+    assert builds[str(images[0])].build_id == BUILD_B
+    assert builds[str(images[0])].compiler == "GCC: (GNU) 12.2.0"
+    assert builds[str(images[5])].build_id == BUILD_A
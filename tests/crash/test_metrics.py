@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for command metrics, latency histograms and Prometheus output (no crash utility required)
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp import metrics as metrics_module
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSessionManager
+from crash_mcp.kernel_detection import KernelFile
+from crash_mcp.metrics import (STATUS_ERROR, STATUS_OK, STATUS_TIMEOUT, LatencyHistogram, Metrics,
+                               command_status)
+from crash_mcp.result_cache import ResultCache
+
+
+def make_pair(tmp_path):
+    dump_file = tmp_path / "vmcore"
+    kernel_file = tmp_path / "vmlinux"
+    dump_file.write_bytes(b"dump")
+    kernel_file.write_bytes(b"kernel")
+    return (CrashDump("vmcore", dump_file, 4, None),
+            KernelFile("vmlinux", kernel_file, "5.14.0", 6))
+
+
+def test_histogram_percentiles_are_within_a_few_percent():
+    rng = random.Random(42)
+    durations = sorted(rng.lognormvariate(-3, 1.5) for _ in range(10000))
+    histogram = LatencyHistogram()
+    for duration in durations:
+        histogram.record(duration)
+
+    for fraction in (0.5, 0.9, 0.99, 0.999):
+        exact = durations[int(fraction * len(durations)) - 1]
+        assert abs(histogram.percentile(fraction) - exact) / exact < 0.05
+    assert histogram.percentile(1.0) == durations[-1]
+
+    summary = histogram.to_dict()
+    assert summary["count"] == 10000
+    assert set(summary) >= {"mean_ms", "min_ms", "max_ms", "p50_ms", "p99.9_ms"}
+    assert LatencyHistogram().to_dict() == {"count": 0}
+
+
+def test_commands_are_aggregated_by_verb(monkeypatch):
+    monkeypatch.setattr(metrics_module, "MAX_VERBS", 2)
+    metrics = Metrics()
+    metrics.record_command("bt -a", 0.5, 100, STATUS_OK)
+    metrics.record_command("bt 1234", 1.5, 50, STATUS_ERROR)
+    metrics.record_cache_hit("bt -a", 100)
+    metrics.record_command("log", 0.1, 10, STATUS_OK)
+    metrics.record_command("kmem -i", 0.1, 10, STATUS_TIMEOUT)
+    metrics.record_command("files", 0.1, 10, STATUS_OK)
+
+    commands = metrics.snapshot()["commands"]
+    assert set(commands) == {"bt", "log", "other"}
+    assert commands["bt"]["ok"] == 1 and commands["bt"]["error"] == 1
+    assert commands["bt"]["cache_hits"] == 1
+    assert commands["bt"]["output_bytes"] == 250
+    assert commands["bt"]["latency"]["count"] == 2
+    assert commands["other"]["timeout"] == 1 and commands["other"]["ok"] == 1
+
+    assert command_status("", 0) == STATUS_OK
+    assert command_status("Command timed out after 5 seconds", 1) == STATUS_TIMEOUT
+    assert command_status("Session died", 1) == STATUS_ERROR
+
+
+def test_prometheus_rendering():
+    metrics = Metrics()
+    metrics.record_command("bt", 0.25, 10, STATUS_OK)
+    metrics.record_session_start("cold", 2.0)
+    metrics.record_session_start("warm")
+    process = {"session_id": "abc", "role": "session", "dump_path": '/var/crash/"x"\\vmcore',
+               "rss_bytes": 4096, "cpu_seconds": 1.5, "commands": 3, "timeouts": 0}
+    # Entries of processes that vanished mid-scrape are partial
+    partial = [{"session_id": "gone", "role": "session"}, {"session_id": "def", "role": "spare",
+                                                           "dump_path": "/var/crash/vmcore", "rss_bytes": None}]
+    text = metrics.render_prometheus([process] + partial, {"sessions": 1, "spares": 0})
+
+    lines = text.splitlines()
+    assert "# TYPE crash_mcp_commands_total counter" in lines
+    assert 'crash_mcp_commands_total{verb="bt",status="ok"} 1' in lines
+    assert 'crash_mcp_command_duration_seconds{verb="bt",quantile="0.5"} 0.25' in lines
+    assert 'crash_mcp_command_duration_seconds_count{verb="bt"} 1' in lines
+    assert 'crash_mcp_session_starts_total{kind="warm",result="ok"} 1' in lines
+    # Only process startups have a latency
+    assert 'crash_mcp_session_start_duration_seconds_count{kind="cold"} 1' in lines
+    assert not any('kind="warm",quantile' in line for line in lines)
+    assert ('crash_mcp_process_rss_bytes{session_id="abc",role="session",'
+            'dump="/var/crash/\\"x\\"\\\\vmcore"} 4096') in lines
+    assert 'crash_mcp_pool{state="sessions"} 1' in lines
+    assert not any('"gone"' in line or 'session_id="def"' in line and "rss" in line for line in lines)
+
+
+def test_manager_records_commands_and_starts(fake_crash, tmp_path):
+    metrics = Metrics()
+    manager = CrashSessionManager(max_sessions=2, result_cache=ResultCache(), metrics=metrics)
+    try:
+        dump, kernel = make_pair(tmp_path)
+        assert manager.start_session(dump, kernel, timeout=30, spare=False)
+        assert manager.start_session(dump, kernel, timeout=30, spare=False)
+        for _ in range(2):
+            output, error, return_code = manager.run_command("sys")
+            output.close()
+            assert return_code == 0, error
+
+        snapshot = metrics.snapshot()
+        assert snapshot["commands"]["sys"]["ok"] == 1
+        assert snapshot["commands"]["sys"]["cache_hits"] == 1
+        assert snapshot["session_starts"]["cold"]["ok"] == 1
+        assert snapshot["session_starts"]["warm"]["ok"] == 1
+
+        process, = manager.get_process_stats()
+        assert process["role"] == "session" and process["commands"] == 1
+        assert process["output_bytes"] > 0 and process["timeouts"] == 0
+
+        # A session closed while the scrape lists the pool is skipped
+        manager.get_session().close()
+        assert manager.get_process_stats() == []
+    finally:
+        manager.close_all_sessions()
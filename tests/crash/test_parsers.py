@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for structured parsing of crash command output (uses fake_crash.py, no crash utility required)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSession, CrashSessionManager
+from crash_mcp.kernel_detection import KernelFile
+from crash_mcp.parsers import Frame, get_parser, parse_bt, parse_log, parse_output, parse_ps, parse_runq
+from crash_mcp.result_cache import ResultCache
+
+BT_ALL = """PID: 0      TASK: ffffffff81a13480  CPU: 0    COMMAND: "swapper/0"
+ #0 [ffff88003fc03e90] crash_nmi_callback at ffffffff8104d8a2
+ #1 [ffff88003fc03ea0] nmi_handle at ffffffff816d0d39 [kvm]
+
+PID: 1234   TASK: ffff8881002a8000  CPU: 2    COMMAND: "bash"
+ #0 [ffffc90000a3bd58] machine_kexec at ffffffff8105c9fb
+    [exception RIP: ext4_readdir+42]
+    RIP: ffffffff8125c1aa  RSP: ffffc90000a3be10  RFLAGS: 00010246
+ #1 [ffffc90000a3be70] panic at ffffffff81a0b1e5
+"""
+
+
+def test_bt_all_tasks_and_frames():
+    traces = parse_bt(BT_ALL)
+    assert [(trace.pid, trace.command, len(trace.frames)) for trace in traces] == [
+        (0, "swapper/0", 2), (1234, "bash", 2)]
+    assert traces[0].frames[1] == Frame(1, "ffff88003fc03ea0", "nmi_handle", "ffffffff816d0d39", "kvm")
+    assert traces[1].exception_rip == "ext4_readdir+42"
+    assert traces[1].to_dict()["frames"][0]["function"] == "machine_kexec"
+
+
+def test_ps_columns():
+    table = parse_ps(">     0      0   0  ffffffff81a13480  RU   0.0       0      0  [swapper/0]\n"
+                     "      1      0   -  ffff88003e2c8000  IN   0.1  193860   4436  systemd --switched-root\n"
+                     "   PID    PPID  CPU       TASK        ST  %MEM     VSZ    RSS  COMM\n")
+    assert len(table) == 2
+    assert list(table.pid) == [0, 1] and list(table.cpu) == [0, -1]
+    assert table.row(1)["comm"] == "systemd --switched-root"
+    columns = table.to_dict()["columns"]
+    assert columns["active"] == [True, False] and columns["rss"] == [0, 4436]
+
+
+def test_log_and_runq():
+    lines = parse_log("[    0.000000] Linux version 5.14.0\n<4>[   12.500000] sysrq: Trigger a crash\ncontinued\n")
+    assert [(line.timestamp, line.level, line.text) for line in lines] == [
+        (0.0, None, "Linux version 5.14.0"), (12.5, 4, "sysrq: Trigger a crash"), (None, None, "continued")]
+    line, = parse_log("[   12.500000] <4>sysrq: Trigger a crash\n")
+    assert (line.timestamp, line.level, line.text) == (12.5, 4, "sysrq: Trigger a crash")
+
+    queues = parse_runq('CPU 1 RUNQUEUE: ffff88003fd16cc0\n'
+                        '  CURRENT: PID: 7  TASK: ffff8800aa  COMMAND: "ksoftirqd/1"\n'
+                        '  RT PRIO_ARRAY: ffff88003fd16e40\n'
+                        '     [no tasks queued]\n')
+    assert queues[0].current.command == "ksoftirqd/1" and queues[0].queued == []
+
+
+def test_parser_selection():
+    assert get_parser("ps -k") is parse_ps
+    assert get_parser("ps -m") is None
+    assert get_parser("log | tail") is None
+    assert get_parser("kmem -s") is None
+    assert parse_output("foo", "") is None
+
+
+def test_structured_result_is_cached(fake_crash, tmp_path, monkeypatch):
+    dump_file = tmp_path / "vmcore"
+    kernel_file = tmp_path / "vmlinux"
+    dump_file.write_bytes(b"dump")
+    kernel_file.write_bytes(b"kernel")
+    cache = ResultCache()
+    manager = CrashSessionManager(result_cache=cache)
+    try:
+        assert manager.start_session(CrashDump("vmcore", dump_file, 4, None),
+                                     KernelFile("vmlinux", kernel_file, "5.14.0", 6))
+        parsed, error, code = manager.run_structured("ps")
+        assert (error, code) == ("", 0)
+        assert parsed["type"] == "ps" and parsed["data"]["columns"]["comm"][2] == "bash"
+
+        monkeypatch.setattr(CrashSession, "run_command", lambda *args: (_ for _ in ()).throw(AssertionError))
+        assert manager.run_structured("ps ") == (parsed, "", 0)
+        assert manager.run_structured("vm") == (None, "No structured parser for command 'vm'", 1)
+    finally:
+        manager.close_all_sessions()
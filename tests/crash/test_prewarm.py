@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for prewarming sessions of new dumps (uses fake_crash.py, no crash utility required)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp import prewarm
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSessionManager
+from crash_mcp.kernel_detection import KernelFile
+from crash_mcp.prewarm import Prewarmer
+from crash_mcp.result_cache import ResultCache
+
+
+class StubDetection:
+    def __init__(self, kernel):
+        self.kernel = kernel
+
+    def find_matching_kernel(self, dump):
+        return self.kernel
+
+
+def make_pair(tmp_path):
+    dump_file = tmp_path / "vmcore"
+    kernel_file = tmp_path / "vmlinux"
+    dump_file.write_bytes(b"dump")
+    kernel_file.write_bytes(b"kernel")
+    return (CrashDump("vmcore", dump_file, 4, None),
+            KernelFile("vmlinux", kernel_file, "5.14.0", 6))
+
+
+def test_prewarmed_session_serves_first_client(fake_crash, tmp_path):
+    dump, kernel = make_pair(tmp_path)
+    cache = ResultCache()
+    manager = CrashSessionManager(result_cache=cache)
+    prewarmer = Prewarmer(manager, StubDetection(kernel), commands=["sys", "log | tail", "set scroll off"],
+                          max_load=0, min_free_mb=0)
+    try:
+        assert prewarmer.commands == ["sys", "log | tail"]
+        assert prewarmer.prewarm(dump)
+        spare = manager.spares[(str(dump.path), str(kernel.path))][0]
+        assert not manager.bindings and not manager.sessions
+
+        assert manager.start_session(dump, kernel, client_id="alice")
+        assert manager.get_session("alice") is spare
+        hits = cache.get_stats()["hits"]
+        output, error, code = manager.execute_command("sys", client_id="alice")
+        assert (error, code) == ("", 0) and "RELEASE" in output
+        assert cache.get_stats()["hits"] == hits + 1
+        # Already open, so not started again
+        assert prewarmer.prewarm(dump)
+        assert len(manager.sessions) == 1 and not manager.spares
+    finally:
+        manager.close_all_sessions()
+
+
+def test_prewarm_budget_yields_to_interactive_use(monkeypatch):
+    manager = CrashSessionManager(max_sessions=1)
+    prewarmer = Prewarmer(manager, StubDetection(None), max_load=0.5, min_free_mb=1024)
+
+    monkeypatch.setattr(prewarm, "read_load_per_cpu", lambda: 0.1)
+    monkeypatch.setattr(prewarm, "read_mem_available", lambda: 4096 * 1024 * 1024)
+    assert prewarmer.check_budget() is None
+
+    monkeypatch.setattr(prewarm, "read_mem_available", lambda: 512 * 1024 * 1024)
+    assert prewarmer.check_budget() == "512 MB available, below 1024 MB"
+
+    monkeypatch.setattr(prewarm, "read_load_per_cpu", lambda: 0.9)
+    assert prewarmer.check_budget() == "load average 0.90 per CPU above 0.5"
+
+    manager._waiting = 1
+    assert prewarmer.check_budget() == "no idle crash process slot"
+
+
+def test_submit_dedupes_and_prefers_newest():
+    prewarmer = Prewarmer(CrashSessionManager(), StubDetection(None))
+    first = CrashDump("a", Path("/var/crash/a/vmcore"), 1, None)
+    second = CrashDump("b", Path("/var/crash/b/vmcore"), 1, None)
+    for dump in (first, second, first):
+        prewarmer.submit(dump)
+    assert prewarmer.get_pending_dumps() == [second, first]
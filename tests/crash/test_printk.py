@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for reading the kernel log straight from vmcores (no crash utility required)
+"""
+
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from crash_mcp.printk import format_log, read_dump_log
+from crash_mcp.vmcore_reader import START_KERNEL_MAP, VmcoreError, VmcoreReader, VmcoreReaderPool
+from vmcore_fixtures import make_elf_vmcore, make_kdump, printk_ring
+
+RELEASE = "6.1.0"
+MESSAGES = [(0, b"Linux version 6.1.0"), (1500000, b"Command line: ro"), (12500000000, b"sysrq: crash")]
+
+
+def test_lockless_log_from_elf_vmcore(tmp_path):
+    # A ring in the kernel image, with the first record wrapped to the start of the data ring
+    base = START_KERNEL_MAP + 0x1000000
+    image, info = printk_ring(base, MESSAGES, size_bits=7, first_lpos=112)
+    make_elf_vmcore(tmp_path / "vmcore", RELEASE, extra=info, loads=[(0x1000000, base, image)])
+
+    lines = read_dump_log(tmp_path / "vmcore")
+    assert [(line.timestamp, line.text) for line in lines] == [
+        (0.0, "Linux version 6.1.0"), (0.0015, "Command line: ro"), (12.5, "sysrq: crash")]
+    assert format_log(lines).splitlines()[2] == "[   12.500000] sysrq: crash"
+
+
+def test_pooled_reader_serves_repeated_reads_from_cache(tmp_path):
+    base = START_KERNEL_MAP + 0x1000000
+    image, info = printk_ring(base, MESSAGES, size_bits=7)
+    for name in ("vmcore1", "vmcore2"):
+        make_elf_vmcore(tmp_path / name, RELEASE, extra=info, loads=[(0x1000000, base, image)])
+    pool = VmcoreReaderPool(max_readers=1, readahead=0, workers=1)
+    try:
+        with pool.reader("vmcore1", tmp_path / "vmcore1") as reader:
+            first = read_dump_log(reader)
+            misses = reader.misses
+        with pool.reader("vmcore1", tmp_path / "vmcore1") as again:
+            assert again is reader
+            assert read_dump_log(again) == first
+            assert again.misses == misses and again.hits > 0
+
+        # The evicted reader is closed once its last user releases it
+        with pool.reader("vmcore1", tmp_path / "vmcore1") as held:
+            with pool.reader("vmcore2", tmp_path / "vmcore2"):
+                pass
+            assert read_dump_log(held) == first
+        assert list(pool.get_stats()) == ["vmcore2"]
+        assert held._data.closed
+    finally:
+        pool.close()
+
+
+def test_lockless_log_from_kdump_through_page_tables(tmp_path):
+    # The ring is in the direct map at physical 0x200000, reached through a 2 MB page
+    base = 0xffff888000200000
+    image, info = printk_ring(base, MESSAGES)
+    pml4, pdpt, pd = bytearray(4096), bytearray(4096), bytearray(4096)
+    struct.pack_into("<Q", pml4, ((base >> 39) & 0x1ff) * 8, 0x4000 | 0x1)
+    struct.pack_into("<Q", pdpt, ((base >> 30) & 0x1ff) * 8, 0x5000 | 0x1)
+    struct.pack_into("<Q", pd, ((base >> 21) & 0x1ff) * 8, 0x200000 | 0x81)
+    info["SYMBOL(init_top_pgt)"] = f"{START_KERNEL_MAP + 0x2000:x}"
+    make_kdump(tmp_path / "vmcore", RELEASE, extra=info, phys_base=0x1000,
+               pages={3: pml4, 4: pdpt, 5: pd, 512: image})
+
+    assert [line.text for line in read_dump_log(tmp_path / "vmcore")] == [text.decode() for _, text in MESSAGES]
+
+    with VmcoreReader(tmp_path / "vmcore") as reader:
+        with pytest.raises(VmcoreError, match="excluded"):
+            reader.read_physical(0x6000, 8)
+        with pytest.raises(VmcoreError, match="not mapped"):
+            reader.read(0xffff888100000000, 8)
+
+
+def test_structured_log_buffer(tmp_path):
+    base = START_KERNEL_MAP + 0x1000000
+    image = bytearray(0x100)
+    # log_buf pointer, log_buf_len, log_first_idx and log_next_idx
+    struct.pack_into("<QIII", image, 0, base + 0x40, 80, 32, 24)
+
+    def record(index, ts_nsec, text):
+        struct.pack_into("<QHH", image, 0x40 + index, ts_nsec, 24, len(text))
+        image[0x40 + index + 16:0x40 + index + 16 + len(text)] = text
+
+    # The oldest record, then a wrap marker and the newest record at the start
+    record(32, 1000000000, b"hello")
+    record(0, 2000000000, b"world")
+    info = {"SYMBOL(log_buf)": f"{base:x}", "SYMBOL(log_buf_len)": f"{base + 8:x}",
+            "SYMBOL(log_first_idx)": f"{base + 12:x}", "SYMBOL(log_next_idx)": f"{base + 16:x}",
+            "SIZE(printk_log)": "16", "OFFSET(printk_log.ts_nsec)": "0", "OFFSET(printk_log.len)": "8",
+            "OFFSET(printk_log.text_len)": "10"}
+    make_elf_vmcore(tmp_path / "vmcore", RELEASE, extra=info, loads=[(0x1000000, base, bytes(image))])
+
+    assert [(line.timestamp, line.text) for line in read_dump_log(tmp_path / "vmcore")] == [
+        (1.0, "hello"), (2.0, "world")]
+
+
+def test_missing_printk_symbols(tmp_path):
+    make_elf_vmcore(tmp_path / "vmcore", RELEASE)
+    with pytest.raises(VmcoreError, match="no supported printk buffer"):
+        read_dump_log(tmp_path / "vmcore")
+
+    (tmp_path / "garbage").write_bytes(b"\0" * 4096)
+    with pytest.raises(VmcoreError):
+        read_dump_log(tmp_path / "garbage")
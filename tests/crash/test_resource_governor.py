@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for crash process resource limits and memory pressure handling (no crash utility required)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSession, CrashSessionManager
+from crash_mcp.kernel_detection import KernelFile
+from crash_mcp.resource_governor import MODE_CGROUP, MODE_NONE, MODE_RLIMIT, ResourceGovernor
+
+
+def make_pair(index):
+    dump = CrashDump(f"vmcore{index}", Path(f"/var/crash/{index}/vmcore"), 1024, None)
+    kernel = KernelFile("vmlinux", Path("/usr/lib/debug/vmlinux"), "5.14.0", 1024)
+    return dump, kernel
+
+
+def fake_cgroup_root(path, controllers="cpuset cpu io memory pids"):
+    path.mkdir()
+    (path / "cgroup.controllers").write_text(controllers + "\n")
+    (path / "cgroup.subtree_control").write_text("")
+    return path
+
+
+def test_rlimit_fallback_caps_crash_memory(fake_crash):
+    governor = ResourceGovernor(memory_mb=512)
+    assert governor.mode == MODE_RLIMIT
+    session = CrashSession("/var/crash/vmcore", "/usr/lib/debug/vmlinux", governor=governor)
+    try:
+        assert session.start(timeout=30)
+        with open(f"/proc/{session.process.pid}/limits") as f:
+            limits = next(line for line in f if line.startswith("Max data size"))
+        assert limits.split()[3:5] == [str(512 * 1024 * 1024)] * 2
+
+        usage = session.get_resource_usage()
+        assert usage["mode"] == MODE_RLIMIT and usage["memory_limit_mb"] == 512
+        assert usage["rss_mb"] > 0
+    finally:
+        session.close()
+
+    assert ResourceGovernor().mode == MODE_NONE
+
+
+def test_cgroup_placement(fake_crash, tmp_path):
+    root = fake_cgroup_root(tmp_path / "crash-mcp")
+    governor = ResourceGovernor(memory_mb=256, cpu_percent=50, cgroup_root=root)
+    assert governor.mode == MODE_CGROUP
+
+    session = CrashSession("/var/crash/vmcore", "/usr/lib/debug/vmlinux", governor=governor)
+    try:
+        assert session.start(timeout=30)
+        cgroup = root / f"crash-{session.session_id}"
+        assert (cgroup / "memory.max").read_text() == str(256 * 1024 * 1024)
+        assert (cgroup / "cpu.max").read_text() == "50000 100000"
+        # The crash process joined its cgroup before exec
+        assert (cgroup / "cgroup.procs").read_text() == str(session.process.pid)
+
+        (cgroup / "memory.current").write_text("104857600\n")
+        (cgroup / "memory.events").write_text("low 0\nhigh 0\nmax 3\noom 1\noom_kill 1\n")
+        (cgroup / "cpu.stat").write_text("usage_usec 2500000\nuser_usec 2000000\n")
+        usage = session.get_resource_usage()
+        assert usage["cgroup"] == str(cgroup)
+        assert usage["memory_current_mb"] == 100.0 and usage["memory_peak_mb"] is None
+        assert usage["oom_kills"] == 1 and usage["cpu_seconds"] == 2.5
+    finally:
+        session.close()
+
+
+def test_cgroup_root_without_controller_falls_back(tmp_path):
+    root = fake_cgroup_root(tmp_path / "crash-mcp", controllers="cpu pids")
+    assert ResourceGovernor(memory_mb=256, cgroup_root=root).mode == MODE_RLIMIT
+    assert ResourceGovernor(memory_mb=256, cgroup_root=tmp_path / "missing").mode == MODE_RLIMIT
+
+
+@pytest.fixture
+def fake_start(monkeypatch):
+    """Make CrashSession.start succeed without spawning crash."""
+    def start(self, timeout=180):
+        self.active = True
+        return True
+
+    monkeypatch.setattr(CrashSession, "start", start)
+
+
+def test_memory_pressure_closes_idle_sessions(fake_start, monkeypatch):
+    governor = ResourceGovernor(min_available_mb=1024)
+    available = []
+    monkeypatch.setattr(governor, "available_memory", lambda: available.pop(0) if available else 1 << 40)
+    manager = CrashSessionManager(max_sessions=4, idle_timeout=0, governor=governor)
+    try:
+        assert manager.start_session(*make_pair(1), client_id="a", spare=False)
+        assert manager.start_session(*make_pair(2), client_id="b", spare=False)
+        assert manager.start_session(*make_pair(3), client_id="c", spare=False)
+        manager.release_client("b")
+        busy = manager.get_session("c")
+        assert busy._io_lock.acquire()
+
+        # Under pressure for three checks: the unbound session goes first,
+        # then the idle bound one; the busy session is kept
+        available.extend([0, 0, 0])
+        closed = manager.relieve_memory_pressure()
+        assert [manager.get_session("a"), manager.get_session("c")] == [None, busy]
+        assert len(closed) == 2 and list(manager.sessions.values()) == [busy]
+        busy._io_lock.release()
+
+        info = manager.get_session_info("c")
+        assert info["pool"]["governor"]["min_available_mb"] == 1024
+        assert info["resources"] is None
+    finally:
+        manager.close_all_sessions()
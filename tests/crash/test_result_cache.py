@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the crash command result cache (no crash utility required)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.result_cache import ResultCache
+
+
+@pytest.fixture
+def files(tmp_path):
+    dump = tmp_path / "vmcore"
+    dump.write_bytes(b"\x7fELF" + b"\0" * 4096)
+    kernel = tmp_path / "vmlinux"
+    kernel.write_bytes(b"\x7fELF" + b"\1" * 4096)
+    return str(dump), str(kernel)
+
+
+def test_key_normalizes_whitespace(files):
+    cache = ResultCache()
+    assert cache.make_key(*files, "bt  -a ") == cache.make_key(*files, "bt -a")
+
+
+def test_key_depends_on_session_state(files):
+    cache = ResultCache()
+    assert cache.make_key(*files, "bt") != cache.make_key(*files, "bt", ["set 1234"])
+
+
+def test_uncacheable_commands(files):
+    cache = ResultCache()
+    assert cache.make_key(*files, "set 1234") is None
+    assert cache.make_key(*files, "!ls") is None
+    assert cache.make_key(*files, "log > /tmp/log") is None
+    assert cache.make_key(*files, "bt >>/tmp/bt") is None
+    assert cache.make_key(*files, "sys") is not None
+
+
+def test_member_access_is_not_a_redirect(files):
+    cache = ResultCache()
+    assert cache.make_key(*files, "p init_task->comm") is not None
+    assert cache.make_key(*files, "struct task_struct.comm -o") is not None
+    assert cache.make_key(*files, "search -c \"a > b\"") is not None
+
+
+def test_memory_tier_is_byte_bounded(files):
+    cache = ResultCache(max_bytes=10)
+    cache.put("a", "12345")
+    cache.put("b", "12345")
+    assert cache.get("a") == "12345"
+    cache.put("c", "12345")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "12345"
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_disk_tier_survives_restart(files, tmp_path):
+    cache_dir = tmp_path / "cache"
+    key = ResultCache().make_key(*files, "sys")
+    ResultCache(cache_dir=str(cache_dir)).put(key, "RELEASE: 5.14.0")
+
+    restarted = ResultCache(cache_dir=str(cache_dir))
+    assert restarted.get(key) == "RELEASE: 5.14.0"
+    assert restarted.get_stats()["disk_hits"] == 1
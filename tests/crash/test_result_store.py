@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the paged result store (no crash utility required)
+"""
+
+import mmap
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.result_store import (
+    LINE_INDEX_STRIDE, CommandOutput, OutputClosedError, ResultStore, make_continuation, parse_continuation
+)
+
+
+@pytest.fixture
+def big_output():
+    """An output spilled to a temp file, spanning several line index blocks."""
+    output = CommandOutput(memory_limit=4096)
+    for index in range(3 * LINE_INDEX_STRIDE + 10):
+        tag = " PANIC" if index % 1000 == 999 else ""
+        output.write(f"line {index}{tag}\r\n".encode())
+    output.write(b"last")
+    output.finish()
+    output.seal()
+    yield output
+    output.close()
+
+
+def test_sealed_spill_is_memory_mapped(big_output):
+    assert isinstance(big_output._view, mmap.mmap)
+    assert big_output.line_count == 3 * LINE_INDEX_STRIDE + 11
+
+
+def test_read_line_ranges(big_output):
+    assert big_output.read_lines(1, 2) == [(1, "line 0"), (2, "line 1")]
+    start = 2 * LINE_INDEX_STRIDE + 5
+    assert big_output.read_lines(start, 1) == [(start, f"line {start - 1}")]
+    assert big_output.read_lines(10**6, 5) == []
+
+
+def test_tail(big_output):
+    total = big_output.line_count
+    assert big_output.tail(2) == [(total - 1, f"line {total - 2}"), (total, "last")]
+
+
+def test_grep_reports_line_numbers(big_output):
+    matches, more = big_output.grep(r"panic$", ignore_case=True)
+    assert matches == [(1000, "line 999 PANIC"), (2000, "line 1999 PANIC"), (3000, "line 2999 PANIC")]
+    assert not more
+
+    matches, more = big_output.grep(r"^line 1\d\d\d ", max_matches=1)
+    assert matches == [(2000, "line 1999 PANIC")]
+    assert not more
+    matches, more = big_output.grep(r"^line 1", max_matches=2)
+    assert len(matches) == 2 and more
+
+
+def test_in_memory_output_supports_the_same_queries():
+    output = CommandOutput.from_text("alpha\nbeta\ngamma\n")
+    output.seal()
+    assert isinstance(output._view, bytes)
+    assert output.tail(1) == [(3, "gamma")]
+    assert output.grep("b")[0] == [(2, "beta")]
+
+
+def test_store_evicts_least_recently_used_over_byte_budget():
+    store = ResultStore(max_bytes=10)
+    first = store.add(CommandOutput.from_text("one 1"), "sys")
+    second = store.add(CommandOutput.from_text("two 2"))
+    store.get(first)
+    third = store.add(CommandOutput.from_text("three"))
+
+    assert store.get(second) is None
+    assert store.lookup(first).command == "sys"
+    assert store.get_stats() == {"entries": 2, "bytes": 10, "max_bytes": 10, "evictions": 1}
+
+    # The newest output is kept even when it alone exceeds the budget
+    huge = store.add(CommandOutput.from_text("x" * 100))
+    assert store.get(huge) is not None
+    assert store.get(first) is None and store.get(third) is None
+
+
+def test_output_evicted_while_in_use_reports_closed(big_output):
+    store = ResultStore(max_bytes=big_output.size)
+    handle = store.add(big_output, "log")
+    # A reader looked the output up just before another request evicted it
+    output = store.get(handle)
+    store.add(CommandOutput.from_text("newer"))
+
+    assert store.get(handle) is None
+    for read in (lambda: output.read_page(0), lambda: output.read_lines(1, 10),
+                 lambda: output.grep("PANIC"), lambda: output.line_count):
+        with pytest.raises(OutputClosedError):
+            read()
+
+
+def test_store_hides_outputs_from_other_clients():
+    store = ResultStore()
+    handle = store.add(CommandOutput.from_text("secret"), "log", owner="analyst-a")
+
+    assert store.lookup(handle, "analyst-a").owner == "analyst-a"
+    assert store.lookup(handle, "analyst-b") is None
+    assert store.get(handle) is None
+    # Outputs stored without an owner stay readable by anyone
+    shared = store.add(CommandOutput.from_text("shared"))
+    assert store.get(shared, "analyst-b") is not None
+
+
+def test_continuation_tokens():
+    assert parse_continuation(make_continuation("abc", 42)) == ("abc", 42)
+    with pytest.raises(ValueError):
+        parse_continuation("nonsense")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Tests for the warm crash session pool (no crash utility required)
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSession, CrashSessionManager, SessionAdmissionError
+from crash_mcp.kernel_detection import KernelFile
+from crash_mcp.result_store import CommandOutput
+
+
+@pytest.fixture
+def fake_start(monkeypatch):
+    """Make CrashSession.start succeed without spawning crash."""
+    started = []
+
+    def start(self, timeout=180):
+        started.append(self.key)
+        self.active = True
+        return True
+
+    monkeypatch.setattr(CrashSession, "start", start)
+    return started
+
+
+def make_pair(index):
+    dump = CrashDump(f"vmcore{index}", Path(f"/var/crash/{index}/vmcore"), 1024, None)
+    kernel = KernelFile("vmlinux", Path("/usr/lib/debug/vmlinux"), "5.14.0", 1024)
+    return dump, kernel
+
+
+def test_switching_back_reuses_warm_session(fake_start):
+    manager = CrashSessionManager(max_sessions=4)
+
+    assert manager.start_session(*make_pair(1))
+    first = manager.active_session
+    assert manager.start_session(*make_pair(2))
+    assert manager.start_session(*make_pair(1))
+
+    assert manager.active_session is first
+    assert len(fake_start) == 2
+    assert len(manager.sessions) == 2
+
+
+def test_lru_eviction_respects_max_sessions(fake_start):
+    manager = CrashSessionManager(max_sessions=2)
+
+    for index in (1, 2, 1, 3):
+        assert manager.start_session(*make_pair(index))
+
+    keys = [key[0] for key in manager.sessions]
+    assert keys == ["/var/crash/1/vmcore", "/var/crash/3/vmcore"]
+
+
+def test_idle_sessions_are_reaped(fake_start):
+    manager = CrashSessionManager(max_sessions=4, idle_timeout=60)
+    manager.start_session(*make_pair(1))
+    manager.start_session(*make_pair(2))
+
+    stale = manager.sessions[("/var/crash/1/vmcore", "/usr/lib/debug/vmlinux", "default")]
+    stale.last_used -= 120
+
+    assert manager.reap_idle_sessions() == [stale.session_id]
+    assert len(manager.sessions) == 1
+    assert manager.is_session_active()
+
+
+def test_memory_cap_evicts_inactive_sessions(fake_start, monkeypatch):
+    monkeypatch.setattr(CrashSession, "get_rss", lambda self: 600 * 1024 * 1024)
+    manager = CrashSessionManager(max_sessions=4, max_rss_mb=1000)
+
+    manager.start_session(*make_pair(1))
+    manager.start_session(*make_pair(2))
+
+    assert list(manager.sessions) == [("/var/crash/2/vmcore", "/usr/lib/debug/vmlinux", "default")]
+    assert manager.active_session.dump_path == "/var/crash/2/vmcore"
+
+
+def test_close_all_sessions(fake_start):
+    manager = CrashSessionManager()
+    manager.start_session(*make_pair(1))
+    manager.start_session(*make_pair(2))
+
+    manager.close_all_sessions()
+
+    assert not manager.sessions
+    assert not manager.is_session_active()
+
+
+def test_concurrent_starts_share_one_process(fake_start):
+    manager = CrashSessionManager()
+    threads = [threading.Thread(target=manager.start_session, args=make_pair(1)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_start) == 1
+    assert len(manager.sessions) == 1
+    assert not manager._start_locks
+
+
+def test_sessions_are_closed_outside_the_pool_lock(fake_start, monkeypatch):
+    manager = CrashSessionManager(max_sessions=1)
+    closed = []
+
+    def close(self):
+        # Another thread can take the pool lock while crash is quitting
+        probe = threading.Thread(target=lambda: closed.append(manager._lock.acquire(timeout=1)
+                                                              and manager._lock.release() is None))
+        probe.start()
+        probe.join()
+        self.active = False
+
+    monkeypatch.setattr(CrashSession, "close", close)
+    manager.start_session(*make_pair(1))
+    manager.start_session(*make_pair(2))
+    manager.close_session()
+
+    assert closed == [True, True]
+
+
+def test_clients_get_separate_sessions(fake_start):
+    manager = CrashSessionManager()
+
+    manager.start_session(*make_pair(1), client_id="alice")
+    manager.start_session(*make_pair(1), client_id="bob")
+
+    assert manager.get_session("alice") is not manager.get_session("bob")
+    assert not manager.is_session_active()
+
+
+def test_shared_sessions_are_read_only(fake_start):
+    manager = CrashSessionManager(share_sessions=True)
+
+    manager.start_session(*make_pair(1), client_id="alice")
+    manager.start_session(*make_pair(1), client_id="bob")
+
+    assert manager.get_session("alice") is manager.get_session("bob")
+    assert len(fake_start) == 1
+
+    output, error, code = manager.execute_command("set 1234", client_id="alice")
+    assert code == 1 and "read-only" in error
+
+    manager.close_session("bob")
+    assert manager.is_session_active("alice")
+
+
+def test_released_client_session_stays_warm(fake_start):
+    manager = CrashSessionManager()
+    manager.start_session(*make_pair(1), client_id="alice")
+
+    manager.release_client("alice")
+    manager.start_session(*make_pair(1), client_id="alice")
+
+    assert len(fake_start) == 1
+
+
+def test_admission_times_out_when_all_slots_bound(fake_start):
+    manager = CrashSessionManager(max_sessions=1, queue_timeout=0)
+    manager.start_session(*make_pair(1), client_id="alice")
+
+    with pytest.raises(SessionAdmissionError):
+        manager.start_session(*make_pair(2), client_id="bob")
+
+
+def test_failed_start_keeps_previous_session(fake_start, monkeypatch):
+    manager = CrashSessionManager(max_sessions=2, queue_timeout=0, share_sessions=True)
+    manager.start_session(*make_pair(1), client_id="alice")
+    manager.start_session(*make_pair(1), client_id="carol")
+    manager.start_session(*make_pair(2), client_id="bob")
+    alice = manager.get_session("alice")
+
+    # Both slots stay bound to other clients, so nothing can be evicted
+    with pytest.raises(SessionAdmissionError):
+        manager.start_session(*make_pair(3), client_id="alice")
+    assert manager.get_session("alice") is alice
+
+    manager.release_client("bob")
+    monkeypatch.setattr(CrashSession, "start", lambda self, timeout=180: False)
+    assert not manager.start_session(*make_pair(3), client_id="alice")
+    assert manager.get_session("alice") is alice
+
+
+def test_admission_waits_for_a_freed_slot(fake_start):
+    manager = CrashSessionManager(max_sessions=1, queue_timeout=5)
+    manager.start_session(*make_pair(1), client_id="alice")
+
+    timer = threading.Timer(0.1, manager.release_client, args=("alice",))
+    timer.start()
+    assert manager.start_session(*make_pair(2), client_id="bob")
+    timer.join()
+
+    assert list(manager.bindings) == ["bob"]
+
+
+def test_result_cache_skips_repeated_commands(fake_start, monkeypatch, tmp_path):
+    from crash_mcp.result_cache import ResultCache
+
+    dump, kernel = make_pair(1)
+    dump_file = tmp_path / "vmcore"
+    kernel_file = tmp_path / "vmlinux"
+    dump_file.write_bytes(b"dump")
+    kernel_file.write_bytes(b"kernel")
+    dump = dump._replace(path=dump_file)
+    kernel = kernel._replace(path=kernel_file)
+
+    executed = []
+
+    def execute(self, command, timeout=120, on_progress=None):
+        executed.append(command)
+        return CommandOutput.from_text(f"output of {command}"), "", 0
+
+    monkeypatch.setattr(CrashSession, "_execute_command", execute)
+    cache = ResultCache()
+    manager = CrashSessionManager(result_cache=cache)
+    manager.start_session(dump, kernel)
+
+    assert manager.execute_command("sys") == ("output of sys", "", 0)
+    assert manager.execute_command("sys ") == ("output of sys", "", 0)
+    manager.execute_command("set 1234")
+    manager.execute_command("sys")
+
+    assert executed == ["sys", "set 1234", "sys"]
+    assert cache.get_stats()["hits"] == 1
+
+
+def wait_for_spares(manager):
+    deadline = time.monotonic() + 10
+    while manager._starting and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_spare_session_serves_next_open(fake_start):
+    manager = CrashSessionManager(max_sessions=4, spare_sessions=1)
+    assert manager.start_session(*make_pair(1), client_id="a")
+    wait_for_spares(manager)
+    spare = manager.spares[("/var/crash/1/vmcore", "/usr/lib/debug/vmlinux")][0]
+    assert manager.get_session_info("a")["pool"]["spares"] == 1
+
+    assert manager.start_session(*make_pair(1), client_id="b")
+    assert manager.get_session("b") is spare
+    assert spare.owner == "b"
+    # The spare is replaced in the background
+    wait_for_spares(manager)
+    assert len(fake_start) == 3
+    assert len(manager.spares[("/var/crash/1/vmcore", "/usr/lib/debug/vmlinux")]) == 1
+    manager.close_all_sessions()
+    assert not manager.spares
+
+
+def test_spares_are_evicted_first(fake_start):
+    manager = CrashSessionManager(max_sessions=2, spare_sessions=1)
+    manager.start_session(*make_pair(1))
+    wait_for_spares(manager)
+    assert manager.spares
+    manager.release_client("default")
+
+    assert manager.start_session(*make_pair(2))
+    assert not manager.spares
+    assert [key[0] for key in manager.sessions] == ["/var/crash/1/vmcore", "/var/crash/2/vmcore"]
+
+
+def test_sessions_run_the_configured_crash_binary(tmp_path):
+    fake_crash = os.path.join(os.path.dirname(__file__), "fake_crash.py")
+    manager = CrashSessionManager(max_sessions=2, spare_sessions=1, crash_binary=f"{sys.executable} {fake_crash}")
+    try:
+        assert manager.start_session(*make_pair(1), timeout=30)
+        output, error, return_code = manager.execute_command("sys")
+        assert return_code == 0, error
+        assert "RELEASE: 5.14.0-1.el9.x86_64" in output
+        wait_for_spares(manager)
+        spare, = manager.spares[("/var/crash/1/vmcore", "/usr/lib/debug/vmlinux")]
+        assert spare.crash_binary == manager.crash_binary and spare.is_active()
+    finally:
+        manager.close_all_sessions()
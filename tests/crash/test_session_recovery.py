@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for restarting crash sessions whose process died or hangs (no crash utility required)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSession, CrashSessionManager
+from crash_mcp.kernel_detection import KernelFile
+from crash_mcp.metrics import Metrics
+
+
+def make_pair(index):
+    dump = CrashDump(f"vmcore{index}", Path(f"/var/crash/{index}/vmcore"), 1024, None)
+    kernel = KernelFile("vmlinux", Path("/usr/lib/debug/vmlinux"), "5.14.0", 1024)
+    return dump, kernel
+
+
+def run(manager, command, client_id, timeout=30):
+    output, error, return_code = manager.run_command(command, timeout, client_id)
+    text = output.read_page(0)[0]
+    output.close()
+    return text, error, return_code
+
+
+def test_dead_session_is_restarted_with_its_state(fake_crash):
+    metrics = Metrics()
+    manager = CrashSessionManager(max_sessions=2, idle_timeout=0, recover_sessions=True, metrics=metrics)
+    try:
+        assert manager.start_session(*make_pair(1), timeout=30, client_id="a", spare=False)
+        assert run(manager, "set scope ffff8881002a8000", "a")[2] == 0
+        dead = manager.get_session("a")
+
+        _, error, return_code = run(manager, "die", "a")
+        assert return_code == 1 and error.endswith("the session is being restarted")
+
+        # The next command waits for the replacement on the same dump
+        text, _, return_code = run(manager, "sys", "a")
+        assert return_code == 0 and "KERNEL" in text
+        session = manager.get_session("a")
+        assert session is not dead and session.key == dead.key
+        assert session.state_commands == ["set scope ffff8881002a8000"]
+        assert list(manager.sessions.values()) == [session]
+
+        info = manager.get_session_info("a")
+        assert info["restarts"] == 1 and not info["recovering"]
+        assert metrics.snapshot()["session_starts"]["recovery"]["ok"] == 1
+    finally:
+        manager.close_all_sessions()
+
+
+def test_heartbeat_does_not_fork(fake_crash, monkeypatch):
+    # Shell escapes fail as they can under a tight cgroup or RLIMIT_DATA limit
+    monkeypatch.setenv("FAKE_CRASH_NO_FORK", "1")
+    manager = CrashSessionManager(max_sessions=2, idle_timeout=0, recover_sessions=True, heartbeat_timeout=5)
+    try:
+        assert manager.start_session(*make_pair(1), timeout=30, client_id="a", spare=False)
+        session = manager.get_session("a")
+        assert session.ping(5)
+        assert manager.check_sessions() == []
+        assert manager.get_session("a") is session and session.restarts == 0
+    finally:
+        manager.close_all_sessions()
+
+
+def test_heartbeat_replaces_hung_session(fake_crash):
+    manager = CrashSessionManager(max_sessions=2, idle_timeout=0, recover_sessions=True, heartbeat_timeout=1)
+    try:
+        assert manager.start_session(*make_pair(1), timeout=30, client_id="a", spare=False)
+        assert manager.start_session(*make_pair(2), timeout=30, client_id="b", spare=False)
+        hung = manager.get_session("a")
+        healthy = manager.get_session("b")
+
+        assert run(manager, "sleep 30", "a", timeout=1)[2] == 1
+        assert manager.check_sessions() == [hung.session_id]
+        assert manager.wait_for_recovery("a")
+        assert manager.get_session("a") is not hung and manager.get_session("b") is healthy
+        assert run(manager, "sys", "a")[2] == 0
+    finally:
+        manager.close_all_sessions()
+
+
+def test_unrecoverable_session_is_not_replaced(fake_crash, monkeypatch):
+    manager = CrashSessionManager(max_sessions=2, idle_timeout=0, recover_sessions=True)
+    try:
+        dump, kernel = make_pair(1)
+        assert manager.start_session(dump, kernel, timeout=30, client_id="a", spare=False)
+        monkeypatch.setattr(CrashSession, "start", lambda self, timeout=180: False)
+
+        assert run(manager, "die", "a")[2] == 1
+        assert not manager.wait_for_recovery("a")
+        assert run(manager, "sys", "a")[1] == "No active crash session"
+        assert manager.get_lost_session("a") == str(dump.path)
+        assert manager.get_session_info("a")["lost_dump_path"] == str(dump.path)
+        assert not manager.sessions
+
+        manager.release_client("a")
+        assert manager.get_lost_session("a") is None
+    finally:
+        manager.close_all_sessions()
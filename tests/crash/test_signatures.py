@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for crash signatures and clustering (no crash utility required)
+"""
+
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.signatures import SignatureIndex, make_signature, normalize_panic
+
+
+def make_dump(index, size=1024):
+    return CrashDump(f"vmcore{index}", Path(f"/var/crash/{index}/vmcore"), size, datetime(2026, 1, index))
+
+
+def test_signature_ignores_addresses_offsets_and_crash_frames():
+    first = make_signature(
+        "BUG: unable to handle page fault for address: ffff88810a2b3c00",
+        ["machine_kexec", "__crash_kexec", "oops_end", "page_fault_oops", "ext4_readdir+0x2a/0x90",
+         "iterate_dir.isra.0", "iterate_dir.isra.0", "__x64_sys_getdents64+0x80/0x120"]
+    )
+    second = make_signature(
+        "BUG: unable to handle page fault for address: ffff8882ffee0010",
+        ["ext4_readdir+0x31/0x90", "iterate_dir", "__x64_sys_getdents64"]
+    )
+    assert first == second
+    assert first.frames == ["ext4_readdir", "iterate_dir", "__x64_sys_getdents64"]
+    assert first.panic == "BUG: unable to handle page fault for address: <addr>"
+    assert make_signature("", ["panic"]) is None
+
+
+def test_normalize_panic_drops_task_details():
+    assert (normalize_panic('"watchdog: BUG: soft lockup - CPU#3 stuck for 22s! comm: kworker/3:1"')
+            == "watchdog: BUG: soft lockup - CPU#<n> stuck for <n>s! comm: <comm>")
+
+
+def test_index_clusters_and_persists(tmp_path):
+    db_path = str(tmp_path / "catalog.db")
+    index = SignatureIndex(db_path)
+    common = make_signature("Kernel panic - not syncing: Fatal exception", ["ext4_readdir"])
+    rare = make_signature("Kernel panic - not syncing: hung_task: blocked tasks", ["watchdog"])
+
+    assert index.record(make_dump(1), common) is None
+    assert index.record(make_dump(2), common)["count"] == 1
+    index.record(make_dump(3), rare)
+    # Re-recording the same dump version does not count it twice
+    assert index.record(make_dump(2), common)["count"] == 1
+    index.close()
+
+    index = SignatureIndex(db_path)
+    clusters = index.list_clusters()
+    assert [(cluster["signature"], cluster["count"]) for cluster in clusters] == [(common.hash, 2), (rare.hash, 1)]
+    assert clusters[0]["dumps"] == ["/var/crash/2/vmcore", "/var/crash/1/vmcore"]
+    assert index.get(make_dump(1)) == common
+    # A rewritten dump is a new version
+    assert index.get(make_dump(1, size=2048)) is None
+    assert index.get_stats() == {"dumps": 3, "clusters": 2}
+    index.close()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for triage reports (uses fake_crash.py, no crash utility required)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from crash_mcp.crash_discovery import CrashDump
+from crash_mcp.crash_session import CrashSessionManager
+from crash_mcp.kernel_detection import KernelFile
+from crash_mcp.result_cache import ResultCache
+from crash_mcp.triage import TRIAGE_COMMANDS, TriageEngine, parse_hung_tasks, parse_memory
+
+
+def make_pair(tmp_path):
+    dump_file = tmp_path / "vmcore"
+    kernel_file = tmp_path / "vmlinux"
+    dump_file.write_bytes(b"dump")
+    kernel_file.write_bytes(b"kernel")
+    return (CrashDump("vmcore", dump_file, 4, None),
+            KernelFile("vmlinux", kernel_file, "5.14.0", 6))
+
+
+def test_triage_report_fans_out_and_reuses_cache(fake_crash, tmp_path):
+    dump, kernel = make_pair(tmp_path)
+    manager = CrashSessionManager(max_sessions=4, result_cache=ResultCache())
+    engine = TriageEngine(manager, workers=3, command_timeout=20)
+    try:
+        report = engine.run(dump, kernel, start_timeout=30)
+
+        assert report["panic"] == "Kernel panic - not syncing: sysrq triggered crash"
+        assert report["uptime"] == "2 days, 03:04:05"
+        assert report["task"] == {"pid": 1234, "task": "ffff8881002a8000", "cpu": 2, "command": "bash"}
+        assert [frame["function"] for frame in report["backtrace"]] == [
+            "machine_kexec", "__crash_kexec", "panic", "sysrq_handle_crash"]
+        assert report["taint"] == {"mask": "1001", "flags": "PO"}
+        assert report["modules"] == {"count": 2, "names": ["xfs", "e1000e"]}
+        assert report["memory"]["free"] == {"pages": 61238, "size": "239.2 MB", "percent": 1}
+        assert [task["pid"] for task in report["hung_tasks"]["tasks"]] == [77, 812]
+        assert report["workers"] == 3
+        assert set(report["commands"]) == set(TRIAGE_COMMANDS)
+
+        # One worker is kept as a spare, the rest are closed
+        assert not manager.sessions and not manager.bindings
+        assert sum(len(spares) for spares in manager.spares.values()) == 1
+
+        again = engine.run(dump, kernel, start_timeout=30)
+        assert again["workers"] == 0
+        assert all(command["cached"] for command in again["commands"].values())
+        assert again["panic"] == report["panic"]
+    finally:
+        manager.close_all_sessions()
+
+
+def test_triage_reports_failed_start(fake_crash, tmp_path):
+    dump, kernel = make_pair(tmp_path)
+    dump = dump._replace(path=tmp_path / "mismatch")
+    manager = CrashSessionManager(max_sessions=2)
+    report = TriageEngine(manager, workers=2).run(dump, kernel, start_timeout=30)
+    assert report["workers"] == 0 and report["panic"] is None
+    assert report["error"] == "No crash session could be started"
+    assert report["commands"]["sys"]["error"] == "No crash session could be started"
+
+
+def test_memory_and_hung_task_parsing():
+    memory = parse_memory("    TOTAL MEM  4046179      15.4 GB         ----\n"
+                          "  TOTAL SWAP   524287         2 GB         ----\n")
+    assert memory == {"total_mem": {"pages": 4046179, "size": "15.4 GB", "percent": None},
+                      "total_swap": {"pages": 524287, "size": "2 GB", "percent": None}}
+    assert parse_hung_tasks('[0 00:00:01.000] [IN]  PID: 1  TASK: ffff1  CPU: 0  COMMAND: "init"') == []
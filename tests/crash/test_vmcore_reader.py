@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the vmcore page reader: page cache, batched decoding and readahead (no crash utility required)
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from crash_mcp import vmcore_reader
+from crash_mcp.vmcore_reader import START_KERNEL_MAP, VmcoreError, VmcoreReader
+from vmcore_fixtures import PAGE_SIZE, make_elf_vmcore, make_kdump
+
+PAGES = 40
+
+
+def page(pfn):
+    return bytes([pfn % 251]) * PAGE_SIZE
+
+
+@pytest.fixture
+def kdump(tmp_path):
+    make_kdump(tmp_path / "vmcore", "6.1.0", pages={pfn: page(pfn) for pfn in range(PAGES)})
+    return tmp_path / "vmcore"
+
+
+def test_lru_cache_keeps_byte_budget(kdump):
+    with VmcoreReader(kdump, cache_bytes=2 * PAGE_SIZE, workers=1) as reader:
+        for pfn in (3, 4, 3, 5):
+            assert reader.read_page(pfn) == page(pfn)
+        stats = reader.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 3)
+        assert (stats["cached_pages"], stats["cached_bytes"]) == (2, 2 * PAGE_SIZE)
+
+        # 4 was least recently used and is gone; 3 is still cached
+        reader.read_page(3)
+        reader.read_page(4)
+        assert reader.get_stats()["misses"] == 4
+
+
+def test_batched_reads_decode_in_parallel(kdump):
+    with VmcoreReader(kdump, workers=4, readahead=0) as reader:
+        data = reader.read_physical(PAGE_SIZE - 8, 10 * PAGE_SIZE)
+        assert data == page(0)[-8:] + b"".join(page(pfn) for pfn in range(1, 11))[:10 * PAGE_SIZE - 8]
+        assert reader.get_stats()["misses"] == 11
+
+
+def test_sequential_misses_read_ahead(tmp_path):
+    base = START_KERNEL_MAP + 0x1000000
+    memory = b"".join(page(pfn) for pfn in range(PAGES))
+    make_elf_vmcore(tmp_path / "vmcore", "6.1.0", loads=[(0x1000000, base, memory)])
+
+    with VmcoreReader(tmp_path / "vmcore", readahead=8, workers=2) as reader:
+        first = 0x1000000 // PAGE_SIZE
+        assert reader.read(base, 8) == page(0)[:8]
+        assert reader.read(base + PAGE_SIZE, 8) == page(1)[:8]
+        deadline = time.monotonic() + 5
+        while reader.get_stats()["prefetched"] < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert reader.get_stats()["prefetched"] == 8
+
+        assert reader.read_page(first + 9) == page(9)
+        assert reader.get_stats()["misses"] == 2
+
+
+def test_missing_codec_is_reported(kdump, monkeypatch):
+    monkeypatch.setattr(vmcore_reader, "PAGE_CODECS", ((0x1, "zlib", "zlib-package", None),))
+    with VmcoreReader(kdump, workers=1) as reader:
+        # Odd pages are stored uncompressed
+        assert reader.read_page(1) == page(1)
+        with pytest.raises(VmcoreError, match="need the zlib-package package"):
+            reader.read_page(2)
@@ -0,0 +1,171 @@
+"""
+Builders for small synthetic vmcores and vmlinux images used by the tests
+"""
+
+import struct
+import zlib
+
+PAGE_SIZE = 4096
+
+
+def _note(name: bytes, n_type: int, desc: bytes) -> bytes:
+    name = name + b"\0"
+    return (struct.pack("<III", len(name), len(desc), n_type)
+            + name.ljust((len(name) + 3) & ~3, b"\0")
+            + desc.ljust((len(desc) + 3) & ~3, b"\0"))
+
+
+def vmcoreinfo_text(release: str, build_id: str = None, extra: dict = None) -> bytes:
+    lines = [f"OSRELEASE={release}", f"PAGESIZE={PAGE_SIZE}"]
+    if build_id:
+        lines.append(f"BUILD-ID={build_id}")
+    for key, value in (extra or {}).items():
+        lines.append(f"{key}={value}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def make_elf_vmcore(path, release: str, build_id: str = None, extra: dict = None, loads=()):
+    """Write an ELF64 x86_64 vmcore with a VMCOREINFO note.
+
+    ``loads`` is a sequence of (paddr, vaddr, data) PT_LOAD segments.
+    """
+    notes = _note(b"CORE", 1, b"\0" * 336) + _note(b"VMCOREINFO", 0, vmcoreinfo_text(release, build_id, extra))
+    phnum = 1 + len(loads)
+    offset = 64 + phnum * 56
+    phdrs = [struct.pack("<IIQQQQQQ", 4, 0, offset, 0, 0, len(notes), len(notes), 0)]
+    body = notes
+    offset += len(notes)
+    for paddr, vaddr, data in loads:
+        pad = (-offset) % PAGE_SIZE
+        body += b"\0" * pad
+        offset += pad
+        phdrs.append(struct.pack("<IIQQQQQQ", 1, 7, offset, vaddr, paddr, len(data), len(data), PAGE_SIZE))
+        body += data
+        offset += len(data)
+
+    ehdr = struct.pack("<16sHHIQQQIHHHHHH", b"\x7fELF\x02\x01\x01" + b"\0" * 9,
+                       4, 62, 1, 0, 64, 0, 0, 64, 56, phnum, 64, 0, 0)
+    with open(path, "wb") as f:
+        f.write(ehdr + b"".join(phdrs) + body)
+
+
+def make_kdump(path, release: str, build_id: str = None, extra: dict = None, status: int = 0,
+               pages: dict = None, phys_base: int = 0):
+    """Write a kdump-compressed dump: header, sub header, VMCOREINFO, bitmaps and pages.
+
+    ``status`` holds the disk_dump_header compression flags and ``pages``
+    maps page frame numbers to their contents; even frames are stored
+    zlib-compressed and odd ones uncompressed.
+    """
+    info = vmcoreinfo_text(release, build_id, extra)
+    pages = pages or {}
+    max_mapnr = PAGE_SIZE * 8
+    header = bytearray(PAGE_SIZE)
+    header[0:8] = b"KDUMP   "
+    struct.pack_into("<i", header, 8, 6)
+    for index, value in enumerate([b"Linux", b"testhost", release.encode(), b"#1 SMP", b"x86_64", b"(none)"]):
+        header[12 + index * 65:12 + index * 65 + len(value)] = value
+    struct.pack_into("<qq", header, 408, 1700000000, 250000)
+    # status, block_size, sub_hdr_size, bitmap_blocks, max_mapnr
+    struct.pack_into("<IiiII", header, 424, status, PAGE_SIZE, 2, 2, max_mapnr)
+
+    # The sub header block is followed by a block holding VMCOREINFO
+    sub_header = bytearray(2 * PAGE_SIZE)
+    struct.pack_into("<qii", sub_header, 0, phys_base, 31, 0)
+    struct.pack_into("<qQ", sub_header, 32, 2 * PAGE_SIZE, len(info))
+    struct.pack_into("<Q", sub_header, 96, max_mapnr)
+    sub_header[PAGE_SIZE:PAGE_SIZE + len(info)] = info
+
+    bitmap = bytearray(PAGE_SIZE)
+    for pfn in pages:
+        bitmap[pfn // 8] |= 1 << (pfn % 8)
+
+    data_offset = 5 * PAGE_SIZE + 24 * len(pages)
+    descs = b""
+    data = b""
+    for pfn in sorted(pages):
+        page = bytes(pages[pfn]).ljust(PAGE_SIZE, b"\0")
+        stored, flags = (zlib.compress(page), 1) if pfn % 2 == 0 else (page, 0)
+        descs += struct.pack("<qIIQ", data_offset + len(data), len(stored), flags, 0)
+        data += stored
+
+    with open(path, "wb") as f:
+        f.write(bytes(header) + bytes(sub_header) + bytes(bitmap) + bytes(bitmap) + descs + data)
+
+
+# VMCOREINFO entries describing the lockless printk ring laid out by printk_ring()
+PRINTK_LAYOUT = {
+    "OFFSET(printk_ringbuffer.desc_ring)": 0, "OFFSET(printk_ringbuffer.text_data_ring)": 48,
+    "OFFSET(prb_desc_ring.count_bits)": 0, "OFFSET(prb_desc_ring.descs)": 8,
+    "OFFSET(prb_desc_ring.infos)": 16, "OFFSET(prb_desc_ring.head_id)": 24,
+    "OFFSET(prb_desc_ring.tail_id)": 32, "OFFSET(atomic_long_t.counter)": 0,
+    "OFFSET(prb_data_ring.size_bits)": 0, "OFFSET(prb_data_ring.data)": 8,
+    "SIZE(prb_desc)": 24, "OFFSET(prb_desc.state_var)": 0, "OFFSET(prb_desc.text_blk_lpos)": 8,
+    "OFFSET(prb_data_blk_lpos.begin)": 0, "OFFSET(prb_data_blk_lpos.next)": 8,
+    "SIZE(printk_info)": 88, "OFFSET(printk_info.seq)": 0, "OFFSET(printk_info.ts_nsec)": 8,
+    "OFFSET(printk_info.text_len)": 16, "OFFSET(printk_info.caller_id)": 20,
+}
+
+
+def printk_ring(base: int, messages, count_bits: int = 3, size_bits: int = 8, first_lpos: int = 0):
+    """Lay out a lockless printk ring at virtual address ``base``.
+
+    ``messages`` is a sequence of (ts_nsec, text). The prb pointer is at
+    ``base`` itself. Returns the memory image and its VMCOREINFO entries.
+    """
+    ring = base + 0x40
+    descs = base + 0x100
+    infos = descs + 24 * (1 << count_bits)
+    data = infos + 88 * (1 << count_bits)
+    size = 1 << size_bits
+    image = bytearray(data - base + size)
+
+    struct.pack_into("<Q", image, 0, ring)
+    lpos = first_lpos
+    first_id = 1 << count_bits
+    for seq, (ts_nsec, text) in enumerate(messages):
+        desc_id = first_id + seq
+        index = desc_id % (1 << count_bits)
+        block = (8 + len(text) + 7) & ~7
+        if lpos % size + block > size:
+            begin, end, offset = lpos, lpos - lpos % size + size + block, 0
+        else:
+            begin, end, offset = lpos, lpos + block, lpos % size
+        struct.pack_into("<Q", image, data - base + offset, desc_id)
+        image[data - base + offset + 8:data - base + offset + 8 + len(text)] = text
+        struct.pack_into("<QQQ", image, descs - base + index * 24, (2 << 62) | desc_id, begin, end)
+        struct.pack_into("<QQH", image, infos - base + index * 88, seq, ts_nsec, len(text))
+        lpos = end
+
+    struct.pack_into("<IxxxxQQQQ", image, 0x40, count_bits, descs, infos,
+                     first_id + len(messages) - 1, first_id)
+    struct.pack_into("<IxxxxQ", image, 0x40 + 48, size_bits, data)
+    info = {key: str(value) for key, value in PRINTK_LAYOUT.items()}
+    info["SYMBOL(prb)"] = f"{base:x}"
+    return bytes(image), info
+
+
+def make_vmlinux(path, build_id: str, comment: bytes = b"GCC: (GNU) 11.4.1\0"):
+    """Write an ELF64 image with .note.gnu.build-id and .comment sections."""
+    note = _note(b"GNU", 3, bytes.fromhex(build_id))
+    shstrtab = b"\0.note.gnu.build-id\0.comment\0.shstrtab\0"
+    note_offset = 64
+    comment_offset = note_offset + len(note)
+    strtab_offset = comment_offset + len(comment)
+    shoff = (strtab_offset + len(shstrtab) + 7) & ~7
+
+    def shdr(name, sh_type, offset, size):
+        return struct.pack("<IIQQQQIIQQ", name, sh_type, 0, 0, offset, size, 0, 0, 1, 0)
+
+    sections = [
+        shdr(0, 0, 0, 0),
+        shdr(1, 7, note_offset, len(note)),
+        shdr(20, 1, comment_offset, len(comment)),
+        shdr(29, 3, strtab_offset, len(shstrtab)),
+    ]
+    ehdr = struct.pack("<16sHHIQQQIHHHHHH", b"\x7fELF\x02\x01\x01" + b"\0" * 9,
+                       2, 62, 1, 0, 0, shoff, 0, 64, 56, 0, 64, len(sections), 3)
+    body = ehdr + note + comment + shstrtab
+    body += b"\0" * (shoff - len(body))
+    with open(path, "wb") as f:
+        f.write(body + b"".join(sections))